@@ -17,14 +17,18 @@ from .services.tool_scanner import (
     scan_directory,
     scan_directory_for_archives,
     record_tool_added,
-    record_tool_usage
+    record_tool_usage,
+    schedule_record_sweep
 )
-from .services.display_service import display_tools_grid
+from .services.display_service import display_tools_grid, append_tools_display
 from .services.archive_service import extract_archive
 from .services.file_monitor import FileMonitor
+from .services.tool_catalog import get_tool_catalog
+from .services.search_index import warm_search_index
 from .services.category_service import (
     load_and_display_tools,
     load_and_display_all_tools,
+    search_and_display_tools,
     get_subcategories_for_category,
     get_current_scan_info
 )
@@ -32,12 +36,14 @@ from .ui.main_window import setup_window, create_ui
 from .ui.category_panel import refresh_category_tree
 from .ui.display_mode_manager import add_display_mode_switch
 from .ui.display_manager import display_list_mode, display_grid_mode
-from .utils.icon_utils import get_file_icon
-from .utils.file_utils import open_folder_location
+from .utils.icon_utils import get_tool_icon
+from .utils.icon_pyramid import configure_pyramid_cache
 from .utils.tool_manager import run_tool, delete_tool, copy_path, open_folder
 from .utils.type_utils import get_file_type_category
 from .utils.file_utils import get_file_version_info
 
+SEARCH_DEBOUNCE_MS = 150
+
 
 class ToolBox:
     def __init__(self):
@@ -47,8 +53,12 @@ class ToolBox:
         self.config_manager = ConfigManager()
         self.config = self.config_manager.config
 
+        # 图标金字塔缓存的内存预算（[General] icon_pyramid_mb）
+        configure_pyramid_cache(self)
+
         # 状态变量
         self.search_var = StringVar()
+        self._search_job = None  # 搜索防抖的 after id
         self.filetype_var = StringVar()
         self.display_mode_var = StringVar()
         self.auto_record_var = BooleanVar()
@@ -89,6 +99,13 @@ class ToolBox:
         # ✅ 统一为绝对路径；后续扫描/记录/清理都应以该目录为根
         self.storage_path = os.path.abspath(str(toolbox_dir))
 
+        # 工具目录数据库（ToolBox.db，与 ToolBox.ini 同目录）
+        self.tool_catalog = None
+        get_tool_catalog(self)
+
+        # 内存搜索索引：后台从 catalog 载入，搜索时不再访问磁盘
+        warm_search_index(self)
+
         # 将文件版本读取函数绑定为 app 的方法，便于其它模块调用
         try:
             self.get_file_version_info = get_file_version_info
@@ -107,6 +124,9 @@ class ToolBox:
         except Exception as exc:
             print(f"加载工具添加记录失败: {exc}")
 
+        # 孤儿记录：日常由扫描结果增量清理，全量清理低频定时执行
+        schedule_record_sweep(self)
+
         # 文件监控
         self.file_monitor = FileMonitor(self)
 
@@ -173,24 +193,65 @@ class ToolBox:
         except Exception:
             pass
 
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        """关闭窗口：停止文件监控与后台扫描线程池，再销毁主窗口"""
+        try:
+            self.file_monitor.stop()
+        except Exception:
+            pass
+        try:
+            engine = getattr(self, "scan_engine", None)
+            if engine is not None:
+                engine.shutdown()
+        except Exception as e:
+            print(f"关闭扫描线程池失败: {e}")
+        self.root.destroy()
+
     # ==================== 分类/显示 ====================
 
-    def load_and_display_tools(self, selected_path=None):
+    def load_and_display_tools(self, selected_path=None, force=False):
         if not selected_path:
             selected_path = self.selected_category_path or self.storage_path
-        load_and_display_tools(self, selected_path)
+        load_and_display_tools(self, selected_path, force=force)
 
-    def load_and_display_all_tools(self):
-        load_and_display_all_tools(self)
+    def load_and_display_all_tools(self, force=False):
+        load_and_display_all_tools(self, force=force)
 
     def display_tools_grid(self, tools, category_name, count):
         display_tools_grid(self, tools, category_name, count)
 
-    def refresh_tools(self):
-        self.load_and_display_tools()
+    def append_displayed_tools(self, tools, category_name, count):
+        append_tools_display(self, tools, category_name, count)
+
+    def get_tool_icon(self, tool_path, tool_name, size=48):
+        return get_tool_icon(self, tool_path, tool_name, size=size)
+
+    def refresh_tools(self, force=False):
+        """刷新当前视图；force=True 时忽略目录指纹强制重新列举（手动刷新）"""
+        if self.showing_all_tools:
+            self.load_and_display_all_tools(force=force)
+        else:
+            self.load_and_display_tools(force=force)
+
+    def schedule_search(self):
+        """搜索框每次输入：防抖，停止输入 SEARCH_DEBOUNCE_MS 后才真正搜索"""
+        if self._search_job is not None:
+            try:
+                self.root.after_cancel(self._search_job)
+            except Exception:
+                pass
+        self._search_job = self.root.after(SEARCH_DEBOUNCE_MS, self.search_tools)
 
     def search_tools(self):
-        self.load_and_display_tools()
+        if self._search_job is not None:
+            try:
+                self.root.after_cancel(self._search_job)
+            except Exception:
+                pass
+            self._search_job = None
+        search_and_display_tools(self)
 
     def filter_by_type(self, event=None):
         self.load_and_display_tools()
@@ -32,6 +32,14 @@ class ConfigManager:
         self.config['General']['auto_create_folders'] = '1'
         self.config['General']['show_welcome_on_startup'] = '1'
         self.config['General']['display_mode'] = 'grid'
+        self.config['General']['scan_workers'] = '4'
+        self.config['General']['prune_interval'] = '3600'
+        self.config['General']['search_limit'] = '200'
+        self.config['General']['icon_fast_path'] = '0'
+        self.config['General']['icon_cache_mb'] = '64'
+        self.config['General']['icon_pyramid_mb'] = '32'
+        self.config['General']['icon_workers'] = '4'
+        self.config['General']['thumbnail_processes'] = '2'
 
         self.config.add_section('Categories')
         self.config['Categories']['count'] = '0'  # 修改为0，不创建默认分类
@@ -66,7 +74,15 @@ class ConfigManager:
             'notify_new_tools': '1',
             'auto_create_folders': '1',
             'show_welcome_on_startup': '1',
-            'display_mode': 'grid'
+            'display_mode': 'grid',
+            'scan_workers': '4',
+            'prune_interval': '3600',
+            'search_limit': '200',
+            'icon_fast_path': '0',
+            'icon_cache_mb': '64',
+            'icon_pyramid_mb': '32',
+            'icon_workers': '4',
+            'thumbnail_processes': '2'
         }
 
         if not self.config.has_section('General'):
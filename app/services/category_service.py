@@ -4,12 +4,21 @@ import os
 from pathlib import Path
 
 from ..utils.type_utils import get_file_type_category
-
-# ✅ 分类刷新前清理孤儿记录
+from ..utils.scan_utils import DEFAULT_TOOL_EXTS, scan_dir, iter_files
+from ..utils.pinyin_utils import add_pinyin_fields, pinyin_keys, sort_key_of
+from ..utils.search_utils import DEFAULT_SEARCH_LIMIT, search_text, tool_match_score, usage_boost, top_k
+from .tool_catalog import get_tool_catalog, dir_key, row_to_tool
+from .tool_query import parse_query
+from .scan_engine import get_scan_engine
+from .search_index import get_search_index
+from .scan_worker import get_scan_worker
+
+# ✅ 扫描发现文件消失后增量清理对应记录（全量清理改为低频定时执行，不再在点击路径上）
 try:
-    from .tool_scanner import prune_missing_tool_records
+    from .tool_scanner import prune_records_for_paths, get_usage_stats
 except Exception:
-    prune_missing_tool_records = None
+    prune_records_for_paths = None
+    get_usage_stats = None
 
 
 def _get_supported_exts(app):
@@ -18,11 +27,7 @@ def _get_supported_exts(app):
     if isinstance(exts, (set, list, tuple)) and exts:
         return set(str(x).lower() for x in exts)
 
-    return {
-        ".exe", ".msi", ".zip", ".rar", ".7z", ".pdf", ".txt",
-        ".bat", ".cmd", ".reg", ".lnk", ".png", ".jpg", ".jpeg",
-        ".mp4", ".mp3", ".py", ".pyw", ".docx", ".xlsx", ".pptx"
-    }
+    return set(DEFAULT_TOOL_EXTS)
 
 
 def _format_category(rel_path: str) -> str:
@@ -104,95 +109,206 @@ def get_current_scan_info(app):
     return str(sel), display_name, False
 
 
-def _build_tool_item(app, file_path: Path, rel_category_path: str):
-    """构造单个工具 dict（尽量使用 ToolInfo 自定义标题/备注）"""
-    tool_path = str(file_path)
-    ext = file_path.suffix.lower()
-
-    # ToolInfo 用绝对路径 key
-    name = file_path.stem
-    note = ""
+def _snapshot_tool_info(app):
+    """
+    在 Tk 线程读出 ToolInfo 的副本（key 按 configparser 的规则转为小写），存为 app.tool_info_snapshot。
+    每次视图扫描/搜索开始前调用：后台线程只读这份副本，不访问 app.config
+    """
+    info = {}
     try:
         if hasattr(app, "config") and "ToolInfo" in app.config:
-            name = app.config["ToolInfo"].get(tool_path + "_name", name)
-            note = app.config["ToolInfo"].get(tool_path + "_note", "")
+            info = {k.lower(): v for k, v in app.config["ToolInfo"].items()}
+    except Exception as e:
+        print(f"读取 ToolInfo 失败: {e}")
+    try:
+        app.tool_info_snapshot = info
     except Exception:
         pass
+    return info
+
+
+def _tool_info(app, tool_path: str, default_name: str):
+    """ToolInfo 中的自定义 (标题, 备注)；没有设置时为 (default_name, "")。读 _snapshot_tool_info 的副本"""
+    # ToolInfo 用绝对路径 key
+    info = getattr(app, "tool_info_snapshot", None)
+    if not isinstance(info, dict):
+        info = _snapshot_tool_info(app)
+    key = tool_path.lower()
+    return info.get(key + "_name", default_name), info.get(key + "_note", "")
+
+
+def _apply_tool_info(app, tool) -> bool:
+    """
+    用 ToolInfo 的当前标题/备注覆盖取自 catalog 的工具 dict（catalog 行只在文件变化时重建，
+    标题/备注修改不会反映在行里）。有改动返回 True；标题变化时拼音/排序键一并重算。
+    """
+    stem = os.path.splitext(os.path.basename(tool["path"]))[0]
+    name, note = _tool_info(app, tool["path"], stem)
+    if name == tool.get("name") and note == (tool.get("note") or ""):
+        return False
+    if name != tool.get("name"):
+        tool["name"] = name
+        tool.pop("sort_key", None)
+        add_pinyin_fields(tool)
+    tool["note"] = note
+    return True
+
+
+def _build_tool_item(app, entry, rel_category_path: str):
+    """由扫描得到的 FileEntry 构造单个工具 dict（尽量使用 ToolInfo 自定义标题/备注）"""
+    tool_path = entry.path
+    ext = entry.ext
+    name, note = _tool_info(app, tool_path, entry.stem)
 
     try:
         typ = get_file_type_category(ext)
     except Exception:
         typ = ext.replace(".", "") or "文件"
 
-    return {
+    return add_pinyin_fields({
         "name": name,
         "path": tool_path,
         "ext": ext,
         "type": typ,
         "category": _format_category(rel_category_path),
         "note": note,
-    }
+        "size": entry.size,
+        "mtime": entry.mtime,
+        "added": entry.ctime,
+    })
 
 
-def _scan_one_dir(app, dir_path: Path, rel_category_path: str):
-    """只扫描当前目录（不递归）"""
-    tools = []
-    if not dir_path.exists() or not dir_path.is_dir():
-        return tools
+def _sync_dir(app, dir_path: Path, rel_category_path: str, force=False):
+    """
+    扫描当前目录（不递归），返回 (tools, subdirs)。
+    优先走增量扫描引擎（目录指纹未变则不列举）；catalog 不可用时直接列举。
+    """
+    engine = get_scan_engine(app)
+    if engine is not None:
+        return engine.sync_dir(dir_path, rel_category_path, force=force)
+
+    if not dir_path.is_dir():
+        return [], []
 
-    supported = _get_supported_exts(app)
+    files, subdirs = scan_dir(dir_path, exts=_get_supported_exts(app))
+    return [_build_tool_item(app, fe, rel_category_path) for fe in files], subdirs
 
+
+def _scan_one_dir(app, dir_path: Path, rel_category_path: str, force=False):
+    """只扫描当前目录（不递归）"""
+    tools = []
     try:
-        for p in dir_path.iterdir():
-            if p.is_file() and p.suffix.lower() in supported and p.name != "__init__.py":
-                tools.append(_build_tool_item(app, p, rel_category_path))
+        tools, _subdirs = _sync_dir(app, dir_path, rel_category_path, force=force)
     except Exception as e:
         print(f"_scan_one_dir 扫描失败: {dir_path} -> {e}")
 
-    tools.sort(key=lambda x: x.get("name", "").lower())
+    tools.sort(key=sort_key_of)
     return tools
 
 
-def _apply_search_and_type_filter(app, tools):
-    """应用搜索与类型过滤（如果 UI 里有 search_var / filetype_var）"""
+def _sort_by_name(tools):
+    """按名称排序（中文按拼音；排序键随工具缓存在 catalog 中，不重复计算）"""
+    return sorted(tools, key=sort_key_of)
+
+
+def _sort_all_tools(tools):
+    return sorted(tools, key=lambda x: (pinyin_keys(x.get("category", "") or "")[2], sort_key_of(x)))
+
+
+def _iter_subdir_chunks(app, parent: Path, rel_category_path: str, names, force=False):
+    """逐个 yield parent 下各子目录的工具列表（有扫描引擎时并行扫描），按 names 顺序、目录内按名称排序"""
+    items = [(parent / name, os.path.join(rel_category_path, name)) for name in names]
+    engine = get_scan_engine(app)
+    if engine is None:
+        for dir_path, sub_rel in items:
+            yield _scan_one_dir(app, dir_path, sub_rel, force=force)
+        return
+
+    for dir_tools, _subdirs in engine.iter_sync_dirs(items, force=force):
+        yield _sort_by_name(dir_tools)
+
+
+def _get_search_query(app):
+    """解析搜索框内容：普通搜索词 + 结构化条件（type:/cat:/ext:/size>/added>/note:…）"""
     qv = getattr(app, "search_var", None)
-    if qv is not None:
-        q = (qv.get() or "").strip().lower()
-        if q:
-            def hit(t):
-                return (
-                    q in (t.get("name", "") or "").lower()
-                    or q in (t.get("note", "") or "").lower()
-                    or q in (t.get("path", "") or "").lower()
-                )
-            tools = [t for t in tools if hit(t)]
+    raw = (qv.get() or "") if qv is not None else ""
+    return parse_query(raw.strip(), os.path.abspath(app.storage_path) if getattr(app, "storage_path", None) else "")
 
+
+def _selected_type(app):
+    """类型下拉框当前选中的类型；未选择（全部）时返回 ""（读 Tk 变量，须在 Tk 线程调用）"""
     tv = getattr(app, "filetype_var", None)
-    if tv is not None:
-        selected = tv.get()
-        if selected and selected != "全部":
-            tools = [t for t in tools if t.get("type") == selected]
+    selected = (tv.get() or "") if tv is not None else ""
+    return "" if selected == "全部" else selected
+
+
+def _type_accept(app):
+    """类型过滤函数；未选择类型（全部）时返回 None"""
+    selected = _selected_type(app)
+    if not selected:
+        return None
+    return lambda t: t.get("type") == selected
+
 
+def _apply_type_filter(app, tools):
+    accept = _type_accept(app)
+    if accept is not None:
+        tools = [t for t in tools if accept(t)]
     return tools
 
 
-def load_and_display_tools(app, selected_category_path: str):
-    """
-    ✅ 点击分类树即清孤儿记录
-    ✅ 路径强制限制在 Storage 下（不会跑到盘符根）
-    ✅ 一级分类：汇总其下所有二级目录工具（只扫二级，不递归更深）
-    ✅ 二级分类：仅显示当前目录工具
-    """
-    # ✅ 关键：刷新前清理孤儿记录
+def _get_search_limit(app) -> int:
+    """读取 [General] search_limit（搜索结果最多显示多少个，0 为不限）"""
+    try:
+        return max(0, int(app.config["General"].get("search_limit", str(DEFAULT_SEARCH_LIMIT))))
+    except Exception:
+        return DEFAULT_SEARCH_LIMIT
+
+
+def _get_usage_stats(app):
+    if get_usage_stats is None:
+        return {}
     try:
-        if prune_missing_tool_records:
-            prune_missing_tool_records(app)
+        return get_usage_stats(app)
     except Exception as e:
-        print(f"load_and_display_tools: prune_missing_tool_records 失败: {e}")
+        print(f"读取使用记录失败: {e}")
+        return {}
 
-    if not getattr(app, "storage_path", None):
-        return
 
+def _rank_tools(app, q, tools, usage=None, limit=None):
+    """对 tools 做子串 + 名称模糊匹配，按匹配质量与使用频率取前 limit 个"""
+    usage = _get_usage_stats(app) if usage is None else usage
+    storage_prefix = os.path.normcase(os.path.abspath(app.storage_path)) + os.sep \
+        if getattr(app, "storage_path", None) else ""
+
+    def scored():
+        for t in tools:
+            s = tool_match_score(q, t, search_text(t, storage_prefix))
+            if s is None:
+                continue
+            yield s + usage_boost(usage.get(os.path.normcase(t.get("path", "") or ""))), sort_key_of(t), t
+
+    return top_k(scored(), _get_search_limit(app) if limit is None else limit)
+
+
+def _apply_search_and_type_filter(app, tools):
+    """
+    应用搜索与类型过滤（如果 UI 里有 search_var / filetype_var）。
+    结构化条件逐个求值（catalog 不可用时的兜底；正常搜索走 SQL，见 search_and_display_tools）；
+    有搜索词时：子串 + 名称模糊匹配，按匹配质量与使用频率排序，只保留前 search_limit 个。
+    """
+    tools = _apply_type_filter(app, tools)
+    query = _get_search_query(app)
+    if query.has_filters:
+        tools = [t for t in tools if query.matches(t)]
+    q = query.text.lower()
+    if not q:
+        return tools
+    return _rank_tools(app, q, tools)
+
+
+def _resolve_category_view(app, selected_category_path: str):
+    """解析要显示的分类：返回 (sel, rel, depth, category_name)"""
     # 🔒 强制以 Storage 为唯一根
     storage_path = os.path.abspath(app.storage_path)
     selected_category_path = selected_category_path or storage_path
@@ -216,68 +332,301 @@ def load_and_display_tools(app, selected_category_path: str):
             parts = [p for p in rel.replace("/", os.sep).replace("\\", os.sep).split(os.sep) if p]
             depth = len(parts)
 
-    tools = []
+    return sel, rel, depth, _format_category(rel)
+
 
+def _iter_category_chunks(app, sel: Path, rel: str, depth, force=False):
+    """逐个目录 yield 分类视图的工具（顺序即最终显示顺序）"""
     if depth == 1:
         # ✅ 一级：汇总一级目录内文件 + 所有二级文件夹内文件（只一层）
-        tools.extend(_scan_one_dir(app, sel, rel))
         try:
-            subdirs = [p for p in sel.iterdir() if p.is_dir()]
-            subdirs.sort(key=lambda x: x.name.lower())
-            for sd in subdirs:
-                sub_rel = os.path.join(rel, sd.name)
-                tools.extend(_scan_one_dir(app, sd, sub_rel))
+            top_tools, subdirs = _sync_dir(app, sel, rel, force=force)
+        except Exception as e:
+            print(f"一级分类汇总扫描失败: {sel} -> {e}")
+            return
+        yield _sort_by_name(top_tools)
+        try:
+            for chunk in _iter_subdir_chunks(app, sel, rel, subdirs, force=force):
+                yield chunk
         except Exception as e:
             print(f"一级分类汇总扫描失败: {sel} -> {e}")
-        category_name = _format_category(rel)
     else:
         # ✅ 二级（或更深）：只显示当前目录
-        tools = _scan_one_dir(app, sel, rel)
-        category_name = _format_category(rel)
+        yield _scan_one_dir(app, sel, rel, force=force)
+
 
-    tools = _apply_search_and_type_filter(app, tools)
+def _iter_all_tools_chunks(app, force=False):
+    """逐个目录 yield Storage 下的全部工具（遍历顺序，最终显示前需按分类+名称重排）"""
+    base = Path(os.path.abspath(app.storage_path))
 
+    engine = get_scan_engine(app)
+    if engine is None:
+        supported = _get_supported_exts(app)
+        try:
+            chunk, chunk_dir = [], None
+            for fe in iter_files(base, exts=supported, recursive=True):
+                if fe.dir != chunk_dir and chunk:
+                    yield _sort_by_name(chunk)
+                    chunk = []
+                chunk_dir = fe.dir
+                chunk.append(_build_tool_item(app, fe, os.path.relpath(fe.dir, str(base))))
+            if chunk:
+                yield _sort_by_name(chunk)
+        except Exception as e:
+            print(f"load_and_display_all_tools 扫描失败: {e}")
+        return
+
+    visited = []
+    errors = []
+    try:
+        for dir_path, _rel, dir_tools in engine.walk(base, force=force, errors=errors):
+            visited.append(str(dir_path))
+            yield _sort_by_name(dir_tools)
+    except Exception as e:
+        print(f"load_and_display_all_tools 扫描失败: {e}")
+        return
+
+    # 有目录扫描失败时遍历结果不完整（其下级都没走到），不能据此清理 catalog
+    if errors:
+        print(f"load_and_display_all_tools: {len(errors)} 个目录扫描失败，跳过 catalog 清理")
+        return
+
+    # 全量遍历完成：清掉已不存在的目录留在 catalog 里的行
+    if visited:
+        try:
+            engine.retain_dirs(visited)
+        except Exception as e:
+            print(f"load_and_display_all_tools: 清理 catalog 失败: {e}")
+
+
+def _prune_removed_records(app):
+    """清理本次扫描确认消失的文件的记录，并丢弃条目有增删的目录中的内存图标（在 Tk 线程调用）"""
+    engine = getattr(app, "scan_engine", None)
+    if engine is None:
+        return
+    try:
+        from ..utils.icon_utils import forget_dir_file_icons
+        forget_dir_file_icons(app, engine.take_changed_dirs())
+    except Exception as e:
+        print(f"刷新目录图标缓存失败: {e}")
+    if prune_records_for_paths is None:
+        return
+    try:
+        prune_records_for_paths(app, engine.take_removed_paths())
+    except Exception as e:
+        print(f"清理已消失工具的记录失败: {e}")
+
+
+def _set_displayed_tools(app, tools):
     try:
         app.current_displayed_tools = tools
     except Exception:
         pass
 
-    app.display_tools_grid(tools, category_name, len(tools))
 
+def _run_view(app, view_key, category_name, make_chunks, final_sort=None):
+    """
+    执行一次视图扫描并显示。
+
+    view_key 标识视图（种类 + 目录）：与当前显示的视图相同即视为刷新。
+    显示名不能用来判断——“所有工具”同时是全部工具视图与 Storage 根目录视图的标题，
+    不同父目录下的同名子目录标题也相同。
+
+    有 Tk 根窗口时在后台线程扫描：第一批结果立即显示，其余逐批追加；
+    新的视图请求（点击其它分类、再次搜索、自动刷新）会使旧的扫描作废。
+    final_sort：结果需要整体重排时（全部工具视图）在扫描结束后按其重排一次。
+    """
+    # 后台扫描用到的配置在 Tk 线程读好：ToolInfo 副本；扫描引擎（按 scan_workers 建线程池）也在此创建
+    _snapshot_tool_info(app)
+    get_scan_engine(app)
+
+    worker = get_scan_worker(app)
+    if worker is None:
+        tools = [t for chunk in make_chunks() for t in chunk]
+        if final_sort is not None:
+            tools = final_sort(tools)
+        tools = _apply_search_and_type_filter(app, tools)
+        _set_displayed_tools(app, tools)
+        app.display_tools_grid(tools, category_name, len(tools))
+        _prune_removed_records(app)
+        return
 
-def load_and_display_all_tools(app):
-    """显示所有工具：递归扫描 Storage；刷新前也清理孤儿记录"""
+    shown = []
+    started = [False]
+    # 刷新的是当前正在显示的视图（自动刷新/重复点击）：不逐批显示，扫描结束后一次性按差异更新，
+    # 没有变化时界面完全不动
+    refreshing = getattr(app, "_view_key", None) == view_key and bool(
+        getattr(app, "current_displayed_tools", None)
+    )
     try:
-        if prune_missing_tool_records:
-            prune_missing_tool_records(app)
-    except Exception as e:
-        print(f"load_and_display_all_tools: prune_missing_tool_records 失败: {e}")
+        app._view_key = view_key
+    except Exception:
+        pass
+
+    def on_chunk(chunk):
+        if refreshing:
+            return
+        part = _apply_search_and_type_filter(app, chunk)
+        if not started[0]:
+            started[0] = True
+            shown.extend(part)
+            _set_displayed_tools(app, shown)
+            app.display_tools_grid(shown, category_name, len(shown))
+        elif part:
+            shown.extend(part)
+            app.append_displayed_tools(part, category_name, len(shown))
+
+    def on_done(all_tools):
+        _prune_removed_records(app)
+        tools = final_sort(all_tools) if final_sort is not None else all_tools
+        tools = _apply_search_and_type_filter(app, tools)
+        if not refreshing and [t.get("path") for t in tools] == [t.get("path") for t in shown]:
+            return
+        # 逐批追加的顺序与最终顺序不同（或期间有变化）：整体重绘一次
+        shown[:] = tools
+        _set_displayed_tools(app, shown)
+        app.display_tools_grid(shown, category_name, len(shown))
+
+    worker.submit(make_chunks, on_chunk, on_done)
+
+
+def load_and_display_tools(app, selected_category_path: str, force=False):
+    """
+    ✅ 扫描中发现消失的文件，其记录随即增量清理（不再每次点击全量清理）
+    ✅ 路径强制限制在 Storage 下（不会跑到盘符根）
+    ✅ 一级分类：汇总其下所有二级目录工具（只扫二级，不递归更深）
+    ✅ 二级分类：仅显示当前目录工具
+    ✅ 增量：目录指纹未变时不再列举（force=True 强制重新列举）
+    ✅ 扫描在后台线程进行，结果逐批显示
+    """
+    if not getattr(app, "storage_path", None):
+        return
+
+    sel, rel, depth, category_name = _resolve_category_view(app, selected_category_path)
+    _run_view(app, ("category", dir_key(sel)), category_name,
+              lambda: _iter_category_chunks(app, sel, rel, depth, force=force))
 
+
+def load_and_display_all_tools(app, force=False):
+    """显示所有工具：递归扫描 Storage（指纹未变的目录只 stat 不列举）；消失文件的记录增量清理"""
     if not getattr(app, "storage_path", None):
         return
 
-    storage_path = os.path.abspath(app.storage_path)
-    base = Path(storage_path)
-    supported = _get_supported_exts(app)
+    _run_view(app, ("all", None), "所有工具", lambda: _iter_all_tools_chunks(app, force=force),
+              final_sort=_sort_all_tools)
+
+
+def _search_scope(app):
+    """
+    搜索范围（目录 key 集合）与标题：全部工具视图为 None；
+    分类视图取其目录（一级分类再加上其二级目录）。目录从未扫描过时返回 (False, None)，调用方回退到普通扫描。
+    """
+    if getattr(app, "showing_all_tools", False):
+        return None, "所有工具"
+
+    sel, _rel, depth, category_name = _resolve_category_view(
+        app, getattr(app, "selected_category_path", None) or app.storage_path
+    )
+    scope = {dir_key(sel)}
+    if depth == 1:
+        catalog = get_tool_catalog(app)
+        state = catalog.get_dir_state(sel) if catalog is not None else None
+        if state is None:
+            return False, None
+        scope.update(dir_key(sel / name) for name in state["subdirs"])
+    return scope, category_name
+
+
+def _filter_sql(query, scope, file_type=""):
+    """结构化条件 + 类型下拉框的类型（file_type，由调用方在 Tk 线程读出）+ 当前分类范围 → (where, params)"""
+    where = [f"({query.where})"]
+    params = list(query.params)
+    if file_type:
+        where.append("type = ?")
+        params.append(file_type)
+    if scope is not None:
+        scope = sorted(scope)
+        where.append(f"dir IN ({', '.join('?' * len(scope))})")
+        params.extend(scope)
+    return " AND ".join(where), params
+
+
+def search_and_display_tools(app):
+    """
+    搜索框输入/回车/搜索按钮：不访问文件系统。
+    普通搜索词查询内存索引；结构化条件编译为 SQL 在 catalog 上按索引过滤，二者同时存在时取交集。
+    后一次搜索会使仍在执行的前一次作废；索引/catalog 不可用或范围未知时回退到普通刷新。
+    """
+    if not getattr(app, "storage_path", None):
+        return
+
+    def fallback():
+        if getattr(app, "showing_all_tools", False):
+            load_and_display_all_tools(app)
+        else:
+            load_and_display_tools(app, getattr(app, "selected_category_path", None) or app.storage_path)
+
+    query = _get_search_query(app)
+    q = query.text.lower()
+    index = get_search_index(app)
+    catalog = get_tool_catalog(app) if query.has_filters else None
+    if query.has_filters:
+        if catalog is None:
+            return fallback()
+    elif not q or not index.ready:
+        return fallback()
 
-    tools = []
     try:
-        for root, _dirs, files in os.walk(str(base)):
-            root_p = Path(root)
-            rel = os.path.relpath(root, str(base))
-            for fn in files:
-                p = root_p / fn
-                if p.is_file() and p.suffix.lower() in supported and p.name != "__init__.py":
-                    tools.append(_build_tool_item(app, p, rel))
+        scope, category_name = _search_scope(app)
     except Exception as e:
-        print(f"load_and_display_all_tools 扫描失败: {e}")
+        print(f"解析搜索范围失败: {e}")
+        return fallback()
+    if scope is False:
+        return fallback()
+
+    usage = _get_usage_stats(app)
+    limit = _get_search_limit(app)
+    file_type = _selected_type(app)
+    accept = _type_accept(app)
+    if query.has_filters:
+        _snapshot_tool_info(app)
+
+    def run(cancelled=None):
+        if not query.has_filters:
+            return index.search(q, scope, cancelled=cancelled, usage=usage, limit=limit, accept=accept)
+
+        where, params = _filter_sql(query, scope, file_type)
+        tools = [row_to_tool(r) for r in catalog.select_tools(where, params)]
+        for t in tools:
+            _apply_tool_info(app, t)
+        if not q:
+            return tools
+        if not index.ready:
+            return _rank_tools(app, q, tools, usage, limit)
+        allowed = {t["path"] for t in tools}
+        return index.search(q, scope, cancelled=cancelled, usage=usage, limit=limit,
+                            accept=lambda t: t.get("path") in allowed)
+
+    def show(tools):
+        _set_displayed_tools(app, tools)
+        try:
+            # 搜索结果不是分类视图：之后回到分类时按新视图逐批显示
+            app._view_key = None
+        except Exception:
+            pass
+        app.display_tools_grid(tools, category_name, len(tools))
+
+    worker = get_scan_worker(app)
+    if worker is None:
+        show(run())
+        return
 
-    tools.sort(key=lambda x: (x.get("category", ""), x.get("name", "").lower()))
-    tools = _apply_search_and_type_filter(app, tools)
+    # submit() 会把 generation 加一：以此判断本次搜索是否已被更新的请求取代
+    gen = worker.generation + 1
 
-    try:
-        app.current_displayed_tools = tools
-    except Exception:
-        pass
+    def make_chunks():
+        tools = run(cancelled=lambda: not worker.is_current(gen))
+        if tools is not None:
+            yield tools
 
-    app.display_tools_grid(tools, "所有工具", len(tools))
+    worker.submit(make_chunks, lambda tools: None, show)
@@ -1,6 +1,6 @@
 # File: ToolBox/app/services/display_service.py
 
-from ..ui.display_manager import display_list_mode, display_grid_mode
+from ..ui.display_manager import display_list_mode, display_grid_mode, append_list_mode, append_grid_mode
 
 def display_tools_grid(app, tools, category_name, count):
     """
@@ -12,3 +12,19 @@ def display_tools_grid(app, tools, category_name, count):
         display_grid_mode(app, tools, category_name, count)
     else:
         display_list_mode(app, tools, category_name, count)
+
+
+def append_tools_display(app, new_tools, category_name, count):
+    """
+    向当前视图追加一批工具（后台扫描逐批返回时使用）
+    当前视图已不是同一模式（例如中途切换了显示模式）时，按 current_displayed_tools 整体重绘
+    """
+    mode = getattr(app, 'display_mode', 'list') or 'list'
+    if mode == 'grid':
+        ok = append_grid_mode(app, new_tools, category_name, count)
+    else:
+        ok = append_list_mode(app, new_tools, category_name, count)
+
+    if not ok:
+        tools = list(getattr(app, 'current_displayed_tools', None) or [])
+        display_tools_grid(app, tools, category_name, len(tools))
@@ -0,0 +1,154 @@
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_ICON_WORKERS = 4
+
+
+class IconLoader:
+    """
+    图标模式的异步图标加载：读取/解码/缩放在线程池中完成，PhotoImage 在 Tk 线程创建。
+
+    - request() 立即返回；结果经队列由 root.after 轮询交回 Tk 线程，再调用 on_ready(photo)
+    - 同一 (路径, 尺寸) 的并发请求合并为一次解码
+    - cancel(ticket) 取消单个格子的请求；begin_view() 使之前的全部请求作废（尚未开始的直接取消，
+      已在解码的结果被丢弃）
+    - on_ready(None) 表示没有文件图标（格子保留类型占位图标）
+    """
+
+    POLL_MS = 16
+    # 每轮最多创建的 PhotoImage 数，避免大量图标同时就绪时卡住界面
+    BATCH = 48
+
+    def __init__(self, app, workers=DEFAULT_ICON_WORKERS, native_first=False):
+        self.app = app
+        # [General] icon_fast_path：在 Tk 线程读好，后台解码时不再访问 app.config
+        self.native_first = bool(native_first)
+        self.pool = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="icon")
+        self.queue = queue.Queue()
+        self.generation = 0
+        self._pending = {}   # (路径, 尺寸) -> [future, {ticket: on_ready}]
+        self._next_ticket = 0
+        self._polling = False
+
+    def request(self, tool_path, size, on_ready, persist=True):
+        """请求文件图标；返回 ticket（用于 cancel）。须在 Tk 线程调用；persist=False 时不写入缩略图缓存"""
+        key = (os.path.normcase(os.path.abspath(str(tool_path))), int(size))
+        self._next_ticket += 1
+        ticket = (key, self._next_ticket)
+
+        entry = self._pending.get(key)
+        if entry is None:
+            gen = self.generation
+            future = self.pool.submit(self._decode, gen, key, str(tool_path), int(size), persist)
+            entry = self._pending[key] = [future, {}]
+        entry[1][ticket] = on_ready
+        self._ensure_polling()
+        return ticket
+
+    def persist(self, tool_path, size):
+        """
+        后台把图标写入缩略图缓存，不回调（须在 Tk 线程调用）：用于拖动图标大小时以 persist=False
+        请求过的图标，松开后按最终尺寸补写；已在缓存中时只是一次读取
+        """
+        self.pool.submit(self._write_back, str(tool_path), int(size))
+
+    def _write_back(self, tool_path, size):
+        from ..utils.icon_utils import decode_file_icon
+
+        try:
+            decode_file_icon(self.app, tool_path, size, persist=True, native_first=self.native_first)
+        except Exception as e:
+            print(f"写入图标缓存失败: {tool_path} -> {e}")
+
+    def cancel(self, ticket):
+        """取消单个请求；同一图标没有其他请求时连同解码任务一起取消"""
+        if ticket is None:
+            return
+        key = ticket[0]
+        entry = self._pending.get(key)
+        if entry is None:
+            return
+        entry[1].pop(ticket, None)
+        if not entry[1]:
+            entry[0].cancel()
+            del self._pending[key]
+
+    def begin_view(self):
+        """视图重建：作废之前的所有请求"""
+        self.generation += 1
+        for future, _callbacks in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    def _decode(self, gen, key, tool_path, size, persist=True):
+        if gen != self.generation:
+            return
+        from ..utils.icon_utils import decode_file_icon
+
+        try:
+            decoded = decode_file_icon(self.app, tool_path, size, persist=persist, native_first=self.native_first)
+        except Exception as e:
+            print(f"后台加载图标失败: {tool_path} -> {e}")
+            decoded = None
+        self.queue.put((gen, key, tool_path, decoded))
+
+    def _ensure_polling(self):
+        if self._polling:
+            return
+        self._polling = True
+        try:
+            self.app.root.after(self.POLL_MS, self._drain)
+        except Exception:
+            self._polling = False
+
+    def _drain(self):
+        from ..utils.icon_utils import remember_file_icon
+
+        self._polling = False
+        for _ in range(self.BATCH):
+            try:
+                gen, key, tool_path, decoded = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if gen != self.generation:
+                continue
+            entry = self._pending.pop(key, None)
+            if entry is None:
+                continue
+
+            photo = None
+            if decoded is not None:
+                try:
+                    photo = remember_file_icon(self.app, tool_path, key[1], decoded)
+                except Exception as e:
+                    print(f"创建图标失败: {tool_path} -> {e}")
+            for on_ready in entry[1].values():
+                try:
+                    on_ready(photo)
+                except Exception as e:
+                    print(f"显示图标失败: {e}")
+
+        if self._pending or not self.queue.empty():
+            self._ensure_polling()
+
+
+def get_icon_loader(app):
+    """获取 app 上的 IconLoader；没有 Tk 根窗口（如脚本/测试环境）时返回 None，调用方同步加载"""
+    loader = getattr(app, "icon_loader", None)
+    if loader is not None:
+        return loader
+    if getattr(app, "root", None) is None:
+        return None
+
+    try:
+        workers = int(app.config["General"].get("icon_workers", str(DEFAULT_ICON_WORKERS)))
+    except Exception:
+        workers = DEFAULT_ICON_WORKERS
+    from ..utils.icon_utils import _native_icon_first
+    loader = IconLoader(app, workers, native_first=_native_icon_first(app))
+    try:
+        app.icon_loader = loader
+    except Exception:
+        pass
+    return loader
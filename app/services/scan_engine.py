@@ -0,0 +1,224 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from ..utils.scan_utils import scan_dir
+from .tool_catalog import get_tool_catalog, row_to_tool
+from .search_index import get_search_index
+
+# 目录 mtime 与扫描时刻过近时视为“不稳定”，下次仍重新列举
+# （FAT/U 盘的时间精度为 2 秒，同一时间片内的后续改动不会再推动 mtime）
+RACY_WINDOW = 2.0
+
+DEFAULT_SCAN_WORKERS = 4
+MAX_SCAN_WORKERS = 32
+
+
+def get_scan_workers(app) -> int:
+    """读取 [General] scan_workers（并行扫描线程数，1 表示不并行）"""
+    try:
+        n = int(app.config["General"].get("scan_workers", str(DEFAULT_SCAN_WORKERS)))
+    except Exception:
+        n = DEFAULT_SCAN_WORKERS
+    return max(1, min(MAX_SCAN_WORKERS, n))
+
+
+class ScanEngine:
+    """
+    增量扫描引擎：为每个目录记住 mtime 指纹（目录中新增/删除/改名都会推动目录 mtime）。
+
+    - 指纹未变的目录：只做一次 stat，工具与子目录列表直接取自 catalog
+    - 指纹变化的目录：重新列举，并与 catalog 对账（未变的文件行原样复用）
+    - force=True：忽略指纹强制重新列举（手动“刷新”；覆盖同名替换这类不改目录 mtime 的情况）
+    - 多个目录通过有界线程池并行扫描（[General] scan_workers），结果按提交顺序合并
+    - 对账中发现消失的文件路径会被暂存，由 Tk 线程取走后增量清理对应记录
+    - 同步维护内存搜索索引（SearchIndex）
+    """
+
+    def __init__(self, app, catalog, index=None):
+        self.app = app
+        self.catalog = catalog
+        self.index = index
+        self.workers = get_scan_workers(app)
+        self._executor = None
+        self._removed = []
+        self._changed_dirs = []
+        self._removed_lock = threading.Lock()
+
+    def note_removed(self, paths):
+        if paths:
+            with self._removed_lock:
+                self._removed.extend(paths)
+
+    def take_removed_paths(self):
+        """取走（并清空）扫描以来确认消失的工具路径"""
+        with self._removed_lock:
+            paths, self._removed = self._removed, []
+        return paths
+
+    def take_changed_dirs(self):
+        """取走（并清空）扫描以来条目有增删的目录（其中工具的内存图标需重新解析来源）"""
+        with self._removed_lock:
+            dirs, self._changed_dirs = self._changed_dirs, []
+        return dirs
+
+    def retain_dirs(self, dir_paths):
+        """全量遍历结束后清理 catalog 中已不存在的目录（被清掉的路径同样暂存待清理记录）"""
+        self.note_removed(self.catalog.retain_dirs(dir_paths))
+        if self.index is not None:
+            self.index.retain_dirs(dir_paths)
+
+    def _remove_dir(self, dir_path):
+        self.note_removed(self.catalog.remove_dir(dir_path))
+        if self.index is not None:
+            self.index.remove_dir(dir_path)
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scan")
+        return self._executor
+
+    def shutdown(self):
+        """程序退出：丢弃尚未开始的目录列举，不等待正在进行的"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # ==================== 指纹 ====================
+
+    def _is_unchanged(self, state, mtime_ns) -> bool:
+        if state is None or state["mtime_ns"] != mtime_ns:
+            return False
+        # 列举时刻与目录 mtime 落在同一时间片内：不能信任该指纹
+        return state["scanned_at"] - mtime_ns / 1e9 >= RACY_WINDOW
+
+    # ==================== 列举/对账 ====================
+
+    def sync_dir(self, dir_path, rel_category_path: str, force=False):
+        """
+        保证 catalog 中 dir_path 这一层是最新的。
+        返回 (tools, subdirs)：当前目录的工具 dict 列表、子目录名列表。
+        """
+        from .category_service import _apply_tool_info, _build_tool_item, _get_supported_exts
+
+        dir_path = Path(dir_path)
+        # 只有“确实不存在”才当作目录被删除；权限不足、网络盘暂时不可达等错误向上抛出，
+        # catalog 中的行原样保留
+        try:
+            st = os.stat(dir_path)
+        except (FileNotFoundError, NotADirectoryError):
+            self._remove_dir(dir_path)
+            return [], []
+
+        state = self.catalog.get_dir_state(dir_path)
+        if not force and self._is_unchanged(state, st.st_mtime_ns):
+            tools = [row_to_tool(r) for r in self.catalog.tools_in_dir(dir_path)]
+            # 标题/备注改在 ToolInfo 中，不影响目录指纹：与行内不一致时改写这些行
+            stale = [t for t in tools if _apply_tool_info(self.app, t)]
+            if stale:
+                self.catalog.replace_dir(dir_path, tools)
+            if self.index is not None and (stale or not self.index.has_dir(dir_path)):
+                self.index.update_dir(dir_path, tools)
+            return tools, state["subdirs"]
+
+        scanned_at = time.time()
+        try:
+            files, subdirs = scan_dir(dir_path, exts=_get_supported_exts(self.app))
+        except (FileNotFoundError, NotADirectoryError):
+            self._remove_dir(dir_path)
+            return [], []
+
+        cached = {r["path"]: r for r in self.catalog.tools_in_dir(dir_path)}
+        tools = []
+        changed = False
+        for fe in files:
+            row = cached.get(fe.path)
+            if row is not None and row["size"] == fe.size and row["mtime"] == fe.mtime:
+                tool = row_to_tool(row)
+                if _apply_tool_info(self.app, tool):
+                    changed = True
+                tools.append(tool)
+                continue
+            tools.append(_build_tool_item(self.app, fe, rel_category_path))
+            changed = True
+
+        new_state = {
+            "mtime_ns": st.st_mtime_ns,
+            "subdirs": subdirs,
+            "scanned_at": scanned_at,
+        }
+        if changed or len(tools) != len(cached):
+            self.note_removed(self.catalog.replace_dir(dir_path, tools, state=new_state))
+        else:
+            self.catalog.set_dir_state(dir_path, new_state)
+        if self.index is not None and (changed or len(tools) != len(cached) or not self.index.has_dir(dir_path)):
+            self.index.update_dir(dir_path, tools)
+
+        if state is not None and state["mtime_ns"] != st.st_mtime_ns:
+            with self._removed_lock:
+                self._changed_dirs.append(str(dir_path))
+
+        # 消失的子目录：连同其下级一起从 catalog 移除
+        if state is not None:
+            for gone in set(state["subdirs"]) - set(subdirs):
+                self._remove_dir(dir_path / gone)
+
+        return tools, subdirs
+
+    def _sync_dir_safe(self, item, force, errors=None):
+        dir_path, rel = item
+        try:
+            return self.sync_dir(dir_path, rel, force=force)
+        except Exception as e:
+            print(f"扫描目录失败: {dir_path} -> {e}")
+            if errors is not None:
+                errors.append((dir_path, e))
+            return [], []
+
+    def iter_sync_dirs(self, items, force=False, errors=None):
+        """
+        并行扫描多个目录：items 为 [(dir_path, rel_category_path)]。
+        按 items 的顺序逐个 yield (tools, subdirs)：某个目录一扫完（且排在它前面的都已完成）就立即交出，
+        顺序与完成先后无关，结果确定。
+        扫描失败的目录 yield ([], [])；传入 errors 列表时以 (dir_path, 异常) 追加到其中。
+        """
+        items = list(items)
+        if self.workers <= 1 or len(items) <= 1:
+            return (self._sync_dir_safe(it, force, errors) for it in items)
+        return self._get_executor().map(lambda it: self._sync_dir_safe(it, force, errors), items)
+
+    def walk(self, base, force=False, errors=None):
+        """
+        逐层遍历 base 及其全部子目录（子目录列表来自指纹缓存，未变目录不再列举）。
+        同一层的目录并行扫描；逐个 yield (dir_path, rel_category_path, tools)，顺序确定。
+        扫描失败的目录（及其下级）不会被遍历到；传入 errors 列表时失败记录追加到其中。
+        """
+        level = [(Path(base), ".")]
+        while level:
+            next_level = []
+            for (dir_path, rel), (tools, subdirs) in zip(level, self.iter_sync_dirs(level, force=force, errors=errors)):
+                yield dir_path, rel, tools
+                for name in subdirs:
+                    sub_rel = name if rel == "." else os.path.join(rel, name)
+                    next_level.append((dir_path / name, sub_rel))
+            level = next_level
+
+
+def get_scan_engine(app):
+    """获取 app 上的 ScanEngine；catalog 不可用时返回 None"""
+    engine = getattr(app, "scan_engine", None)
+    if engine is not None:
+        return engine
+
+    catalog = get_tool_catalog(app)
+    if catalog is None:
+        return None
+
+    engine = ScanEngine(app, catalog, get_search_index(app))
+    try:
+        app.scan_engine = engine
+    except Exception:
+        pass
+    return engine
@@ -0,0 +1,110 @@
+import queue
+import threading
+
+
+class ScanWorker:
+    """
+    在后台线程执行扫描，结果分批经由队列交回 Tk 线程（root.after 轮询）。
+
+    - submit() 会使之前提交、尚未完成的扫描作废（generation 递增）；作废的扫描尽早停止，
+      其已在队列中的结果被丢弃
+    - on_chunk(tools) / on_done(all_tools) 总是在 Tk 线程中被调用
+    """
+
+    POLL_MS = 16
+
+    def __init__(self, app):
+        self.app = app
+        self.queue = queue.Queue()
+        self.generation = 0
+        self._handlers = None
+        self._polling = False
+
+    def submit(self, make_chunks, on_chunk, on_done):
+        """make_chunks()：返回逐批 yield 工具列表的可迭代对象（在后台线程中执行）"""
+        self.generation += 1
+        gen = self.generation
+        self._handlers = (gen, on_chunk, on_done)
+
+        t = threading.Thread(target=self._run, args=(gen, make_chunks), daemon=True)
+        t.start()
+        self._ensure_polling()
+        return gen
+
+    def cancel(self):
+        self.generation += 1
+        self._handlers = None
+
+    def is_current(self, gen) -> bool:
+        return gen == self.generation
+
+    def _run(self, gen, make_chunks):
+        collected = []
+        try:
+            for chunk in make_chunks():
+                if gen != self.generation:
+                    return
+                chunk = list(chunk)
+                collected.extend(chunk)
+                self.queue.put((gen, "chunk", chunk))
+        except Exception as e:
+            print(f"后台扫描失败: {e}")
+        if gen == self.generation:
+            self.queue.put((gen, "done", collected))
+
+    def _ensure_polling(self):
+        if self._polling:
+            return
+        self._polling = True
+        try:
+            self.app.root.after(self.POLL_MS, self._drain)
+        except Exception:
+            self._polling = False
+
+    def _drain(self):
+        self._polling = False
+        pending = []
+        done = None
+        try:
+            while True:
+                gen, kind, payload = self.queue.get_nowait()
+                if self._handlers is None or gen != self._handlers[0]:
+                    continue
+                if kind == "chunk":
+                    # 同一轮里到达的多批结果合并为一次界面更新
+                    pending.extend(payload)
+                else:
+                    done = payload
+        except queue.Empty:
+            pass
+
+        handlers = self._handlers
+        if handlers is not None:
+            _gen, on_chunk, on_done = handlers
+            try:
+                if pending or done is not None:
+                    on_chunk(pending)
+                if done is not None:
+                    self._handlers = None
+                    on_done(done)
+            except Exception as e:
+                print(f"分批显示扫描结果失败: {e}")
+
+        if self._handlers is not None:
+            self._ensure_polling()
+
+
+def get_scan_worker(app):
+    """获取 app 上的 ScanWorker；没有 Tk 根窗口（如脚本/测试环境）时返回 None，调用方同步扫描"""
+    worker = getattr(app, "scan_worker", None)
+    if worker is not None:
+        return worker
+    if getattr(app, "root", None) is None:
+        return None
+
+    worker = ScanWorker(app)
+    try:
+        app.scan_worker = worker
+    except Exception:
+        pass
+    return worker
@@ -0,0 +1,354 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from ..utils.pinyin_utils import sort_key_of
+from ..utils.search_utils import search_text, fuzzy_pattern, tool_match_score, usage_boost, top_k, _pinyin_of
+from .tool_catalog import dir_key, row_to_tool
+
+GRAM = 3
+# 名称前缀倒排表的 key 长度（1..PREFIX 个字符）；更长的查询取其前 PREFIX 个字符的表再校验
+PREFIX = 4
+# 有结果数上限时，最多收集 上限 × CANDIDATE_FACTOR 个候选再打分（至少 MIN_CANDIDATES 个）
+CANDIDATE_FACTOR = 3
+MIN_CANDIDATES = 600
+# 收集候选时每批处理的文档数（每批检查一次是否已取消）
+_BATCH = 1024
+# 求交集时最多用几个最短的倒排表（其余条件由逐个校验保证）
+_MOST_LISTS = 4
+
+
+def _grams(text):
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def _intersect(lists, most=None):
+    """
+    若干倒排表（按文档 id 升序）的交集，返回升序列表。
+    从最短的表开始：与长表相差悬殊时逐个二分查找，否则用集合求交（在 C 层完成）。
+    most：只取最短的几个表求交（结果是真交集的超集，调用方随后会逐个校验）
+    """
+    lists = sorted(lists, key=len)[:most]
+    result = set(lists[0])
+    for lst in lists[1:]:
+        if not result:
+            break
+        if len(result) * 32 < len(lst):
+            result = {i for i in result if _contains(lst, i)}
+        else:
+            result.intersection_update(lst)
+    return sorted(result)
+
+
+def _contains(sorted_ids, doc_id):
+    i = bisect_left(sorted_ids, doc_id)
+    return i < len(sorted_ids) and sorted_ids[i] == doc_id
+
+
+class SearchIndex:
+    """
+    内存倒排索引（名称 / 备注 / 相对路径 / 名称拼音）。
+
+    - 由扫描引擎按目录维护：update_dir() 整体替换某目录的文档，remove_dir() 删除目录及其下级
+    - trigram 倒排表：查询的 trigram 倒排表（最短的几个）求交集得到候选，再对 search_text() 做一次子串校验
+    - 名称前缀倒排表（名称 / 拼音首字母 / 全拼的前 1..4 个字符，按长度分桶）：前缀命中按名称由短到长取出，
+      即按得分从高到低；1–2 个字符的查询只查前缀表与名称字符倒排表，不做线性扫描
+    - 名称字符倒排表：查询中各字符的倒排表求交集，作为子序列模糊匹配（“hbu” → HiBitUninstaller）的候选
+    - 候选按 常用工具 → 前缀 → 子串 → 模糊 的顺序收集，有结果数上限时收集够
+      上限 × CANDIDATE_FACTOR 个就停止，只对这些候选打分
+    - 倒排表只追加；删除的文档留作墓碑，墓碑过多时整体重建
+    """
+
+    def __init__(self, storage_path=None):
+        self.lock = threading.RLock()
+        self.storage_prefix = ""
+        if storage_path:
+            self.storage_prefix = os.path.normcase(os.path.abspath(str(storage_path))).rstrip(os.sep) + os.sep
+        self.ready = False
+        self._clear()
+
+    def _clear(self):
+        self._docs = []          # id -> tool dict（None 为墓碑）
+        self._texts = []         # id -> 搜索文本
+        self._names = []         # id -> 小写名称（模糊匹配用）
+        self._alts = []          # id -> (小写名称, 拼音首字母, 全拼)（前缀匹配用）
+        self._doc_dirs = []      # id -> 目录 key
+        self._by_path = {}       # normcase(path) -> id
+        self._by_dir = {}        # 目录 key -> set(id)
+        self._postings = {}      # trigram -> [id, ...]
+        self._name_chars = {}    # 名称中的字符 -> [id, ...]
+        self._prefixes = {}      # 前缀 -> {名称/拼音长度: [id, ...]}
+        self._dead = 0
+
+    # ==================== 维护 ====================
+
+    def _add(self, tool, dk):
+        doc_id = len(self._docs)
+        text = search_text(tool, self.storage_prefix)
+        self._docs.append(tool)
+        self._texts.append(text)
+        name = (tool.get("name", "") or "").lower()
+        self._names.append(name)
+        full, initials = _pinyin_of(tool)
+        alts = (name, initials, full)
+        self._alts.append(alts)
+        self._doc_dirs.append(dk)
+        self._by_path[os.path.normcase(tool.get("path", "") or "")] = doc_id
+        self._by_dir.setdefault(dk, set()).add(doc_id)
+        postings = self._postings
+        for g in _grams(text):
+            lst = postings.get(g)
+            if lst is None:
+                postings[g] = [doc_id]
+            else:
+                lst.append(doc_id)
+        chars = self._name_chars
+        for ch in set(name):
+            lst = chars.get(ch)
+            if lst is None:
+                chars[ch] = [doc_id]
+            else:
+                lst.append(doc_id)
+        prefixes = self._prefixes
+        keys = {(alt[:k], len(alt)) for alt in alts if alt for k in range(1, min(PREFIX, len(alt)) + 1)}
+        for key, length in keys:
+            prefixes.setdefault(key, {}).setdefault(length, []).append(doc_id)
+
+    def _drop(self, doc_id):
+        if self._docs[doc_id] is None:
+            return
+        self._by_path.pop(os.path.normcase(self._docs[doc_id].get("path", "") or ""), None)
+        ids = self._by_dir.get(self._doc_dirs[doc_id])
+        if ids is not None:
+            ids.discard(doc_id)
+        self._docs[doc_id] = None
+        self._texts[doc_id] = ""
+        self._names[doc_id] = ""
+        self._alts[doc_id] = ("", "", "")
+        self._dead += 1
+
+    def _maybe_compact(self):
+        if self._dead < 1024 or self._dead * 2 < len(self._docs):
+            return
+        alive = [(t, dk) for t, dk in zip(self._docs, self._doc_dirs) if t is not None]
+        self._clear()
+        for tool, dk in alive:
+            self._add(tool, dk)
+
+    def has_dir(self, dir_path) -> bool:
+        with self.lock:
+            return dir_key(dir_path) in self._by_dir
+
+    def update_dir(self, dir_path, tools):
+        """用目录的最新工具列表替换索引中该目录的文档"""
+        dk = dir_key(dir_path)
+        with self.lock:
+            for doc_id in list(self._by_dir.get(dk, ())):
+                self._drop(doc_id)
+            self._by_dir[dk] = set()
+            for tool in tools:
+                old = self._by_path.get(os.path.normcase(tool.get("path", "") or ""))
+                if old is not None:
+                    self._drop(old)
+                self._add(tool, dk)
+            self._maybe_compact()
+
+    def remove_dir(self, dir_path):
+        """删除目录及其所有下级目录的文档"""
+        dk = dir_key(dir_path)
+        prefix = dk.rstrip(os.sep) + os.sep
+        with self.lock:
+            for d in [d for d in self._by_dir if d == dk or d.startswith(prefix)]:
+                for doc_id in list(self._by_dir.pop(d)):
+                    self._drop(doc_id)
+            self._maybe_compact()
+
+    def retain_dirs(self, dir_paths):
+        """全量遍历结束后调用：删除不在 dir_paths 中的目录的文档"""
+        keep = {dir_key(d) for d in dir_paths}
+        with self.lock:
+            for d in [d for d in self._by_dir if d not in keep]:
+                for doc_id in list(self._by_dir.pop(d)):
+                    self._drop(doc_id)
+            self._maybe_compact()
+
+    def load_rows(self, rows):
+        """
+        从 catalog 的行载入（启动时在后台线程调用）。
+        已由扫描引擎写入过的目录以索引中的为准（更新），不会被这份快照覆盖。
+        """
+        with self.lock:
+            known = set(self._by_dir)
+            for row in rows:
+                if row["dir"] in known:
+                    continue
+                self._add(row_to_tool(row), row["dir"])
+            self.ready = True
+
+    def __len__(self):
+        with self.lock:
+            return len(self._by_path)
+
+    # ==================== 查询 ====================
+
+    def search(self, query, scope_dirs=None, cancelled=None, usage=None, limit=None, accept=None):
+        """
+        返回与 query 匹配的工具 dict 列表，按匹配质量 + 使用频率排序，最多 limit 个（None 为不限）。
+
+        - 子串命中名称/备注/相对 Storage 的路径（不区分大小写）；Storage 本身的路径不参与匹配
+          （1–2 个字符的查询只匹配名称/拼音）
+        - 名称的子序列模糊命中排在子串命中之后
+        - scope_dirs：目录 key 集合，只在这些目录中查找；None 表示全部
+        - usage：get_usage_stats() 的结果，用于加权（这些工具总会进入候选）
+        - accept：可选的过滤函数（如类型过滤），在收集候选时应用
+        - cancelled：可选的无参函数，返回 True 时尽早放弃（返回 None）
+        """
+        q = (query or "").strip().lower()
+        if not q:
+            return []
+        usage = usage or {}
+        cap = max(limit * CANDIDATE_FACTOR, MIN_CANDIDATES) if limit else None
+
+        with self.lock:
+            hits = self._collect(q, scope_dirs, usage, accept, cap, cancelled)
+        if hits is None:
+            return None
+
+        # 打分在锁外进行（docs 中的 dict 只会被整体替换，不会原地修改）
+        now = time.time()
+
+        def scored():
+            for n, (tool, text) in enumerate(hits):
+                if cancelled is not None and not (n & 0x3FF) and cancelled():
+                    return
+                s = tool_match_score(q, tool, text)
+                if s is None:
+                    continue
+                s += usage_boost(usage.get(os.path.normcase(tool.get("path", "") or "")), now)
+                yield s, sort_key_of(tool), tool
+
+        result = top_k(scored(), limit)
+        if cancelled is not None and cancelled():
+            return None
+        return result
+
+    def _collect(self, q, scope_dirs, usage, accept, cap, cancelled):
+        """按 常用工具 → 前缀 → 子串 → 模糊 的顺序收集候选 [(tool, text)]，够 cap 个即停止；取消时返回 None"""
+        if scope_dirs is not None:
+            scope_ids = set()
+            for d in scope_dirs:
+                scope_ids.update(self._by_dir.get(d, ()))
+        else:
+            scope_ids = None
+
+        docs, texts, names, alts = self._docs, self._texts, self._names, self._alts
+        hits = []
+        seen = set()
+
+        def take(ids, keep):
+            """
+            把 ids 中的文档加入候选（keep 为批量过滤函数：id 列表 → 符合条件的 id 列表，None 为不过滤）；
+            按批处理，收集够了返回 True，取消返回 None
+            """
+            ids = ids if isinstance(ids, list) else list(ids)
+            for start in range(0, len(ids), _BATCH):
+                if cancelled is not None and cancelled():
+                    return None
+                batch = ids[start:start + _BATCH]
+                for doc_id in (keep(batch) if keep is not None else batch):
+                    if doc_id in seen or docs[doc_id] is None:
+                        continue
+                    if scope_ids is not None and doc_id not in scope_ids:
+                        continue
+                    seen.add(doc_id)
+                    if accept is not None and not accept(docs[doc_id]):
+                        continue
+                    hits.append((docs[doc_id], texts[doc_id]))
+                    if cap is not None and len(hits) >= cap:
+                        return True
+            return False
+
+        search = fuzzy_pattern(q).search
+
+        def in_names(batch):
+            return [i for i in batch if q in names[i]]
+
+        def in_texts(batch):
+            return [i for i in batch if q in texts[i]]
+
+        def prefixed(batch):
+            return [i for i in batch if any(a.startswith(q) for a in alts[i])]
+
+        def fuzzy(batch):
+            return [i for i in batch if search(names[i])]
+
+        def substring():
+            """子串候选：短查询取名称字符倒排表的交集（只匹配名称），否则取 trigram 倒排表的交集"""
+            if len(q) < GRAM:
+                lists, keep = [self._name_chars.get(ch) for ch in set(q)], in_names
+            else:
+                lists, keep = [self._postings.get(g) for g in _grams(q)], in_texts
+            return (_intersect(lists, _MOST_LISTS) if all(lists) else []), keep
+
+        def tiers():
+            # 1) 有使用记录的工具（使用频率加成可能把它们排到前面，不能因截断漏掉）
+            used = [i for i in (self._by_path.get(p) for p in usage) if i is not None]
+            yield used, lambda batch: [i for i in batch if q in texts[i] or search(names[i])]
+
+            # 2) 名称/拼音前缀：按长度由短到长，即前缀得分由高到低（比 key 长的查询再校验前缀）
+            buckets = self._prefixes.get(q[:PREFIX], {})
+            keep = None if len(q) <= PREFIX else prefixed
+            for length in sorted(buckets):
+                if length >= len(q):
+                    yield buckets[length], keep
+
+            # 3) 子串
+            yield substring()
+
+            # 4) 名称子序列
+            if len(q) > 1:
+                lists = [self._name_chars.get(ch) for ch in set(q)]
+                if all(lists):
+                    yield _intersect(lists, _MOST_LISTS), fuzzy
+
+        for ids, check in tiers():
+            done = take(ids, check)
+            if done is None:
+                return None
+            if done:
+                break
+        return hits
+
+
+def get_search_index(app):
+    """获取 app 上的 SearchIndex（不存在则创建，尚未加载 catalog 时 ready 为 False）"""
+    index = getattr(app, "search_index", None)
+    if index is not None:
+        return index
+
+    index = SearchIndex(getattr(app, "storage_path", None))
+    try:
+        app.search_index = index
+    except Exception:
+        pass
+    return index
+
+
+def warm_search_index(app):
+    """后台线程：从 catalog 载入索引（不访问文件系统）"""
+    from .tool_catalog import get_tool_catalog
+
+    index = get_search_index(app)
+    catalog = get_tool_catalog(app)
+    if catalog is None:
+        return index
+
+    def _load():
+        try:
+            index.load_rows(catalog.all_tools())
+        except Exception as e:
+            print(f"载入搜索索引失败: {e}")
+
+    threading.Thread(target=_load, daemon=True).start()
+    return index
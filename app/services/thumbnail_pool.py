@@ -0,0 +1,63 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ..utils.image_thumbnail import make_thumbnail
+
+DEFAULT_THUMBNAIL_PROCESSES = 2
+
+
+class ThumbnailPool:
+    """
+    图片缩略图的进程池：大图解码是纯 CPU 工作，放到子进程里不占主进程的 GIL。
+    进程池不可用（启动失败 / 子进程崩溃）时退回当前线程生成。
+    """
+
+    def __init__(self, processes=DEFAULT_THUMBNAIL_PROCESSES):
+        self.processes = max(1, int(processes))
+        self.lock = threading.Lock()
+        self._pool = None
+        self._broken = False
+
+    def _get_pool(self):
+        with self.lock:
+            if self._pool is None and not self._broken:
+                try:
+                    self._pool = ProcessPoolExecutor(max_workers=self.processes)
+                except Exception as e:
+                    print(f"创建缩略图进程池失败: {e}")
+                    self._broken = True
+            return self._pool
+
+    def render(self, image_path, size):
+        """生成缩略图（阻塞等待结果，在后台线程中调用）：(width, height, rgba)"""
+        pool = self._get_pool()
+        if pool is not None:
+            try:
+                # 图片本身无法解码时，子进程中的异常原样抛出
+                return pool.submit(make_thumbnail, str(image_path), int(size)).result()
+            except (BrokenProcessPool, RuntimeError) as e:
+                print(f"缩略图进程池不可用，改为本进程生成: {e}")
+                with self.lock:
+                    self._broken = True
+                    self._pool = None
+        return make_thumbnail(image_path, size)
+
+
+def get_thumbnail_pool(app):
+    """获取 app 上的 ThumbnailPool（进程数取自 [General] thumbnail_processes）"""
+    pool = getattr(app, "thumbnail_pool", None)
+    if pool is not None:
+        return pool
+
+    try:
+        processes = int(app.config["General"].get("thumbnail_processes", str(DEFAULT_THUMBNAIL_PROCESSES)))
+    except Exception:
+        processes = DEFAULT_THUMBNAIL_PROCESSES
+    pool = ThumbnailPool(min(processes, os.cpu_count() or 1))
+    try:
+        app.thumbnail_pool = pool
+    except Exception:
+        pass
+    return pool
@@ -0,0 +1,151 @@
+import os
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+
+THUMBNAIL_FILE = Path(__file__).parent.parent.parent / "ToolBox.thumbs.db"
+
+_SCHEMA_VERSION = 1
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS thumbs (
+        path        TEXT NOT NULL,
+        px          INTEGER NOT NULL,
+        fingerprint TEXT NOT NULL,
+        source      TEXT NOT NULL,
+        width       INTEGER NOT NULL,
+        height      INTEGER NOT NULL,
+        rgba        BLOB NOT NULL,
+        PRIMARY KEY (path, px)
+    )
+    """,
+]
+
+
+def thumb_key(file_path) -> str:
+    return os.path.normcase(os.path.abspath(str(file_path)))
+
+
+class ThumbnailStore:
+    """
+    持久化图标缩略图（SQLite blob 表，与 ToolBox.ini 同目录的 ToolBox.thumbs.db）。
+
+    - key：(规范化路径, 像素尺寸)；每行带图标来源与来源指纹，来源或指纹不符即视为未命中
+    - 数据为解码、缩放后的 RGBA 原始字节（zlib 压缩），冷启动直接还原，无需再提取/解码/缩放
+    - 连接允许跨线程使用，读写都在 self.lock 内完成
+    """
+
+    def __init__(self, db_file=None):
+        self.db_file = Path(db_file) if db_file else THUMBNAIL_FILE
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.lock:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < _SCHEMA_VERSION:
+                with self.conn:
+                    for sql in _SCHEMA:
+                        self.conn.execute(sql)
+                    self.conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def close(self):
+        with self.lock:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+
+    # ==================== 指纹 ====================
+
+    def fingerprint(self, file_path, source=None):
+        """
+        来源指纹：工具文件的 大小/修改时间（+ 图标来自同名 .ico/.png 时，该文件的大小/修改时间）。
+        不含所在目录的 mtime：同目录其他文件的增删不会使缓存失效。文件不存在返回 None。
+        """
+        file_path = str(file_path)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        parts = [str(st.st_size), str(st.st_mtime_ns)]
+        if source and thumb_key(source) != thumb_key(file_path):
+            try:
+                src = os.stat(source)
+            except OSError:
+                return None
+            parts += [str(src.st_size), str(src.st_mtime_ns)]
+        return ":".join(parts)
+
+    # ==================== 读写 ====================
+
+    def get(self, file_path, px, source=None):
+        """
+        取缩略图：(width, height, rgba 字节, 来源路径)；
+        source 为调用方刚解析出的图标来源（None 表示没有来源，即工具文件本身），
+        与写入时的来源不同（如新放入了同名 .ico/.png）视为未命中；
+        width 为 0 表示“已确认没有可用的文件图标”（调用方直接用类型图标，不再探测）；
+        没有缓存或来源已变化（指纹不符）返回 None
+        """
+        key = thumb_key(file_path)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT fingerprint, source, width, height, rgba FROM thumbs WHERE path = ? AND px = ?",
+                (key, int(px)),
+            ).fetchone()
+        if row is None:
+            return None
+        fingerprint, stored_source, width, height, blob = row
+        if thumb_key(stored_source or file_path) != thumb_key(source or file_path):
+            return None
+        if self.fingerprint(file_path, stored_source or None) != fingerprint:
+            return None
+        try:
+            return width, height, zlib.decompress(blob), stored_source
+        except zlib.error:
+            return None
+
+    def put(self, file_path, px, source, width, height, rgba):
+        """写入缩略图；指纹在写入时计算（来源文件已不存在则不写）"""
+        fingerprint = self.fingerprint(file_path, source)
+        if fingerprint is None:
+            return
+        with self.lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO thumbs "
+                    "(path, px, fingerprint, source, width, height, rgba) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        thumb_key(file_path), int(px), fingerprint, str(source or ""),
+                        int(width), int(height), zlib.compress(bytes(rgba), 1),
+                    ),
+                )
+
+    def remove(self, file_path):
+        """删除工具文件各尺寸的缓存图标（工具被删除时调用）"""
+        with self.lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM thumbs WHERE path = ?", (thumb_key(file_path),))
+
+
+def get_thumbnail_store(app):
+    """获取 app 上的 ThumbnailStore；不存在时按需创建（打开失败返回 None，调用方不做持久化）"""
+    store = getattr(app, "thumbnail_store", None)
+    if store is not None:
+        return store
+
+    try:
+        db_file = THUMBNAIL_FILE
+        cm = getattr(app, "config_manager", None)
+        if cm is not None and getattr(cm, "config_file", None):
+            db_file = Path(cm.config_file).parent / THUMBNAIL_FILE.name
+        store = ThumbnailStore(db_file)
+    except Exception as e:
+        print(f"打开图标缓存失败: {e}")
+        return None
+
+    try:
+        app.thumbnail_store = store
+    except Exception:
+        pass
+    return store
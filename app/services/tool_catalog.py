@@ -0,0 +1,343 @@
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from ..utils.pinyin_utils import pinyin_keys
+
+CATALOG_FILE = Path(__file__).parent.parent.parent / "ToolBox.db"
+
+# 按 user_version 逐级升级的建表/迁移脚本
+_MIGRATIONS = [
+    (1, [
+        """
+        CREATE TABLE IF NOT EXISTS tools (
+            path     TEXT PRIMARY KEY,
+            dir      TEXT NOT NULL,
+            category TEXT NOT NULL,
+            name     TEXT NOT NULL,
+            ext      TEXT NOT NULL,
+            type     TEXT NOT NULL,
+            size     INTEGER NOT NULL DEFAULT 0,
+            mtime    REAL NOT NULL DEFAULT 0,
+            note     TEXT NOT NULL DEFAULT ''
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_tools_dir ON tools(dir)",
+        "CREATE INDEX IF NOT EXISTS idx_tools_category ON tools(category)",
+        "CREATE INDEX IF NOT EXISTS idx_tools_type ON tools(type)",
+    ]),
+    (2, [
+        """
+        CREATE TABLE IF NOT EXISTS dirs (
+            dir        TEXT PRIMARY KEY,
+            mtime_ns   INTEGER NOT NULL,
+            subdirs    TEXT NOT NULL DEFAULT '[]',
+            scanned_at REAL NOT NULL DEFAULT 0
+        )
+        """,
+    ]),
+    (3, [
+        "ALTER TABLE tools ADD COLUMN py_full TEXT NOT NULL DEFAULT ''",
+        "ALTER TABLE tools ADD COLUMN py_initials TEXT NOT NULL DEFAULT ''",
+        "ALTER TABLE tools ADD COLUMN sort_key TEXT NOT NULL DEFAULT ''",
+        lambda conn: _backfill_pinyin(conn),
+    ]),
+    (4, [
+        "ALTER TABLE tools ADD COLUMN added REAL NOT NULL DEFAULT 0",
+        lambda conn: _backfill_added(conn),
+        "CREATE INDEX IF NOT EXISTS idx_tools_ext ON tools(ext)",
+        "CREATE INDEX IF NOT EXISTS idx_tools_size ON tools(size)",
+        "CREATE INDEX IF NOT EXISTS idx_tools_added ON tools(added)",
+        "CREATE INDEX IF NOT EXISTS idx_tools_sort_key ON tools(sort_key)",
+    ]),
+    (5, [
+        """
+        CREATE TABLE IF NOT EXISTS file_meta (
+            path         TEXT PRIMARY KEY,
+            size         INTEGER NOT NULL,
+            mtime        REAL NOT NULL,
+            version      TEXT NOT NULL DEFAULT '',
+            product_name TEXT NOT NULL DEFAULT '',
+            description  TEXT NOT NULL DEFAULT '',
+            machine      TEXT NOT NULL DEFAULT ''
+        )
+        """,
+    ]),
+]
+
+_TOOL_COLUMNS = (
+    "path", "dir", "category", "name", "ext", "type", "size", "mtime", "note",
+    "py_full", "py_initials", "sort_key", "added",
+)
+
+
+def _backfill_pinyin(conn):
+    """升级到 v3：为已有的行计算拼音键"""
+    rows = conn.execute("SELECT path, name FROM tools").fetchall()
+    conn.executemany(
+        "UPDATE tools SET py_full = ?, py_initials = ?, sort_key = ? WHERE path = ?",
+        [(*pinyin_keys(r[1]), r[0]) for r in rows],
+    )
+
+
+def dir_key(dir_path) -> str:
+    """目录在目录表中的 key：绝对路径 + normcase（Windows 下大小写不敏感）"""
+    return os.path.normcase(os.path.abspath(str(dir_path)))
+
+
+def row_to_tool(row) -> dict:
+    """把 tools 表的一行转换为界面使用的工具 dict"""
+    return {
+        "name": row["name"],
+        "path": row["path"],
+        "ext": row["ext"],
+        "type": row["type"],
+        "category": row["category"],
+        "note": row["note"],
+        "size": row["size"],
+        "mtime": row["mtime"],
+        "py_full": row["py_full"],
+        "py_initials": row["py_initials"],
+        "sort_key": row["sort_key"],
+        "added": row["added"],
+    }
+
+
+def _pinyin_columns(tool):
+    """工具 dict 上已算好的拼音键；没有则按名称计算（结果有缓存）"""
+    if tool.get("sort_key"):
+        return tool.get("py_full", "") or "", tool.get("py_initials", "") or "", tool["sort_key"]
+    return pinyin_keys(tool.get("name", "") or "")
+
+
+def _backfill_added(conn):
+    """升级到 v4：已有行的添加时间取文件的 ctime（文件不在了就用 mtime）"""
+    updates = []
+    for path, mtime in conn.execute("SELECT path, mtime FROM tools").fetchall():
+        try:
+            added = os.stat(path).st_ctime
+        except OSError:
+            added = mtime
+        updates.append((added, path))
+    conn.executemany("UPDATE tools SET added = ? WHERE path = ?", updates)
+
+
+class ToolCatalog:
+    """
+    持久化工具目录（SQLite，与 ToolBox.ini 同目录）。
+
+    界面查询直接读这里；文件系统只在对账（reconcile）时才访问。
+    连接允许跨线程使用，所有读写都在 self.lock 内完成。
+    """
+
+    def __init__(self, db_file=None):
+        self.db_file = Path(db_file) if db_file else CATALOG_FILE
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    def _migrate(self):
+        with self.lock:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            for target, statements in _MIGRATIONS:
+                if version >= target:
+                    continue
+                with self.conn:
+                    for sql in statements:
+                        if callable(sql):
+                            sql(self.conn)
+                        else:
+                            self.conn.execute(sql)
+                    self.conn.execute(f"PRAGMA user_version = {int(target)}")
+                version = target
+
+    def close(self):
+        with self.lock:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+
+    # ==================== 查询 ====================
+
+    def tools_in_dir(self, dir_path):
+        """某个目录（不递归）下的全部工具行"""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT * FROM tools WHERE dir = ?", (dir_key(dir_path),)
+            ).fetchall()
+
+    def all_tools(self):
+        with self.lock:
+            return self.conn.execute("SELECT * FROM tools").fetchall()
+
+    def select_tools(self, where="", params=(), order_by_sort_key=True):
+        """
+        按条件查询工具行：where 为 SQL 条件片段（由 tool_query 编译而来，只引用带索引的列），
+        params 为对应的参数
+        """
+        sql = "SELECT * FROM tools"
+        if where:
+            sql += f" WHERE {where}"
+        if order_by_sort_key:
+            sql += " ORDER BY sort_key, path"
+        with self.lock:
+            return self.conn.execute(sql, tuple(params)).fetchall()
+
+    def get_dir_state(self, dir_path):
+        """
+        目录指纹：{"mtime_ns", "subdirs", "scanned_at"}；从未扫描过返回 None
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT mtime_ns, subdirs, scanned_at FROM dirs WHERE dir = ?",
+                (dir_key(dir_path),),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            subdirs = json.loads(row["subdirs"])
+        except Exception:
+            subdirs = []
+        return {
+            "mtime_ns": row["mtime_ns"],
+            "subdirs": subdirs,
+            "scanned_at": row["scanned_at"],
+        }
+
+    # ==================== 写入 ====================
+
+    def replace_dir(self, dir_path, tools, state=None):
+        """
+        用一次目录列举的结果整体替换该目录的行（单事务）。
+        tools：dict 列表，字段同 _TOOL_COLUMNS（dir 字段会被统一覆盖）。
+        state：可选的目录指纹（同 get_dir_state 的字段），与工具行在同一事务内写入。
+        返回：本次被移除的工具路径列表（文件已不在目录中）。
+        """
+        dk = dir_key(dir_path)
+        with self.lock:
+            old_paths = {
+                r[0] for r in self.conn.execute("SELECT path FROM tools WHERE dir = ?", (dk,))
+            }
+            new_paths = {t["path"] for t in tools}
+            removed = sorted(old_paths - new_paths)
+
+            with self.conn:
+                if removed:
+                    self.conn.executemany("DELETE FROM tools WHERE path = ?", [(p,) for p in removed])
+                self.conn.executemany(
+                    f"INSERT OR REPLACE INTO tools ({', '.join(_TOOL_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(_TOOL_COLUMNS))})",
+                    [
+                        (
+                            t["path"], dk, t.get("category", ""), t.get("name", ""),
+                            t.get("ext", ""), t.get("type", ""), int(t.get("size") or 0),
+                            float(t.get("mtime") or 0), t.get("note", "") or "",
+                            *_pinyin_columns(t), float(t.get("added") or t.get("mtime") or 0),
+                        )
+                        for t in tools
+                    ],
+                )
+                if state is not None:
+                    self._write_dir_state(dk, state)
+        return removed
+
+    def set_dir_state(self, dir_path, state):
+        """只更新目录指纹（工具行没有变化时使用）"""
+        with self.lock:
+            with self.conn:
+                self._write_dir_state(dir_key(dir_path), state)
+
+    def _write_dir_state(self, dk, state):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO dirs (dir, mtime_ns, subdirs, scanned_at) VALUES (?, ?, ?, ?)",
+            (
+                dk,
+                int(state.get("mtime_ns") or 0),
+                json.dumps(list(state.get("subdirs") or []), ensure_ascii=False),
+                float(state.get("scanned_at") or 0),
+            ),
+        )
+
+    def remove_dir(self, dir_path):
+        """目录本身已不存在：删除该目录及其所有下级目录的行与指纹，返回被删除的工具路径"""
+        dk = dir_key(dir_path)
+        prefix = dk.rstrip(os.sep) + os.sep
+        with self.lock:
+            dead_dirs = [
+                r[0] for r in self.conn.execute("SELECT DISTINCT dir FROM tools")
+                if r[0] == dk or r[0].startswith(prefix)
+            ]
+            dead_dirs += [
+                r[0] for r in self.conn.execute("SELECT dir FROM dirs")
+                if (r[0] == dk or r[0].startswith(prefix)) and r[0] not in dead_dirs
+            ]
+            removed = []
+            for d in dead_dirs:
+                removed.extend(r[0] for r in self.conn.execute("SELECT path FROM tools WHERE dir = ?", (d,)))
+            with self.conn:
+                self.conn.executemany("DELETE FROM tools WHERE dir = ?", [(d,) for d in dead_dirs])
+                self.conn.executemany("DELETE FROM dirs WHERE dir = ?", [(d,) for d in dead_dirs])
+        return removed
+
+    def retain_dirs(self, dir_paths):
+        """全量遍历后调用：删除不在 dir_paths 中的目录的行与指纹（目录已被删除/移走），返回被删除的路径"""
+        keep = {dir_key(d) for d in dir_paths}
+        with self.lock:
+            stale = [
+                (r[0], r[1]) for r in self.conn.execute("SELECT path, dir FROM tools")
+                if r[1] not in keep
+            ]
+            stale_dirs = [r[0] for r in self.conn.execute("SELECT dir FROM dirs") if r[0] not in keep]
+            if stale or stale_dirs:
+                with self.conn:
+                    self.conn.executemany("DELETE FROM tools WHERE path = ?", [(p,) for p, _d in stale])
+                    self.conn.executemany("DELETE FROM dirs WHERE dir = ?", [(d,) for d in stale_dirs])
+        return [p for p, _d in stale]
+
+    # ==================== 文件元数据（版本信息缓存） ====================
+
+    def get_file_meta(self, key):
+        """按规范化路径取缓存的元数据行（含 size/mtime 指纹）；没有返回 None"""
+        with self.lock:
+            return self.conn.execute("SELECT * FROM file_meta WHERE path = ?", (key,)).fetchone()
+
+    def put_file_meta(self, key, size, mtime, meta):
+        with self.lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO file_meta "
+                    "(path, size, mtime, version, product_name, description, machine) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key, int(size), float(mtime),
+                        meta.get("version", "") or "", meta.get("product_name", "") or "",
+                        meta.get("description", "") or "", meta.get("machine", "") or "",
+                    ),
+                )
+
+
+def get_tool_catalog(app):
+    """获取 app 上的 ToolCatalog；不存在时按需创建（打开失败返回 None，调用方回退到直接扫描）"""
+    catalog = getattr(app, "tool_catalog", None)
+    if catalog is not None:
+        return catalog
+
+    try:
+        db_file = CATALOG_FILE
+        cm = getattr(app, "config_manager", None)
+        if cm is not None and getattr(cm, "config_file", None):
+            db_file = Path(cm.config_file).parent / CATALOG_FILE.name
+        catalog = ToolCatalog(db_file)
+    except Exception as e:
+        print(f"打开工具目录数据库失败: {e}")
+        return None
+
+    try:
+        app.tool_catalog = catalog
+    except Exception:
+        pass
+    return catalog
@@ -0,0 +1,186 @@
+# File: ToolBox/app/services/tool_query.py
+
+import os
+import re
+from datetime import datetime
+from functools import lru_cache
+
+from .tool_catalog import dir_key
+
+# 搜索框的结构化查询语法：
+#   type:可执行文件  cat:1>11  ext:.exe  size>50M  added>2026-09-01  note:portable  name:xx
+#   字段前加 - 表示取反（-ext:.txt）；值含空格时加引号（note:"绿色 版"）；其余词作为普通搜索词
+# 比较符：:  =  >  >=  <  <=（size/added 支持全部；其余字段只支持 : / =）
+
+_TOKEN_RE = re.compile(r"^(-?)([^\W\d_]+)(>=|<=|:|=|>|<)(.+)$")
+_SPLIT_RE = re.compile(r'(?:[^\s"]|"[^"]*")+')
+
+_SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "kb": 1024, "m": 1024 ** 2, "mb": 1024 ** 2,
+               "g": 1024 ** 3, "gb": 1024 ** 3}
+_SIZE_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([a-z]*)$", re.IGNORECASE)
+
+_FIELD_ALIASES = {
+    "type": "type", "t": "type", "类型": "type",
+    "cat": "cat", "category": "cat", "分类": "cat",
+    "ext": "ext",
+    "size": "size", "大小": "size",
+    "added": "added", "add": "added", "添加": "added",
+    "note": "note", "备注": "note",
+    "name": "name", "名称": "name",
+}
+
+
+def _parse_size(value):
+    m = _SIZE_RE.match(value.strip())
+    if not m or m.group(2).lower() not in _SIZE_UNITS:
+        raise ValueError(f"无法识别的大小: {value}")
+    return int(float(m.group(1)) * _SIZE_UNITS[m.group(2).lower()])
+
+
+def _parse_date_range(value):
+    """YYYY / YYYY-MM / YYYY-MM-DD → [开始, 结束) 的时间戳"""
+    value = value.strip().replace("/", "-")
+    for fmt, step in (("%Y-%m-%d", "day"), ("%Y-%m", "month"), ("%Y", "year")):
+        try:
+            start = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if step == "day":
+            end = datetime.fromordinal(start.toordinal() + 1)
+        elif step == "month":
+            end = start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+        else:
+            end = start.replace(year=start.year + 1)
+        return start.timestamp(), end.timestamp()
+    raise ValueError(f"无法识别的日期: {value}")
+
+
+def _range_clause(column, op, lo, hi):
+    """比较 [lo, hi) 区间：> 表示在区间之后，< 表示在区间之前，: / = 表示落在区间内"""
+    if op == ">":
+        return f"{column} >= ?", (hi,), lambda v: v >= hi
+    if op == ">=":
+        return f"{column} >= ?", (lo,), lambda v: v >= lo
+    if op == "<":
+        return f"{column} < ?", (lo,), lambda v: v < lo
+    if op == "<=":
+        return f"{column} < ?", (hi,), lambda v: v < hi
+    return f"({column} >= ? AND {column} < ?)", (lo, hi), lambda v: lo <= v < hi
+
+
+def _escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class ToolQuery:
+    """
+    解析后的搜索框内容。
+
+    - text：普通搜索词（交给搜索索引做模糊/拼音匹配）
+    - where / params：字段条件编译成的 SQL 片段（作用于 catalog 的带索引列）
+    - matches(tool)：同样的条件在 Python 中求值（catalog 不可用时的兜底）
+    """
+
+    def __init__(self, text="", clauses=None):
+        self.text = text
+        self._clauses = clauses or []   # [(sql, params, predicate)]
+
+    @property
+    def has_filters(self) -> bool:
+        return bool(self._clauses)
+
+    @property
+    def where(self) -> str:
+        return " AND ".join(sql for sql, _params, _pred in self._clauses)
+
+    @property
+    def params(self):
+        return [p for _sql, params, _pred in self._clauses for p in params]
+
+    def matches(self, tool) -> bool:
+        return all(pred(tool) for _sql, _params, pred in self._clauses)
+
+
+def _compile_clause(field, op, value, storage_path):
+    """单个字段条件 → (sql, params, predicate)；值无法识别时抛出 ValueError"""
+    if field in ("size", "added"):
+        if field == "size":
+            n = _parse_size(value)
+            lo, hi = n, n + 1
+            column, attr = "size", lambda t: int(t.get("size") or 0)
+        else:
+            lo, hi = _parse_date_range(value)
+            column, attr = "added", lambda t: float(t.get("added") or t.get("mtime") or 0)
+        sql, params, test = _range_clause(column, op, lo, hi)
+        return sql, params, lambda t: test(attr(t))
+
+    if op not in (":", "="):
+        raise ValueError(f"{field} 只支持 : 比较")
+
+    if field == "type":
+        return "type = ?", (value,), lambda t: t.get("type") == value
+
+    if field == "ext":
+        ext = value.lower()
+        if not ext.startswith("."):
+            ext = "." + ext
+        return "ext = ?", (ext,), lambda t: (t.get("ext") or "").lower() == ext
+
+    if field == "cat":
+        # cat:1>11 → Storage\1\11 及其下级目录（按 dir 列的区间查询，走索引）
+        parts = [p.strip() for p in re.split(r"[>\\/]", value) if p.strip()]
+        if not parts or not storage_path:
+            raise ValueError(f"无法识别的分类: {value}")
+        dk = dir_key(os.path.join(storage_path, *parts))
+        lo, hi = dk + os.sep, dk + chr(ord(os.sep) + 1)
+
+        def in_cat(t):
+            d = dir_key(os.path.dirname(t.get("path", "") or ""))
+            return d == dk or lo <= d < hi
+
+        return "(dir = ? OR (dir >= ? AND dir < ?))", (dk, lo, hi), in_cat
+
+    if field in ("note", "name"):
+        needle = value.lower()
+        return (
+            f"{field} LIKE ? ESCAPE '\\'",
+            (f"%{_escape_like(value)}%",),
+            lambda t: needle in (t.get(field, "") or "").lower(),
+        )
+
+    raise ValueError(f"未知字段: {field}")
+
+
+@lru_cache(maxsize=64)
+def parse_query(raw, storage_path=""):
+    """
+    解析搜索框内容（同一字符串只解析一次）。
+    无法识别的字段/值不报错，按普通搜索词处理。
+    """
+    raw = (raw or "").strip()
+    if not raw:
+        return ToolQuery()
+
+    # 按空白切分，引号内的空白保留（不用 shlex：路径里的反斜杠要原样保留）
+    tokens = [t.replace('"', "") for t in _SPLIT_RE.findall(raw)]
+
+    words = []
+    clauses = []
+    for token in tokens:
+        m = _TOKEN_RE.match(token)
+        field = _FIELD_ALIASES.get(m.group(2).lower()) if m else None
+        if field is None:
+            words.append(token)
+            continue
+        negate, op, value = m.group(1), m.group(3), m.group(4)
+        try:
+            sql, params, pred = _compile_clause(field, op, value, storage_path)
+        except ValueError:
+            # 输入到一半（如 added>2026-0）时很常见，不提示
+            words.append(token)
+            continue
+        if negate:
+            sql, pred = f"NOT ({sql})", (lambda p: lambda t: not p(t))(pred)
+        clauses.append((sql, params, pred))
+
+    return ToolQuery(" ".join(words), clauses)
@@ -1,3 +1,18 @@
+import os
+
+from .version_cache import get_tool_version
+
+
+def _record_version(app, key, record):
+    """记录的 key 为相对 Storage 的路径（旧数据可能是绝对路径）；文件不在了就显示记录里的版本"""
+    tool_path = key if os.path.isabs(key) else os.path.join(getattr(app, "storage_path", "") or "", key)
+    try:
+        version = get_tool_version(app, tool_path)
+    except Exception:
+        version = None
+    return version or record.get('version', '')
+
+
 def show_tools_added_record(app):
     """显示工具添加记录"""
     from tkinter import Toplevel, Label, Frame, Button
@@ -112,13 +127,13 @@ def show_tools_added_record(app):
         if sort_by_time:
             filtered_records.sort(key=lambda x: x[1]['add_time'], reverse=reverse)
         
-        # 插入数据
+        # 插入数据（版本优先取版本缓存：工具被原地替换为新版本后这里随之更新）
         for idx, (path, record) in enumerate(filtered_records, 1):
             tree.insert('', 'end', values=(
                 idx,
                 record['name'],
                 record['category'],
-                record['version'],
+                _record_version(app, path, record),
                 record['add_time'],
                 record['type'],
                 record['note']
@@ -1,10 +1,14 @@
 import json
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
 from ..utils.size_utils import format_size
 from ..utils.type_utils import get_file_type_category
+from ..utils.scan_utils import DEFAULT_TOOL_EXTS, ARCHIVE_EXTS, iter_files
+from ..utils.pinyin_utils import sort_key_of
 
 RECORD_FILE = Path(__file__).parent.parent.parent / "tools_record.json"
 
@@ -47,84 +51,87 @@ def _resolve_record_abs_path(app, record_key: str) -> str:
     return abs_path
 
 
-def prune_missing_tool_records(app):
+def _in_storage(storage_abs, abs_path) -> bool:
+    if not storage_abs:
+        return True
+    try:
+        return os.path.commonpath([storage_abs, abs_path]) == storage_abs
+    except Exception:
+        return False
+
+
+def _collect_record_paths(app):
     """
-    清理所有“文件已不存在”的记录，或“越界（不在 Storage 内）”的记录：
-    - ToolAddedRecord（ini）
-    - tools_added_record（内存）
-    - ToolInfo（ini，按绝对路径 key）
-    - tools_record.json（使用记录）
+    全量清理第一步（Tk 线程，不访问文件系统）：读出全部记录指向的绝对路径。
+    返回 (added, usage)：
+    - added：[(ToolAddedRecord / tools_added_record 的 key, 绝对路径)]
+    - usage：[(tools_record.json 的 key, 绝对路径)]
+    绝对路径为 "" 表示越界（不在 Storage 内），无需检查文件即可删除
     """
     storage = getattr(app, "storage_path", None)
     storage_abs = os.path.abspath(str(storage)) if storage else None
 
-    to_remove_keys = []
-
-    # 1) config 中的 ToolAddedRecord
+    added = {}
+    keys = []
     try:
         if hasattr(app, "config") and "ToolAddedRecord" in app.config:
-            sec = app.config["ToolAddedRecord"]
-            for raw_key in list(sec.keys()):
-                abs_path = _resolve_record_abs_path(app, raw_key)
-
-                # ✅ 若 abs_path 为空：说明相对 key 拼接越界，直接删
-                if not abs_path:
-                    to_remove_keys.append(raw_key)
-                    continue
-
-                # ✅ 绝对路径越界：不在 Storage 内，也删
-                if storage_abs:
-                    try:
-                        if os.path.commonpath([storage_abs, abs_path]) != storage_abs:
-                            to_remove_keys.append(raw_key)
-                            continue
-                    except Exception:
-                        to_remove_keys.append(raw_key)
-                        continue
-
-                # ✅ 文件不存在：删
-                if not os.path.exists(abs_path):
-                    to_remove_keys.append(raw_key)
+            keys.extend(app.config["ToolAddedRecord"].keys())
     except Exception as e:
         print(f"prune_missing_tool_records: 遍历 ToolAddedRecord 失败: {e}")
+    tar = getattr(app, "tools_added_record", None)
+    if isinstance(tar, dict):
+        keys.extend(tar.keys())
+    for raw_key in keys:
+        if raw_key in added:
+            continue
+        abs_path = _resolve_record_abs_path(app, raw_key)
+        # 相对 key 拼接越界（abs_path 为空）或绝对路径不在 Storage 内
+        added[raw_key] = abs_path if abs_path and _in_storage(storage_abs, abs_path) else ""
+
+    usage = []
+    tr = getattr(app, "tools_record", None)
+    if isinstance(tr, dict):
+        for rk, rv in tr.items():
+            try:
+                p = rv.get("path", "")
+            except Exception:
+                p = ""
+            if not p:
+                continue
+            abs_p = os.path.abspath(os.path.normpath(p))
+            usage.append((rk, abs_p if _in_storage(storage_abs, abs_p) else ""))
 
-    # 2) 内存 tools_added_record
-    try:
-        tar = getattr(app, "tools_added_record", None)
-        if isinstance(tar, dict):
-            for raw_key in list(tar.keys()):
-                abs_path = _resolve_record_abs_path(app, raw_key)
-
-                if not abs_path:
-                    if raw_key not in to_remove_keys:
-                        to_remove_keys.append(raw_key)
-                    continue
-
-                if storage_abs:
-                    try:
-                        if os.path.commonpath([storage_abs, abs_path]) != storage_abs:
-                            if raw_key not in to_remove_keys:
-                                to_remove_keys.append(raw_key)
-                            continue
-                    except Exception:
-                        if raw_key not in to_remove_keys:
-                            to_remove_keys.append(raw_key)
-                        continue
-
-                if not os.path.exists(abs_path):
-                    if raw_key not in to_remove_keys:
-                        to_remove_keys.append(raw_key)
-    except Exception:
-        pass
+    return list(added.items()), usage
+
+
+def _find_missing_paths(paths):
+    """全量清理第二步（可在后台线程调用）：返回 paths 中文件已不存在的路径集合"""
+    return {p for p in paths if p and not os.path.exists(p)}
+
+
+def prune_missing_tool_records(app, missing=None):
+    """
+    清理所有“文件已不存在”的记录，或“越界（不在 Storage 内）”的记录（须在 Tk 线程调用）：
+    - ToolAddedRecord（ini）
+    - tools_added_record（内存）
+    - ToolInfo（ini，按绝对路径 key）
+    - tools_record.json（使用记录）
+    missing 为后台 _find_missing_paths 的结果；为 None 时在此同步检查文件是否存在
+    """
+    added, usage = _collect_record_paths(app)
+    if missing is None:
+        missing = _find_missing_paths({p for _k, p in added + usage})
 
-    if not to_remove_keys:
+    to_remove = [(k, p) for k, p in added if not p or p in missing]
+    dead_usage = [rk for rk, p in usage if not p or p in missing]
+    if not to_remove and not dead_usage:
         return
 
-    # 3) 删除 ToolAddedRecord / 内存 tools_added_record
+    # 1) 删除 ToolAddedRecord / 内存 tools_added_record
     try:
         if hasattr(app, "config") and "ToolAddedRecord" in app.config:
             sec = app.config["ToolAddedRecord"]
-            for k in to_remove_keys:
+            for k, _p in to_remove:
                 sec.pop(k, None)
                 sec.pop(_norm_key(k), None)
     except Exception as e:
@@ -133,17 +140,17 @@ def prune_missing_tool_records(app):
     try:
         tar = getattr(app, "tools_added_record", None)
         if isinstance(tar, dict):
-            for k in to_remove_keys:
+            for k, _p in to_remove:
                 tar.pop(k, None)
                 tar.pop(_norm_key(k), None)
     except Exception:
         pass
 
-    # 4) 删除 ToolInfo（绝对路径 key：path_name / path_note）
+    # 2) 删除 ToolInfo（绝对路径 key：path_name / path_note）
     try:
         if hasattr(app, "config") and "ToolInfo" in app.config:
             info = app.config["ToolInfo"]
-            for k in to_remove_keys:
+            for k, _p in to_remove:
                 abs_path = _resolve_record_abs_path(app, k)
                 if abs_path:
                     info.pop(abs_path + "_name", None)
@@ -151,58 +158,168 @@ def prune_missing_tool_records(app):
     except Exception as e:
         print(f"prune_missing_tool_records: 删除 ToolInfo 失败: {e}")
 
-    # 5) 删除 tools_record.json 中 path 指向不存在/越界的记录
-    try:
-        tr = getattr(app, "tools_record", None)
-        if isinstance(tr, dict) and tr:
-            dead = []
-            for rk, rv in tr.items():
-                p = ""
-                try:
-                    p = rv.get("path", "")
-                except Exception:
-                    p = ""
-                if not p:
-                    continue
-
-                abs_p = os.path.abspath(os.path.normpath(p))
-
-                # 不在 Storage 内 -> 删
-                if storage_abs:
-                    try:
-                        if os.path.commonpath([storage_abs, abs_p]) != storage_abs:
-                            dead.append(rk)
-                            continue
-                    except Exception:
-                        dead.append(rk)
-                        continue
-
-                # 不存在 -> 删
-                if not os.path.exists(abs_p):
-                    dead.append(rk)
-
-            for rk in dead:
-                tr.pop(rk, None)
-    except Exception:
-        pass
+    # 3) 删除 tools_record.json 中 path 指向不存在/越界的记录
+    tr = getattr(app, "tools_record", None)
+    if isinstance(tr, dict):
+        for rk in dead_usage:
+            tr.pop(rk, None)
 
-    # 6) 保存 ini + tools_record.json
+    # 4) 保存 ini + tools_record.json
+    if to_remove:
+        try:
+            if hasattr(app, "config_manager"):
+                app.config_manager.save_config()
+        except Exception as e:
+            print(f"prune_missing_tool_records: 保存 ini 失败: {e}")
+    if dead_usage:
+        try:
+            save_tools_record(app)
+        except Exception:
+            pass
+
+    print(f"prune_missing_tool_records: 已清理 {len(to_remove)} 条不存在/越界文件的记录")
+
+
+def _path_cmp_key(path: str) -> str:
+    return os.path.normcase(os.path.normpath(os.path.abspath(str(path))))
+
+
+def prune_records_for_paths(app, paths):
+    """
+    增量清理：paths 为扫描已确认“从目录中消失”的工具绝对路径，只清理这些路径对应的记录
+    （ToolAddedRecord / tools_added_record / ToolInfo / tools_record.json），不做任何文件系统访问。
+    有改动时 ini 与 json 各写一次。必须在 Tk 线程调用。
+    """
+    paths = [str(p) for p in (paths or []) if p]
+    if not paths:
+        return 0
+
+    storage = getattr(app, "storage_path", None)
+    record_keys = set()
+    for p in paths:
+        record_keys.add(_norm_key(p))
+        if storage:
+            try:
+                rel = os.path.relpath(p, str(storage))
+                if not rel.startswith(".."):
+                    record_keys.add(_norm_key(rel))
+            except Exception:
+                pass
+
+    ini_changed = False
+    removed = 0
+
+    # 1) ToolAddedRecord（ini）+ 内存 tools_added_record
     try:
-        if hasattr(app, "config_manager"):
-            app.config_manager.save_config()
+        if hasattr(app, "config") and "ToolAddedRecord" in app.config:
+            sec = app.config["ToolAddedRecord"]
+            for k in record_keys:
+                if sec.pop(k, None) is not None:
+                    ini_changed = True
+                    removed += 1
     except Exception as e:
-        print(f"prune_missing_tool_records: 保存 ini 失败: {e}")
+        print(f"prune_records_for_paths: 删除 ToolAddedRecord 失败: {e}")
+
+    tar = getattr(app, "tools_added_record", None)
+    if isinstance(tar, dict):
+        for k in record_keys:
+            tar.pop(k, None)
 
+    # 2) ToolInfo（绝对路径 key：path_name / path_note）
     try:
+        if hasattr(app, "config") and "ToolInfo" in app.config:
+            info = app.config["ToolInfo"]
+            for p in paths:
+                for suffix in ("_name", "_note"):
+                    if info.pop(p + suffix, None) is not None:
+                        ini_changed = True
+    except Exception as e:
+        print(f"prune_records_for_paths: 删除 ToolInfo 失败: {e}")
+
+    # 3) tools_record.json（使用记录：按 path 匹配）
+    json_changed = False
+    tr = getattr(app, "tools_record", None)
+    if isinstance(tr, dict) and tr:
+        gone = {_path_cmp_key(p) for p in paths}
+        dead = []
+        for rk, rv in tr.items():
+            try:
+                rp = rv.get("path", "")
+            except Exception:
+                rp = ""
+            if rp and _path_cmp_key(rp) in gone:
+                dead.append(rk)
+        for rk in dead:
+            tr.pop(rk, None)
+        json_changed = bool(dead)
+
+    if ini_changed:
+        try:
+            app.config_manager.save_config()
+        except Exception as e:
+            print(f"prune_records_for_paths: 保存 ini 失败: {e}")
+    if json_changed:
         save_tools_record(app)
+
+    return removed
+
+
+DEFAULT_PRUNE_INTERVAL = 3600
+FIRST_SWEEP_DELAY_MS = 60 * 1000
+
+
+def schedule_record_sweep(app, delay_ms=None):
+    """
+    低频全量清理：启动一段时间后执行一次 prune_missing_tool_records，此后每隔
+    [General] prune_interval 秒（默认 3600）再执行一次。日常清理由扫描结果增量完成。
+    记录在 Tk 线程读出，文件是否存在在后台线程检查，删除与保存回到 Tk 线程。
+    """
+    root = getattr(app, "root", None)
+    if root is None:
+        return
+
+    try:
+        interval = int(app.config["General"].get("prune_interval", str(DEFAULT_PRUNE_INTERVAL)))
     except Exception:
-        pass
+        interval = DEFAULT_PRUNE_INTERVAL
+    interval = max(60, interval)
+
+    def finish(missing):
+        try:
+            prune_missing_tool_records(app, missing)
+        except Exception as e:
+            print(f"定期清理孤儿记录失败: {e}")
+        schedule_record_sweep(app, interval * 1000)
+
+    def check(paths):
+        # 文件系统检查在后台线程，只把不存在的路径交回 Tk 线程删除/保存
+        try:
+            missing = _find_missing_paths(paths)
+        except Exception as e:
+            print(f"定期清理孤儿记录失败: {e}")
+            missing = set()
+        try:
+            root.after(0, lambda: finish(missing))
+        except Exception:
+            pass
+
+    def sweep():
+        try:
+            added, usage = _collect_record_paths(app)
+            paths = {p for _k, p in added + usage if p}
+            threading.Thread(target=check, args=(paths,), daemon=True).start()
+        except Exception as e:
+            print(f"定期清理孤儿记录失败: {e}")
+            schedule_record_sweep(app, interval * 1000)
 
-    print(f"prune_missing_tool_records: 已清理 {len(to_remove_keys)} 条不存在/越界文件的记录")
+    try:
+        app._record_sweep_job = root.after(FIRST_SWEEP_DELAY_MS if delay_ms is None else delay_ms, sweep)
+    except Exception as e:
+        print(f"安排定期清理失败: {e}")
 
 
 def load_tools_record(app):
-    """加载工具使用记录（tools_record.json），并清理孤儿记录"""
+    """加载工具使用记录（tools_record.json）；孤儿记录由扫描增量清理 + 定期全量清理处理"""
     app.tools_record = {}
     app.record_file = RECORD_FILE
 
@@ -214,12 +331,6 @@ def load_tools_record(app):
             print(f"加载工具记录失败: {e}")
             app.tools_record = {}
 
-    # ✅ 启动时清理
-    try:
-        prune_missing_tool_records(app)
-    except Exception:
-        pass
-
 
 def save_tools_record(app):
     """保存工具使用记录"""
@@ -231,6 +342,35 @@ def save_tools_record(app):
         print(f"保存工具记录失败: {e}")
 
 
+def get_usage_stats(app):
+    """
+    tools_record.json 的使用统计按路径汇总：{normcase(path): (usage_count, last_used 时间戳)}
+    （同一路径有多条记录时次数相加、时间取最近）
+    """
+    stats = {}
+    tr = getattr(app, "tools_record", None)
+    if not isinstance(tr, dict):
+        return stats
+
+    for info in tr.values():
+        if not isinstance(info, dict) or not info.get("path"):
+            continue
+        try:
+            count = int(info.get("usage_count") or 0)
+        except Exception:
+            count = 0
+        try:
+            ts = datetime.strptime(info.get("last_used", ""), "%Y-%m-%d %H:%M:%S").timestamp()
+        except Exception:
+            ts = 0.0
+        key = os.path.normcase(os.path.abspath(str(info["path"])))
+        old = stats.get(key)
+        if old is not None:
+            count, ts = count + old[0], max(ts, old[1])
+        stats[key] = (count, ts)
+    return stats
+
+
 def record_tool_usage(app, tool_path, tool_name, category):
     """记录或更新工具使用次数"""
     key = f"{category}/{tool_name}"
@@ -252,76 +392,147 @@ def record_tool_usage(app, tool_path, tool_name, category):
 
 
 def scan_directory(self, directory: Path, category_name: str):
-    """扫描目录中的工具文件（只扫描传入目录）"""
+    """扫描目录中的工具文件（只扫描传入目录）；新工具的添加记录批量写入一次"""
     tools = []
-    supported = {
-        ".exe", ".msi", ".zip", ".rar", ".7z", ".pdf", ".txt",
-        ".bat", ".cmd", ".reg", ".lnk", ".png", ".jpg", ".jpeg",
-        ".mp4", ".mp3", ".py", ".pyw", ".docx", ".xlsx", ".pptx"
-    }
 
     if not directory.exists():
         return tools
 
+    errors = []
     try:
-        for p in directory.iterdir():
-            if p.is_file() and p.suffix.lower() in supported:
-                st = p.stat()
-                tool_path = str(p)
-
-                custom_name = self.config.get("ToolInfo", tool_path + "_name", fallback=p.stem)
-                note = self.config.get("ToolInfo", tool_path + "_note", fallback="")
+        with batch_record_tool_added(self):
+            for fe in iter_files(directory, exts=DEFAULT_TOOL_EXTS, skip_names=(), errors=errors):
+                custom_name = self.config.get("ToolInfo", fe.path + "_name", fallback=fe.stem)
+                note = self.config.get("ToolInfo", fe.path + "_note", fallback="")
 
                 tools.append({
                     "name": custom_name,
-                    "path": tool_path,
-                    "ext": p.suffix.lower(),
-                    "type": get_file_type_category(p.suffix),
-                    "size": format_size(st.st_size),
+                    "path": fe.path,
+                    "ext": fe.ext,
+                    "type": get_file_type_category(fe.ext),
+                    "size": format_size(fe.size),
                     "category": category_name,
-                    "mtime": datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d"),
+                    "mtime": datetime.fromtimestamp(fe.mtime).strftime("%Y-%m-%d"),
                     "note": note
                 })
 
-                record_tool_added(self, tool_path, custom_name, category_name, note)
+                record_tool_added(self, fe.path, custom_name, category_name, note)
 
     except Exception as e:
         print(f"扫描目录 {directory} 时出错: {e}")
+        errors.append((str(directory), e))
+
+    tools = sorted(tools, key=sort_key_of)
 
-    tools = sorted(tools, key=lambda x: x["name"].lower())
+    # 列举失败时结果不完整，不能据此判定文件已消失
+    if errors:
+        return tools
 
-    # ✅ 每次扫描后清理一次（孤儿/越界记录）
+    # ✅ 只清理本目录中已消失文件的记录（由本次列举结果得出，不逐条探测文件）
     try:
-        prune_missing_tool_records(self)
-    except Exception:
-        pass
+        prune_records_for_paths(self, _missing_record_paths(self, directory, {t["path"] for t in tools}))
+    except Exception as e:
+        print(f"scan_directory: 清理记录失败: {e}")
 
     return tools
 
 
+def _missing_record_paths(app, directory: Path, present_paths):
+    """ToolAddedRecord 中位于 directory 这一层、但不在本次列举结果中的工具绝对路径"""
+    tar = getattr(app, "tools_added_record", None)
+    if not isinstance(tar, dict) or not tar:
+        return []
+
+    dir_key = _path_cmp_key(directory)
+    present = {_path_cmp_key(p) for p in present_paths}
+    missing = []
+    for raw_key in list(tar.keys()):
+        abs_path = _resolve_record_abs_path(app, raw_key)
+        if not abs_path:
+            continue
+        ck = _path_cmp_key(abs_path)
+        if os.path.dirname(ck) == dir_key and ck not in present:
+            missing.append(abs_path)
+    return missing
+
+
+def iter_archives(directory: Path, category_name: str, recursive=False, max_depth=None):
+    """生成器：逐个 yield 目录中的压缩包 dict（category 为 None 时按相对 directory 的子目录命名）"""
+    base = str(directory)
+    for fe in iter_files(directory, exts=ARCHIVE_EXTS, recursive=recursive, max_depth=max_depth, skip_names=()):
+        cat = category_name
+        if cat is None:
+            rel = os.path.relpath(fe.dir, base)
+            cat = " - ".join(p for p in rel.split(os.sep) if p and p != ".")
+        yield {
+            "name": fe.stem,
+            "path": fe.path,
+            "ext": fe.ext,
+            "size": format_size(fe.size),
+            "mtime": datetime.fromtimestamp(fe.mtime).strftime("%Y-%m-%d %H:%M:%S"),
+            "category": cat
+        }
+
+
 def scan_directory_for_archives(self, directory: Path, category_name: str):
     """扫描目录中的压缩包文件"""
-    archives = []
-    exts = {".zip", ".rar", ".7z", ".tar", ".gz", ".bz2", ".xz"}
-
     if not directory.exists():
-        return archives
+        return []
+
+    archives = list(iter_archives(directory, category_name))
+    return sorted(archives, key=sort_key_of)
+
+
+@contextmanager
+def batch_record_tool_added(app):
+    """
+    批量记录工具添加信息：块内的 record_tool_added 只更新内存与 config，
+    退出时统一 save_config 一次（扫描/导入 N 个文件只写一次 ToolBox.ini）。
+
+    块内抛出异常或最终写入失败时回滚：本批新增的记录从 config 与内存中移除。
+    可嵌套，只有最外层负责提交。
+    """
+    batch = getattr(app, "_record_batch", None)
+    if batch is not None:
+        batch["depth"] += 1
+        try:
+            yield batch
+        finally:
+            batch["depth"] -= 1
+        return
 
+    batch = {"depth": 1, "keys": []}
+    app._record_batch = batch
     try:
-        for p in directory.iterdir():
-            if p.is_file() and p.suffix.lower() in exts:
-                st = p.stat()
-                archives.append({
-                    "name": p.stem,
-                    "path": str(p),
-                    "ext": p.suffix.lower(),
-                    "size": format_size(st.st_size),
-                    "category": category_name
-                })
+        yield batch
+    except Exception:
+        app._record_batch = None
+        _rollback_record_batch(app, batch)
+        raise
+
+    app._record_batch = None
+    if not batch["keys"]:
+        return
+    try:
+        app.config_manager.save_config()
     except Exception as e:
-        print(f"扫描目录 {directory} 时出错: {e}")
+        print(f"batch_record_tool_added: 保存配置失败，已回滚 {len(batch['keys'])} 条记录: {e}")
+        _rollback_record_batch(app, batch)
 
-    return sorted(archives, key=lambda x: x["name"].lower())
+
+def _rollback_record_batch(app, batch):
+    """撤销本批新增的 ToolAddedRecord（config + 内存）"""
+    try:
+        sec = app.config["ToolAddedRecord"] if "ToolAddedRecord" in app.config else None
+    except Exception:
+        sec = None
+    tar = getattr(app, "tools_added_record", None)
+    for key in batch["keys"]:
+        if sec is not None:
+            sec.pop(key, None)
+        if isinstance(tar, dict):
+            tar.pop(key, None)
+    batch["keys"] = []
 
 
 def record_tool_added(self, tool_path, tool_name, category, note=""):
@@ -359,16 +570,11 @@ def record_tool_added(self, tool_path, tool_name, category, note=""):
     suffix = Path(tool_path).suffix.lower()
     tool_type = get_file_type_category(suffix)
 
+    # 版本经由缓存读取（同一文件在列表/记录窗口中不再重复解析）；这里写入的只是添加时的快照
     version = "-"
     try:
-        if suffix in (".exe", ".msi") and hasattr(self, "get_file_version_info") and self.get_file_version_info:
-            info = self.get_file_version_info(tool_path)
-            if info and info.get("file_version"):
-                version = info["file_version"]
-            elif info and info.get("product_version"):
-                version = info["product_version"]
-            else:
-                version = "未知"
+        from .version_cache import get_tool_version
+        version = get_tool_version(self, tool_path) or "-"
     except Exception:
         version = "未知"
 
@@ -393,6 +599,17 @@ def record_tool_added(self, tool_path, tool_name, category, note=""):
 
     try:
         self.config["ToolAddedRecord"][norm_key] = f"{tool_name}|{category}|{add_time}|{tool_type}|{note}|{version}"
+    except Exception as e:
+        print(f"record_tool_added: 写入配置失败: {e}")
+        return
+
+    # 批量模式：由 batch_record_tool_added 统一保存
+    batch = getattr(self, "_record_batch", None)
+    if batch is not None:
+        batch["keys"].append(norm_key)
+        return
+
+    try:
         self.config_manager.save_config()
     except Exception as e:
         print(f"record_tool_added: 保存配置失败: {e}")
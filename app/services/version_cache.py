@@ -0,0 +1,123 @@
+import os
+import threading
+
+from ..utils.file_utils import get_file_version_info
+from .tool_catalog import get_tool_catalog
+
+# 会读取版本信息的文件类型（与 record_tool_added 一致）
+VERSIONED_EXTS = frozenset({".exe", ".msi"})
+
+
+def meta_key(file_path) -> str:
+    """缓存 key：绝对路径 + normcase"""
+    return os.path.normcase(os.path.abspath(str(file_path)))
+
+
+def version_text(meta):
+    """列表/记录窗口显示用的版本文字"""
+    if not meta:
+        return "未知"
+    return meta.get("version") or "未知"
+
+
+def _extract(file_path):
+    info = get_file_version_info(file_path) or {}
+    return {
+        "version": info.get("file_version") or info.get("product_version") or "",
+        "product_name": info.get("product_name", ""),
+        "description": info.get("description", ""),
+        "machine": info.get("machine", ""),
+    }
+
+
+class VersionCache:
+    """
+    文件版本元数据缓存：key 为 (规范化路径, 大小, 修改时间)。
+
+    - 文件被原地替换（大小或修改时间变化）后，旧条目自动失效，下次读取时重新解析
+    - 内存中保留一份，同时持久化到 catalog（ToolBox.db 的 file_meta 表），重启后无需重新解析
+    - catalog 不可用时只做内存缓存
+    """
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog
+        self.lock = threading.Lock()
+        self._mem = {}   # key -> (size, mtime, meta)
+
+    def peek(self, file_path, size, mtime):
+        """只查缓存（不解析文件）；指纹不符或没有缓存返回 None"""
+        key = meta_key(file_path)
+        with self.lock:
+            hit = self._mem.get(key)
+        if hit is not None:
+            return hit[2] if (hit[0], hit[1]) == (int(size), float(mtime)) else None
+
+        if self.catalog is None:
+            return None
+        try:
+            row = self.catalog.get_file_meta(key)
+        except Exception as e:
+            print(f"读取版本缓存失败: {e}")
+            return None
+        if row is None or (row["size"], row["mtime"]) != (int(size), float(mtime)):
+            return None
+        meta = {k: row[k] for k in ("version", "product_name", "description", "machine")}
+        with self.lock:
+            self._mem[key] = (int(size), float(mtime), meta)
+        return meta
+
+    def get(self, file_path, size=None, mtime=None):
+        """
+        取文件的版本元数据 {'version', 'product_name', 'description', 'machine'}。
+        size/mtime 未给出时 stat 一次；缓存未命中（或已失效）时解析文件并写回缓存。
+        不需要版本信息的文件类型、文件不存在时返回 None。
+        """
+        if os.path.splitext(str(file_path))[1].lower() not in VERSIONED_EXTS:
+            return None
+        if size is None or mtime is None:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                return None
+            size, mtime = st.st_size, st.st_mtime
+
+        meta = self.peek(file_path, size, mtime)
+        if meta is not None:
+            return meta
+
+        meta = _extract(file_path)
+        key = meta_key(file_path)
+        with self.lock:
+            self._mem[key] = (int(size), float(mtime), meta)
+        if self.catalog is not None:
+            try:
+                self.catalog.put_file_meta(key, size, mtime, meta)
+            except Exception as e:
+                print(f"写入版本缓存失败: {e}")
+        return meta
+
+
+def get_version_cache(app):
+    """获取 app 上的 VersionCache（不存在则创建；catalog 不可用时退化为内存缓存）"""
+    cache = getattr(app, "version_cache", None)
+    if cache is not None:
+        return cache
+
+    cache = VersionCache(get_tool_catalog(app))
+    try:
+        app.version_cache = cache
+    except Exception:
+        pass
+    return cache
+
+
+def get_tool_version(app, tool_path, size=None, mtime=None):
+    """工具的当前版本文字；不适用（非 exe/msi）时返回 None"""
+    try:
+        meta = get_version_cache(app).get(tool_path, size, mtime)
+    except Exception as e:
+        print(f"读取版本信息失败: {tool_path} -> {e}")
+        return "未知"
+    if meta is None:
+        return None
+    return version_text(meta)
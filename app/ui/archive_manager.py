@@ -3,6 +3,8 @@ import tkinter.ttk as ttk
 from pathlib import Path
 
 from ..services.archive_service import extract_archive
+from ..services.tool_scanner import iter_archives
+from ..utils.pinyin_utils import pinyin_keys, sort_key_of
 
 
 def show_archive_manager(self):
@@ -42,24 +44,14 @@ def show_archive_manager(self):
     table_frame.grid_rowconfigure(0, weight=1)
     table_frame.grid_columnconfigure(0, weight=1)
 
-    # 扫描所有分类中的压缩包文件
+    # 扫描所有分类中的压缩包文件（主分类 + 二级分类两层，分类名形如 “1 - 11”）
     all_archives = []
     base = Path(self.get_app_dir() / "Storage")
     if base.exists():
-        for cat_dir in base.iterdir():
-            if cat_dir.is_dir():
-                cat_name = cat_dir.name
-                # 扫描主分类目录
-                archives = self.scan_directory_for_archives(cat_dir, cat_name)
-                all_archives.extend(archives)
-
-                # 扫描子分类目录
-                for sub_dir in cat_dir.iterdir():
-                    if sub_dir.is_dir():
-                        sub_archives = self.scan_directory_for_archives(
-                            sub_dir, f"{cat_name} - {sub_dir.name}"
-                        )
-                        all_archives.extend(sub_archives)
+        for a in iter_archives(base, None, recursive=True, max_depth=2):
+            if a["category"]:
+                all_archives.append(a)
+        all_archives.sort(key=lambda x: (pinyin_keys(x["category"])[2], sort_key_of(x)))
 
     # 填充表格
     tree.delete(*tree.get_children())
@@ -5,51 +5,70 @@ from tkinter import messagebox
 from ..utils.tool_manager import run_tool, open_folder, copy_path, rename_tool, edit_note, change_tool_icon, delete_tool
 
 
-def add_context_menu(app, widget, tool):
-    """为指定 widget 添加右键上下文菜单（用于右侧工具项）"""
-    menu = tk.Menu(widget, tearoff=0)
-    menu.add_command(label="运行", command=lambda: run_tool(app, tool['path']))
-    menu.add_command(label="打开所在文件夹", command=lambda: open_folder(tool['path']))
-    menu.add_command(label="复制路径", command=lambda: copy_path(app.root, tool['path']))
-    menu.add_separator()
-    menu.add_command(label="修改标题", command=lambda: rename_tool(app, tool['path'], tool.get('name', '')))
-    menu.add_command(label="编辑备注", command=lambda: edit_note(app, tool['path']))
-    menu.add_command(label="修改图标", command=lambda: change_tool_icon(app, tool['path'], tool.get('name', '')))
-    menu.add_separator()
-    menu.add_command(label="删除", command=lambda: delete_tool(app, tool['path'], tool.get('name','')))
-
-    def on_right_click(event):
+def get_tool_menu(app):
+    """
+    工具右键菜单（整个程序共用一个）：菜单项作用于弹出时记录的 app._tool_menu_target，
+    不再为每个工具/每个控件各建一个菜单
+    """
+    menu = getattr(app, "_tool_menu", None)
+    if menu is not None:
         try:
-            menu.tk_popup(event.x_root, event.y_root)
-        finally:
-            menu.grab_release()
-
-    widget.bind("<Button-3>", on_right_click)
+            if menu.winfo_exists():
+                return menu
+        except Exception:
+            pass
 
+    def on_target(action):
+        def command():
+            tool = getattr(app, "_tool_menu_target", None)
+            if tool:
+                action(tool)
+        return command
 
-def show_tool_context_menu(app, event, tree, tools):
-    """在 Treeview 上显示工具的右键菜单（根据选中的项来定位工具）"""
-    sel = tree.selection()
-    if not sel:
-        return
-    idx = tree.index(sel[0])
-    if idx < 0 or idx >= len(tools):
-        return
-    tool = tools[idx]
-
-    # 创建并弹出菜单
-    menu = tk.Menu(tree, tearoff=0)
-    menu.add_command(label="运行", command=lambda: run_tool(app, tool['path']))
-    menu.add_command(label="打开所在文件夹", command=lambda: open_folder(tool['path']))
-    menu.add_command(label="复制路径", command=lambda: copy_path(app.root, tool['path']))
+    menu = tk.Menu(app.root, tearoff=0)
+    menu.add_command(label="运行", command=on_target(lambda tool: run_tool(app, tool['path'])))
+    menu.add_command(label="打开所在文件夹", command=on_target(lambda tool: open_folder(tool['path'])))
+    menu.add_command(label="复制路径", command=on_target(lambda tool: copy_path(app.root, tool['path'])))
     menu.add_separator()
-    menu.add_command(label="修改标题", command=lambda: rename_tool(app, tool['path'], tool.get('name', '')))
-    menu.add_command(label="编辑备注", command=lambda: edit_note(app, tool['path']))
-    menu.add_command(label="修改图标", command=lambda: change_tool_icon(app, tool['path'], tool.get('name', '')))
+    menu.add_command(label="修改标题", command=on_target(lambda tool: rename_tool(app, tool['path'], tool.get('name', ''))))
+    menu.add_command(label="编辑备注", command=on_target(lambda tool: edit_note(app, tool['path'])))
+    menu.add_command(label="修改图标", command=on_target(lambda tool: change_tool_icon(app, tool['path'], tool.get('name', ''))))
     menu.add_separator()
-    menu.add_command(label="删除", command=lambda: delete_tool(app, tool['path'], tool.get('name','')))
+    menu.add_command(label="删除", command=on_target(lambda tool: delete_tool(app, tool['path'], tool.get('name',''))))
 
+    try:
+        app._tool_menu = menu
+    except Exception:
+        pass
+    return menu
+
+
+def popup_tool_menu(app, event, tool):
+    """在鼠标位置为某个工具弹出共用的右键菜单"""
+    app._tool_menu_target = tool
+    menu = get_tool_menu(app)
     try:
         menu.tk_popup(event.x_root, event.y_root)
     finally:
         menu.grab_release()
+
+
+def add_context_menu(app, widget, tool):
+    """为指定 widget 添加右键上下文菜单（用于右侧工具项；弹出的是共用菜单）"""
+    widget.bind("<Button-3>", lambda event: popup_tool_menu(app, event, tool))
+
+
+def show_tool_context_menu(app, event, tree, tools):
+    """在 Treeview 上显示工具的右键菜单（按鼠标所在的行定位工具，并选中该行）"""
+    row = tree.identify_row(event.y)
+    if row:
+        tree.selection_set(row)
+    else:
+        sel = tree.selection()
+        if not sel:
+            return
+        row = sel[0]
+    idx = tree.index(row)
+    if idx < 0 or idx >= len(tools):
+        return
+    popup_tool_menu(app, event, tools[idx])
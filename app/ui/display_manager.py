@@ -2,6 +2,10 @@ import tkinter as tk
 from tkinter import ttk
 import os
 from ..utils.tool_manager import run_tool as util_run_tool
+from ..services.version_cache import get_tool_version
+from ..utils.icon_cache import get_icon_cache
+from ..utils.icon_utils import get_fallback_icon, get_type_icon, peek_file_icon, release_file_icon, tool_stamp
+from ..services.icon_loader import get_icon_loader
 
 
 def _normalize_key(key: str) -> str:
@@ -95,19 +99,230 @@ def _lookup_added_record(app, tool_path: str, record_index: dict):
     return None
 
 
+def _set_view_state(app, state):
+    """记录当前视图（逐批追加扫描结果时使用）"""
+    try:
+        app._tool_view = state
+    except Exception:
+        pass
+
+
+def _get_view_state(app, mode):
+    """取当前视图；模式不符或控件已销毁时返回 None"""
+    state = getattr(app, "_tool_view", None)
+    if not state or state.get("mode") != mode:
+        return None
+    try:
+        if not state["title"].winfo_exists():
+            return None
+    except Exception:
+        return None
+    return state
+
+
+def _current_version(app, tool):
+    """
+    版本取自版本缓存（按 路径+大小+修改时间 校验，文件被替换后自动重新读取）；
+    非 exe/msi 返回 None，由调用方回退到 ToolAddedRecord 中的记录
+    """
+    size, mtime = tool.get("size"), tool.get("mtime")
+    if not isinstance(size, (int, float)) or not isinstance(mtime, (int, float)):
+        size = mtime = None
+    try:
+        return get_tool_version(app, tool.get("path", ""), size, mtime)
+    except Exception:
+        return None
+
+
+# 列表分批插入：首屏同步插入，其余按时间片经 after() 逐批插入，界面不会被整表插入卡住
+LIST_FIRST_PAGE = 60
+LIST_SLICE_MS = 12
+# 版本/添加时间等列：行滚入视口时才查询（每次最多解析这么多行）
+LIST_RESOLVE_BATCH = 200
+
+
+def _list_row_values(index, tool, rec=None, version=None):
+    """列表一行的值；rec/version 未解析时版本、添加时间先留空，其余列用工具自带的字段"""
+    rec = rec or {}
+    return (
+        index + 1,
+        tool.get("name", ""),
+        rec.get("category", "") or tool.get("category", ""),
+        "" if version is None else version,
+        rec.get("add_time", "") or tool.get("add_time", ""),
+        rec.get("type", "") or tool.get("type", ""),
+        rec.get("note", "") or tool.get("note", ""),
+    )
+
+
+def _resolve_list_row(app, state, index):
+    """解析一行的版本/添加时间（ToolAddedRecord + 版本缓存）并更新该行"""
+    tool = state["tools"][index]
+    rec = _lookup_added_record(app, tool.get("path", ""), state["record_index"]) or {}
+    version = _current_version(app, tool) or rec.get("version", "") or tool.get("version", "")
+    state["tree"].item(state["iids"][index], values=_list_row_values(index, tool, rec, version))
+    state["resolved"].add(index)
+
+
+def _resolve_visible_rows(app, state):
+    """解析当前可见（及已插入）范围内尚未解析的行"""
+    state["resolve_job"] = None
+    tree = state["tree"]
+    try:
+        if not tree.winfo_exists():
+            return
+        first, last = tree.yview()
+    except Exception:
+        return
+
+    inserted = len(state["iids"])
+    start = int(float(first) * inserted)
+    stop = min(inserted, int(float(last) * inserted) + 2, start + LIST_RESOLVE_BATCH)
+    for index in range(start, stop):
+        if index in state["resolved"]:
+            continue
+        try:
+            _resolve_list_row(app, state, index)
+        except Exception as e:
+            print(f"读取列表行信息失败: {e}")
+            state["resolved"].add(index)
+
+
+def _schedule_resolve_rows(app, state):
+    if state.get("resolve_job") is not None:
+        return
+    try:
+        state["resolve_job"] = state["tree"].after_idle(lambda: _resolve_visible_rows(app, state))
+    except Exception:
+        state["resolve_job"] = None
+
+
+def _pump_list_rows(app, state, budget_ms=LIST_SLICE_MS, limit=None):
+    """插入尚未插入的行，直到用完时间片（或插满 limit 行）；还有剩余时排到下一轮"""
+    import time
+
+    state["pump_job"] = None
+    tree = state["tree"]
+    try:
+        if not tree.winfo_exists():
+            return
+    except Exception:
+        return
+
+    tools, iids = state["tools"], state["iids"]
+    deadline = time.perf_counter() + budget_ms / 1000.0
+    end = len(tools) if limit is None else min(len(tools), len(iids) + limit)
+    while len(iids) < end:
+        index = len(iids)
+        iids.append(tree.insert("", "end", values=_list_row_values(index, tools[index])))
+        # 每 32 行看一次时间
+        if index % 32 == 31 and limit is None and time.perf_counter() >= deadline:
+            break
+
+    if len(iids) < len(tools):
+        try:
+            state["pump_job"] = tree.after(1, lambda: _pump_list_rows(app, state))
+        except Exception:
+            state["pump_job"] = None
+    _schedule_resolve_rows(app, state)
+
+
+def _insert_list_rows(app, state, new_tools):
+    """向列表追加若干行：登记到视图的工具列表，由 _pump_list_rows 分批插入"""
+    state["tools"].extend(new_tools)
+    if state.get("pump_job") is None:
+        _pump_list_rows(app, state)
+
+
+def _tool_signature(tool):
+    """比较两次刷新之间工具是否有变化（按路径对应）"""
+    return (
+        tool.get("path", ""), tool.get("name", ""), tool.get("category", ""), tool.get("type", ""),
+        tool.get("note", ""), tool.get("size"), tool.get("mtime"),
+    )
+
+
+def _diff_list_rows(app, state, new_tools):
+    """
+    按路径对比新旧工具列表，只改动有差异的行：删除消失的、插入新增的、移动顺序变了的、
+    重写内容变了的；完全相同时什么也不做。尚未插入的行仍由 _pump_list_rows 分批插入。
+    """
+    tree = state["tree"]
+    old_tools, old_iids = state["tools"], state["iids"]
+    new_tools = list(new_tools)
+    if [_tool_signature(t) for t in old_tools] == [_tool_signature(t) for t in new_tools]:
+        old_tools[:] = new_tools
+        return
+
+    old = {}
+    for i, iid in enumerate(old_iids):
+        old[old_tools[i].get("path", "")] = (iid, _tool_signature(old_tools[i]), i)
+
+    # 已插入的行数不变（至少一屏），其余交给分批插入
+    limit = min(len(new_tools), max(len(old_iids), LIST_FIRST_PAGE))
+    head = new_tools[:limit]
+    keep = {t.get("path", "") for t in head}
+    gone = [iid for path, (iid, _sig, _i) in old.items() if path not in keep]
+    if gone:
+        tree.delete(*gone)
+    gone = set(gone)
+    order = [iid for iid in old_iids if iid not in gone]   # 树中当前的行顺序
+
+    iids, resolved = [], set()
+    for index, tool in enumerate(head):
+        hit = old.pop(tool.get("path", ""), None)
+        if hit is None:
+            iid = tree.insert("", index, values=_list_row_values(index, tool))
+            order.insert(index, iid)
+            iids.append(iid)
+            continue
+        iid, sig, old_index = hit
+        if index >= len(order) or order[index] != iid:
+            tree.move(iid, "", index)
+            order.remove(iid)
+            order.insert(index, iid)
+        iids.append(iid)
+        if sig != _tool_signature(tool):
+            tree.item(iid, values=_list_row_values(index, tool))
+        elif old_index == index and old_index in state["resolved"]:
+            resolved.add(index)
+        # 位置变了的行序号已过期：滚入视口时重新解析
+
+    old_tools[:] = new_tools
+    state["iids"] = iids
+    state["resolved"] = resolved
+    if state.get("pump_job") is None and len(iids) < len(old_tools):
+        _pump_list_rows(app, state)
+    _schedule_resolve_rows(app, state)
+
+
 def display_list_mode(app, tools, category_name, count):
     """列表模式：显示 序号/名称/分类/版本/添加时间/类型/备注（修复版本/添加时间查不到）"""
 
     container = getattr(app, "tools_container", app.main_frame)
 
+    # 已经是列表视图：保留控件，只按差异更新行
+    state = _get_view_state(app, "list")
+    if state is not None and state.get("container") is container:
+        state["record_index"] = _build_record_index(app)
+        _diff_list_rows(app, state, tools)
+        state["title"].configure(text=f"{category_name} （{count}）")
+        return
+
     # 清空
     for w in container.winfo_children():
         w.destroy()
 
+    # 图标模式尚未完成的图标加载作废
+    loader = get_icon_loader(app)
+    if loader is not None:
+        loader.begin_view()
+
     # 标题栏
     header = ttk.Frame(container)
     header.pack(fill="x", padx=6, pady=(6, 0))
-    ttk.Label(header, text=f"{category_name} （{count}）", font=("Microsoft YaHei", 10, "bold")).pack(side="left")
+    title = ttk.Label(header, text=f"{category_name} （{count}）", font=("Microsoft YaHei", 10, "bold"))
+    title.pack(side="left")
 
     # 预先建立记录索引（关键）
     record_index = _build_record_index(app)
@@ -134,30 +349,20 @@ def display_list_mode(app, tools, category_name, count):
 
     tree.pack(fill="both", expand=True, padx=6, pady=6)
 
-    # 插入数据（版本/时间来自 ToolAddedRecord）
-    for i, tool in enumerate(tools, start=1):
-        path = tool.get("path", "")
-        rec = _lookup_added_record(app, path, record_index) or {}
-
-        version = rec.get("version", "") or tool.get("version", "")
-        add_time = rec.get("add_time", "") or tool.get("add_time", "")
-        note = rec.get("note", "") or tool.get("note", "")
-        typ = rec.get("type", "") or tool.get("type", "")
-        category = rec.get("category", "") or tool.get("category", "")
-
-        tree.insert(
-            "",
-            "end",
-            values=(
-                i,
-                tool.get("name", ""),
-                category,
-                version,
-                add_time,
-                typ,
-                note,
-            ),
-        )
+    # 视图持有自己的工具列表：后续逐批追加时只 extend 这一份
+    state = {
+        "mode": "list", "container": container, "title": title, "tree": tree, "tools": list(tools),
+        "record_index": record_index,
+        "iids": [], "resolved": set(), "pump_job": None, "resolve_job": None,
+    }
+    _set_view_state(app, state)
+    tools = state["tools"]
+
+    # 行滚入视口时解析版本/添加时间
+    tree.configure(yscrollcommand=lambda _first, _last: _schedule_resolve_rows(app, state))
+
+    # 首屏同步插入，其余分批
+    _pump_list_rows(app, state, limit=LIST_FIRST_PAGE)
 
     # 双击运行
     def on_double_click(_event):
@@ -180,44 +385,438 @@ def display_list_mode(app, tools, category_name, count):
         pass
 
 
+# 虚拟网格：只为视口内（上下各多留 GRID_OVERSCAN 行）的格子创建画布元素，滚出视口的格子回收复用
+GRID_OVERSCAN = 2
+GRID_PAD = 6
+# 连续的重排请求（拖动图标大小、改变窗口大小）合并到每帧一次
+GRID_FRAME_MS = 16
+
+
+def _grid_pitch(state):
+    return state["item_w"] + GRID_PAD * 2, state["item_h"] + GRID_PAD * 2
+
+
+def _elide(font, text, max_px):
+    """文字超出 max_px 宽度时截断并加省略号"""
+    if font.measure(text) <= max_px:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if font.measure(text[:mid] + "…") <= max_px:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo] + "…"
+
+
+def _update_grid_scrollregion(state):
+    pitch_x, pitch_y = _grid_pitch(state)
+    rows = -(-len(state["tools"]) // state["cols"])
+    state["canvas"].configure(scrollregion=(0, 0, state["cols"] * pitch_x, rows * pitch_y))
+
+
+def _new_grid_cell(state):
+    """创建一个格子的画布元素（边框/图标/占位符号/名称），初始隐藏"""
+    canvas = state["canvas"]
+    return {
+        "rect": canvas.create_rectangle(0, 0, 0, 0, outline="#dcdcdc", fill="white", state="hidden"),
+        "image": canvas.create_image(0, 0, anchor="n", state="hidden"),
+        "glyph": canvas.create_text(0, 0, anchor="n", fill="#444", state="hidden",
+                                    font=("Segoe UI Emoji", max(12, int(state["icon_size"] * 0.55)))),
+        "name": canvas.create_text(0, 0, anchor="n", justify="center", state="hidden",
+                                   width=state["item_w"] - 10, font=state["name_font"]),
+        "index": None,
+        "path": None,
+        "sig": None,
+        "photo": None,
+        "ticket": None,
+    }
+
+
+def _show_cell_icon(state, cell, icon):
+    canvas = state["canvas"]
+    cell["photo"] = icon
+    if icon and not isinstance(icon, str):
+        canvas.itemconfigure(cell["image"], image=icon, state="normal")
+        canvas.itemconfigure(cell["glyph"], state="hidden")
+    else:
+        canvas.itemconfigure(cell["image"], image="", state="hidden")
+        canvas.itemconfigure(cell["glyph"], text=icon if isinstance(icon, str) else "？", state="normal")
+
+
+def _place_grid_cell(state, cell, index):
+    """把格子的画布元素移到第 index 个位置（不改内容）"""
+    canvas = state["canvas"]
+    item_w, item_h = state["item_w"], state["item_h"]
+    pitch_x, pitch_y = _grid_pitch(state)
+    row, col = divmod(index, state["cols"])
+    x, y = col * pitch_x + GRID_PAD, row * pitch_y + GRID_PAD
+    cx = x + item_w // 2
+    cell["index"] = index
+    canvas.coords(cell["rect"], x, y, x + item_w, y + item_h)
+    canvas.coords(cell["image"], cx, y + 8)
+    canvas.coords(cell["glyph"], cx, y + 10)
+    canvas.coords(cell["name"], cx, y + 8 + state["icon_size"] + 4)
+
+
+def _bind_grid_cell(app, state, cell, index):
+    """把格子摆到第 index 个工具的位置并显示它（图标未缓存时先显示类型占位，后台加载好后替换）"""
+    canvas = state["canvas"]
+    tool = state["tools"][index]
+    path = tool.get("path", "")
+    icon_size = state["icon_size"]
+
+    cell["path"], cell["sig"] = path, _tool_signature(tool)
+    _place_grid_cell(state, cell, index)
+    canvas.itemconfigure(cell["rect"], state="normal")
+    canvas.itemconfigure(
+        cell["name"],
+        text=_elide(state["name_font"], tool.get("name", ""), state["name_px"]),
+        state="normal",
+    )
+
+    icon = None
+    loader = get_icon_loader(app)
+    pending = False
+    try:
+        if loader is None:
+            icon = app.get_tool_icon(path, tool.get("name", ""), size=icon_size)
+        else:
+            hit, icon = peek_file_icon(app, path, icon_size, tool_stamp(tool))
+            if not hit:
+                pending = True
+            if not icon:
+                icon = get_type_icon(app, path, size=icon_size) if pending else get_fallback_icon(app, path, size=icon_size)
+    except Exception:
+        icon = None
+    _show_cell_icon(state, cell, icon)
+
+    if pending:
+        def on_icon_ready(photo, cell=cell, path=path):
+            try:
+                if cell["path"] != path:
+                    return
+                cell["ticket"] = None
+                if not photo and os.name == "nt":
+                    # 没有文件图标：Windows 上可能还能向系统取到 exe 图标
+                    photo = get_fallback_icon(app, path, size=icon_size)
+                if photo and not isinstance(photo, str):
+                    _show_cell_icon(state, cell, photo)
+            except Exception:
+                pass
+
+        # 拖动图标大小时的中间尺寸不写入缩略图缓存
+        cell["ticket"] = loader.request(path, icon_size, on_icon_ready, persist=not state.get("dragging"))
+
+
+def _drop_cell_icon(app, cell, icon_size):
+    """格子不再显示当前图标：取消未完成的加载，图标在内存缓存中取消钉住"""
+    loader = get_icon_loader(app)
+    if loader is not None and cell["ticket"] is not None:
+        loader.cancel(cell["ticket"])
+    cell["ticket"] = None
+    if cell["path"]:
+        release_file_icon(app, cell["path"], icon_size)
+
+
+def _release_grid_cell(app, state, cell):
+    """格子滚出视口：取消未完成的图标加载，隐藏并放回空闲池"""
+    _drop_cell_icon(app, cell, state["icon_size"])
+    cell.update({"index": None, "path": None, "sig": None, "photo": None, "ticket": None})
+    canvas = state["canvas"]
+    for key in ("rect", "image", "glyph", "name"):
+        canvas.itemconfigure(cell[key], state="hidden")
+    state["free_cells"].append(cell)
+
+
+def _visible_range(state):
+    """视口内（含上下预留行）的工具序号范围 [start, stop)；画布不可用时返回 None"""
+    canvas = state["canvas"]
+    try:
+        if not canvas.winfo_exists():
+            return None
+        top = canvas.canvasy(0)
+        height = max(canvas.winfo_height(), 1)
+    except Exception:
+        return None
+
+    _pitch_x, pitch_y = _grid_pitch(state)
+    cols = state["cols"]
+    first_row = max(0, int(top // pitch_y) - GRID_OVERSCAN)
+    last_row = int((top + height) // pitch_y) + GRID_OVERSCAN
+    return first_row * cols, min(len(state["tools"]), (last_row + 1) * cols)
+
+
+def _refresh_grid(app, state):
+    """按当前滚动位置物化可见行：不再可见的格子回收，新进入视口的位置复用空闲格子"""
+    state["refresh_job"] = None
+    visible = _visible_range(state)
+    if visible is None:
+        return
+    start, stop = visible
+
+    cells = state["cells"]
+    for index in [i for i in cells if not start <= i < stop]:
+        _release_grid_cell(app, state, cells.pop(index))
+    for index in range(start, stop):
+        if index in cells:
+            continue
+        cell = state["free_cells"].pop() if state["free_cells"] else _new_grid_cell(state)
+        cells[index] = cell
+        _bind_grid_cell(app, state, cell, index)
+
+
+def _diff_grid_cells(app, state, new_tools):
+    """
+    按路径对比新旧工具列表：内容没变的格子原样保留（位置变了只移动），
+    变了的或新出现的才重新绑定；完全相同时什么也不做
+    """
+    old_tools = state["tools"]
+    new_tools = list(new_tools)
+    if [_tool_signature(t) for t in old_tools] == [_tool_signature(t) for t in new_tools]:
+        old_tools[:] = new_tools
+        return
+
+    old_cells = {cell["path"]: cell for cell in state["cells"].values()}
+    old_tools[:] = new_tools
+    state["cells"] = cells = {}
+    _update_grid_scrollregion(state)
+
+    visible = _visible_range(state)
+    start, stop = visible if visible is not None else (0, 0)
+    stale = []
+    for index in range(start, stop):
+        tool = new_tools[index]
+        cell = old_cells.pop(tool.get("path", ""), None)
+        if cell is not None and cell["sig"] == _tool_signature(tool):
+            if cell["index"] != index:
+                _place_grid_cell(state, cell, index)
+            cells[index] = cell
+        else:
+            if cell is not None:
+                _release_grid_cell(app, state, cell)
+            stale.append(index)
+    for cell in old_cells.values():
+        _release_grid_cell(app, state, cell)
+    for index in stale:
+        cell = state["free_cells"].pop() if state["free_cells"] else _new_grid_cell(state)
+        cells[index] = cell
+        _bind_grid_cell(app, state, cell, index)
+
+
+def _schedule_grid_refresh(app, state):
+    """同一轮事件中的多次滚动/追加合并为一次刷新"""
+    if state.get("refresh_job") is not None:
+        return
+    try:
+        state["refresh_job"] = state["canvas"].after_idle(lambda: _refresh_grid(app, state))
+    except Exception:
+        state["refresh_job"] = None
+
+
+def _grid_index_at(state, event):
+    """命中测试：事件位置对应的工具序号；落在格子之间的空白或没有工具时返回 None"""
+    canvas = state["canvas"]
+    x, y = canvas.canvasx(event.x), canvas.canvasy(event.y)
+    pitch_x, pitch_y = _grid_pitch(state)
+    col, row = int(x // pitch_x), int(y // pitch_y)
+    if x < 0 or y < 0 or col >= state["cols"]:
+        return None
+    dx, dy = x - col * pitch_x, y - row * pitch_y
+    if not (GRID_PAD <= dx <= GRID_PAD + state["item_w"] and GRID_PAD <= dy <= GRID_PAD + state["item_h"]):
+        return None
+    index = row * state["cols"] + col
+    return index if index < len(state["tools"]) else None
+
+
+def _grid_item_size(icon_size):
+    """格子大小（紧凑占位）"""
+    return max(110, int(icon_size) + 56), max(100, int(icon_size) + 52)
+
+
+def _grid_columns(container, item_w, default):
+    """按容器宽度自动算列数；容器尚未布局时用 default"""
+    try:
+        avail_w = container.winfo_width()
+        if avail_w and avail_w > 200:
+            return max(1, (avail_w - 24) // (item_w + 10))
+    except Exception:
+        pass
+    return int(default) if default else 4
+
+
+def _apply_grid_metrics(state, icon_size, cols):
+    """按图标大小/列数更新格子尺寸与名称可用的行宽（名称最多显示到格子底部，超出部分截断）"""
+    item_w, item_h = _grid_item_size(icon_size)
+    name_font = state["name_font"]
+    name_lines = max(1, (item_h - icon_size - 18) // max(1, name_font.metrics("linespace")))
+    state.update({
+        "icon_size": icon_size, "item_w": item_w, "item_h": item_h, "cols": cols,
+        "name_px": (item_w - 10) * name_lines - 12,
+    })
+    state["canvas"].configure(yscrollincrement=max(1, (item_h + GRID_PAD * 2) // 4))
+
+
+def _style_grid_cell(state, cell):
+    """随图标大小变化的格子样式：占位符号字号、名称换行宽度"""
+    canvas = state["canvas"]
+    canvas.itemconfigure(cell["glyph"], font=("Segoe UI Emoji", max(12, int(state["icon_size"] * 0.55))))
+    canvas.itemconfigure(cell["name"], width=state["item_w"] - 10)
+
+
+def _relayout_grid(app, state):
+    """
+    图标大小或列数变化时原地重排：已物化的格子只移动位置（图标大小变了则原地换图），
+    不重建画布/格子；视口顶部的那一行保持不动
+    """
+    state["relayout_job"] = None
+    canvas = state["canvas"]
+    try:
+        if not canvas.winfo_exists():
+            return
+    except Exception:
+        return
+
+    size = state.get("pending_size") or state["icon_size"]
+    cols = _grid_columns(state["container"], _grid_item_size(size)[0], state["cols"])
+    old_size = state["icon_size"]
+    if size == old_size and cols == state["cols"]:
+        return
+
+    _pitch_x, pitch_y = _grid_pitch(state)
+    first = int(canvas.canvasy(0) // pitch_y) * state["cols"]
+
+    _apply_grid_metrics(state, size, cols)
+    for cell in state["free_cells"]:
+        _style_grid_cell(state, cell)
+    for index, cell in state["cells"].items():
+        if size == old_size:
+            _place_grid_cell(state, cell, index)
+            continue
+        _drop_cell_icon(app, cell, old_size)
+        _style_grid_cell(state, cell)
+        _bind_grid_cell(app, state, cell, index)
+
+    _update_grid_scrollregion(state)
+    _pitch_x, pitch_y = _grid_pitch(state)
+    rows = max(1, -(-len(state["tools"]) // cols))
+    canvas.yview_moveto((first // cols) * pitch_y / (rows * pitch_y))
+    _refresh_grid(app, state)
+
+
+def _persist_grid_icons(app, state):
+    """
+    拖动图标大小结束：先按最终尺寸完成重排，再把可见格子的图标补写进缩略图缓存
+    （拖动中的请求为 persist=False，最终尺寸的图标可能已在拖动时加载好，不会再被请求）
+    """
+    job = state.get("relayout_job")
+    if job is not None:
+        try:
+            state["canvas"].after_cancel(job)
+        except Exception:
+            pass
+        _relayout_grid(app, state)
+
+    loader = get_icon_loader(app)
+    if loader is None:
+        return
+    for cell in state["cells"].values():
+        if cell["path"]:
+            loader.persist(cell["path"], state["icon_size"])
+
+
+def _schedule_grid_relayout(app, state):
+    """拖动滑块/改变窗口大小的连续事件合并：每帧最多重排一次"""
+    if state.get("relayout_job") is not None:
+        return
+    try:
+        state["relayout_job"] = state["canvas"].after(GRID_FRAME_MS, lambda: _relayout_grid(app, state))
+    except Exception:
+        state["relayout_job"] = None
+
+
 def display_grid_mode(app, tools, category_name, count, cols=4):
-    """图标模式：紧凑占位 + 可滚动（保持你当前可正常显示图标的逻辑）"""
+    """图标模式：紧凑占位 + 可滚动；虚拟网格，控件数量只与窗口大小有关、与工具数量无关"""
 
     container = getattr(app, "tools_container", app.main_frame)
 
+    # 图标大小
+    icon_size = 48
+    try:
+        icon_size = int(app.config["General"].get("icon_size", "48"))
+    except Exception:
+        icon_size = 48
+
+    # 已经是图标视图：保留画布与格子，图标大小不同时原地重排，再按差异更新
+    state = _get_view_state(app, "grid")
+    if state is not None and state.get("container") is container:
+        state["category_name"] = category_name
+        if state["icon_size"] != icon_size:
+            state["pending_size"] = icon_size
+            _relayout_grid(app, state)
+        _diff_grid_cells(app, state, tools)
+        state["title"].configure(text=f"{category_name} （{count}）")
+        return
+
     # 清空
     for w in container.winfo_children():
         w.destroy()
 
+    # 新视图：上一个视图钉住的图标恢复为可淘汰，尚未完成的图标加载作废
+    get_icon_cache(app).begin_view()
+    loader = get_icon_loader(app)
+    if loader is not None:
+        loader.begin_view()
+
     # 标题栏
     header = ttk.Frame(container)
     header.pack(fill="x", padx=6, pady=(6, 0))
-    ttk.Label(header, text=f"{category_name} （{count}）", font=("Microsoft YaHei", 10, "bold")).pack(side="left")
-
-    # 图标大小
-    icon_size = 48
-    try:
-        icon_size = int(app.config["General"].get("icon_size", "48"))
-    except Exception:
-        icon_size = 48
+    title = ttk.Label(header, text=f"{category_name} （{count}）", font=("Microsoft YaHei", 10, "bold"))
+    title.pack(side="left")
 
     size_var = tk.DoubleVar(value=float(icon_size))
 
+    # 视图持有自己的工具列表：后续逐批追加时只 extend 这一份
+    state = {
+        "mode": "grid", "container": container, "title": title, "tools": list(tools),
+        "icon_size": icon_size, "category_name": category_name, "saved_size": icon_size,
+        "pending_size": None, "dragging": False, "relayout_job": None,
+    }
+
     def on_size_change(val):
+        # 拖动中每次移动只记下目标大小，重排合并到下一帧
         try:
-            size = int(float(val))
-            size = max(24, min(96, size))
-            app.config["General"]["icon_size"] = str(size)
-            try:
-                app.config_manager.save_config()
-            except Exception:
-                pass
-            app.display_grid_mode(tools, category_name, count)
+            size = max(24, min(96, int(float(val))))
+        except Exception:
+            return
+        app.config["General"]["icon_size"] = str(size)
+        state["pending_size"] = size
+        _schedule_grid_relayout(app, state)
+
+    def on_size_press(_event=None):
+        state["dragging"] = True
+
+    def on_size_commit(_event=None):
+        # 拖动结束（或键盘调整后）才写一次 ToolBox.ini
+        if state["dragging"]:
+            state["dragging"] = False
+            _persist_grid_icons(app, state)
+        size = state.get("pending_size") or state["icon_size"]
+        if size == state.get("saved_size"):
+            return
+        state["saved_size"] = size
+        try:
+            app.config_manager.save_config()
         except Exception:
             pass
 
     ttk.Label(header, text="图标大小:").pack(side="right", padx=(6, 0))
-    ttk.Scale(header, from_=24, to=96, orient="horizontal", variable=size_var, command=on_size_change).pack(side="right")
+    scale = ttk.Scale(header, from_=24, to=96, orient="horizontal", variable=size_var, command=on_size_change)
+    scale.pack(side="right")
+    scale.bind("<ButtonPress-1>", on_size_press)
+    scale.bind("<ButtonRelease-1>", on_size_commit)
+    scale.bind("<KeyRelease>", on_size_commit)
 
     # Canvas + Scroll
     outer = ttk.Frame(container)
@@ -225,18 +824,16 @@ def display_grid_mode(app, tools, category_name, count, cols=4):
 
     canvas = tk.Canvas(outer, bg="white", highlightthickness=0)
     vbar = ttk.Scrollbar(outer, orient="vertical", command=canvas.yview)
-    canvas.configure(yscrollcommand=vbar.set)
 
-    vbar.pack(side="right", fill="y")
-    canvas.pack(side="left", fill="both", expand=True)
+    # 视图位置一变化（滚动/窗口大小/滚动区域）就刷新可见格子
+    def _on_yscroll(first, last):
+        vbar.set(first, last)
+        _schedule_grid_refresh(app, state)
 
-    grid_frame = tk.Frame(canvas, bg="white")
-    canvas.create_window((0, 0), window=grid_frame, anchor="nw")
+    canvas.configure(yscrollcommand=_on_yscroll)
 
-    def _update_scrollregion(_evt=None):
-        canvas.configure(scrollregion=canvas.bbox("all"))
-
-    grid_frame.bind("<Configure>", _update_scrollregion)
+    vbar.pack(side="right", fill="y")
+    canvas.pack(side="left", fill="both", expand=True)
 
     def _on_mousewheel(event):
         try:
@@ -244,80 +841,68 @@ def display_grid_mode(app, tools, category_name, count, cols=4):
         except Exception:
             pass
 
-    canvas.bind_all("<MouseWheel>", _on_mousewheel)
-
-    # item 占位（紧凑）
-    item_w = max(110, int(icon_size) + 56)
-    item_h = max(100, int(icon_size) + 52)
+    # 只绑定在画布上（不再每次重绘都 bind_all 覆盖全局滚轮）
+    canvas.bind("<MouseWheel>", _on_mousewheel)
 
     # 自动列数
     try:
         container.update_idletasks()
-        avail_w = container.winfo_width()
-        if avail_w and avail_w > 200:
-            cols_use = max(1, (avail_w - 24) // (item_w + 10))
-        else:
-            cols_use = int(cols) if cols else 4
     except Exception:
-        cols_use = int(cols) if cols else 4
-
-    for i in range(cols_use):
-        grid_frame.grid_columnconfigure(i, weight=0)
-
-    row, col = 0, 0
-    for tool in tools:
-        path = tool.get("path", "")
-        name = tool.get("name", "")
-
-        item = tk.Frame(
-            grid_frame,
-            bg="white",
-            width=item_w,
-            height=item_h,
-            highlightthickness=1,
-            highlightbackground="#dcdcdc",
-        )
-        item.grid(row=row, column=col, padx=6, pady=6, sticky="n")
-        item.grid_propagate(False)
-
-        # icon
-        icon = None
-        try:
-            icon = app.get_tool_icon(path, name, size=icon_size)
-        except Exception:
-            icon = None
-
-        if icon and not isinstance(icon, str):
-            lab = tk.Label(item, image=icon, bg="white")
-            lab.image = icon
-            lab.pack(pady=(8, 2))
-        else:
-            tk.Label(
-                item,
-                text="？" if not isinstance(icon, str) else icon,
-                bg="white",
-                font=("Segoe UI Emoji", max(12, int(icon_size * 0.55))),
-                fg="#444",
-            ).pack(pady=(10, 2))
-
-        tk.Label(item, text=name, bg="white", wraplength=item_w - 10, justify="center",
-                 font=("Microsoft YaHei", 9)).pack(padx=6, pady=(0, 6))
-
-        # 双击运行
-        item.bind("<Double-1>", lambda e, p=path: util_run_tool(app, p))
-        for child in item.winfo_children():
-            child.bind("<Double-1>", lambda e, p=path: util_run_tool(app, p))
-
-        # 右键菜单
+        pass
+    cols_use = _grid_columns(container, _grid_item_size(icon_size)[0], cols)
+
+    from tkinter import font as tkfont
+    state.update({
+        "canvas": canvas, "name_font": tkfont.Font(family="Microsoft YaHei", size=9),
+        "cells": {}, "free_cells": [], "refresh_job": None,
+    })
+    _apply_grid_metrics(state, icon_size, cols_use)
+
+    # 窗口大小变化：按新宽度重新计算列数（合并到每帧一次）
+    canvas.bind("<Configure>", lambda _e: _schedule_grid_relayout(app, state))
+
+    _set_view_state(app, state)
+    _update_grid_scrollregion(state)
+
+    # 双击运行 / 右键菜单：画布级绑定，按位置命中格子
+    def _on_double_click(event):
+        index = _grid_index_at(state, event)
+        if index is not None:
+            util_run_tool(app, state["tools"][index].get("path", ""))
+
+    def _on_right_click(event):
+        index = _grid_index_at(state, event)
+        if index is None:
+            return
         try:
-            from .context_menu import add_context_menu
-            add_context_menu(app, item, tool)
-            for child in item.winfo_children():
-                add_context_menu(app, child, tool)
+            from .context_menu import popup_tool_menu
+            popup_tool_menu(app, event, state["tools"][index])
         except Exception:
             pass
 
-        col += 1
-        if col >= cols_use:
-            col = 0
-            row += 1
+    canvas.bind("<Double-1>", _on_double_click)
+    canvas.bind("<Button-3>", _on_right_click)
+
+    _refresh_grid(app, state)
+
+
+def append_list_mode(app, new_tools, category_name, count):
+    """列表模式追加一批结果（后台扫描逐批返回时使用）；当前不是列表视图时返回 False"""
+    state = _get_view_state(app, "list")
+    if state is None:
+        return False
+    _insert_list_rows(app, state, list(new_tools))
+    state["title"].configure(text=f"{category_name} （{count}）")
+    return True
+
+
+def append_grid_mode(app, new_tools, category_name, count):
+    """图标模式追加一批结果（后台扫描逐批返回时使用）；当前不是图标视图时返回 False"""
+    state = _get_view_state(app, "grid")
+    if state is None:
+        return False
+    state["tools"].extend(new_tools)
+    _update_grid_scrollregion(state)
+    _schedule_grid_refresh(app, state)
+    state["title"].configure(text=f"{category_name} （{count}）")
+    return True
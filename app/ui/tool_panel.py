@@ -24,7 +24,7 @@ def create_tool_panel(app, parent):
     
     app.search_var = StringVar()
     # 搜索内容改变时自动触发
-    app.search_var.trace("w", lambda *args: app.load_and_display_tools())
+    app.search_var.trace("w", lambda *args: app.schedule_search())
     search_entry = Entry(search_frame, textvariable=app.search_var,
                          width=30, font=("Microsoft YaHei", 10))
     search_entry.pack(side='left', padx=5)
@@ -66,7 +66,7 @@ def create_tool_panel(app, parent):
            bg='#27ae60', fg='white', command=app.search_tools).pack(side='left', padx=5)
     
     Button(toolbar, text="刷新", font=("Microsoft YaHei", 10),
-           bg='#e67e22', fg='white', command=app.refresh_tools).pack(side='left', padx=5)
+           bg='#e67e22', fg='white', command=lambda: app.refresh_tools(force=True)).pack(side='left', padx=5)
     
     Button(toolbar, text="扫描新工具", font=("Microsoft YaHei", 10),
            bg='#3498db', fg='white', command=app.scan_for_new_tools).pack(side='left', padx=5)
@@ -150,10 +150,13 @@ def process_dropped_paths(paths, app):
             return
 
         target_dir = Path(dir_path)
-        for p in paths:
-            if not p:
-                continue
-            move_file_to_category(p, target_dir, app)
+        # 一次拖入多个文件：添加记录批量写入 ToolBox.ini（只写一次）
+        from ..services.tool_scanner import batch_record_tool_added
+        with batch_record_tool_added(app):
+            for p in paths:
+                if not p:
+                    continue
+                move_file_to_category(p, target_dir, app)
         app.refresh_tools()
     except Exception as e:
         print(f"处理拖入路径失败: {e}")
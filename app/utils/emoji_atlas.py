@@ -0,0 +1,77 @@
+# File: ToolBox/app/utils/emoji_atlas.py
+
+from functools import lru_cache
+
+from .icons import all_filetype_icons
+
+EMOJI_FONT = "seguiemj.ttf"
+
+
+@lru_cache(maxsize=None)
+def _font(font_size):
+    """按字号缓存字体对象（truetype 每次加载都要读字体文件）"""
+    from PIL import ImageFont
+    try:
+        return ImageFont.truetype(EMOJI_FONT, font_size)
+    except Exception:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=256)
+def render_glyph(glyph, size):
+    """把图标符号渲染成 size×size 的透明底 RGBA Image（同一符号/尺寸只渲染一次）"""
+    from PIL import Image, ImageDraw
+
+    size = int(size)
+    img = Image.new('RGBA', (size, size), (255, 255, 255, 0))
+    draw = ImageDraw.Draw(img)
+    font = _font(max(12, int(size * 0.45)))
+    try:
+        bbox = draw.textbbox((0, 0), glyph, font=font)
+        w = bbox[2] - bbox[0]
+        h = bbox[3] - bbox[1]
+    except Exception:
+        w, h = draw.textsize(glyph, font=font)
+
+    draw.text(((size - w) / 2, (size - h) / 2), glyph, font=font, fill=(0, 0, 0, 255))
+    return img
+
+
+def build_atlas(size):
+    """某尺寸下全部类型图标：{符号: PhotoImage}（须在 Tk 线程调用）"""
+    from PIL import ImageTk
+
+    return {glyph: ImageTk.PhotoImage(render_glyph(glyph, size)) for glyph in all_filetype_icons()}
+
+
+def get_emoji_icon(app, glyph, size=48):
+    """
+    取类型图标的 PhotoImage：每个尺寸第一次用到时一次性渲染全部符号，之后按 (尺寸, 符号) 直接取。
+    图集常驻 app.emoji_atlas（每个尺寸只有十几张小图，不参与图标缓存淘汰）；
+    Pillow 不可用或渲染失败时返回 None
+    """
+    atlas = getattr(app, "emoji_atlas", None)
+    if atlas is None:
+        atlas = {}
+        try:
+            app.emoji_atlas = atlas
+        except Exception:
+            pass
+
+    size = int(size)
+    icons = atlas.get(size)
+    if icons is None:
+        try:
+            icons = build_atlas(size)
+        except Exception:
+            icons = {}
+        atlas[size] = icons
+
+    if glyph not in icons:
+        # 不在图集中的符号（icons.py 之外的来源）：单独渲染后补进图集（失败也记下，不再重试）
+        try:
+            from PIL import ImageTk
+            icons[glyph] = ImageTk.PhotoImage(render_glyph(glyph, size))
+        except Exception:
+            icons[glyph] = None
+    return icons[glyph]
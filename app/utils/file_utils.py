@@ -2,64 +2,42 @@
 import os
 from pathlib import Path
 
+from .pe_utils import read_version_info
+
 def get_file_version_info(file_path):
-    """获取文件的版本信息（仅限Windows）。
+    """获取文件的版本信息。
 
-    优先使用 pywin32 的 win32api 获取；若不可用则回退到 PowerShell 调用（兼容没有 pywin32 的环境）。
-    返回类似 {'file_version': '1.2.3.4', 'product_version': '1.2.3.4', ...}，若无法读取返回 None。
+    优先用纯 Python 直接解析 PE 资源（pe_utils，内存映射、无子进程，任何系统可用）；
+    解析不到时在 Windows 上再尝试 pywin32 的 win32api。
+    返回类似 {'file_version': '1.2.3.4', 'product_version': '1.2.3.4', 'product_name': ...,
+    'description': ..., 'machine': 'x64'}，若无法读取返回 None。
     """
-    if not Path(file_path).exists() or os.name != 'nt':
+    if not Path(file_path).is_file():
         return None
 
-    # 优先尝试 win32api
+    info = read_version_info(file_path)
+    if info and len(info) > 1:
+        return info
+
+    if os.name != 'nt':
+        return info or None
+
+    # 兜底：win32api（读取固定版本号）
     try:
         import win32api
-        info = win32api.GetFileVersionInfo(str(file_path), '\\')
-        version_info = {}
-        # 解析常见的字段（不同 Windows 版本与工具可能有不同的键）
-        if 'FileVersion' in info:
-            version_info['file_version'] = info['FileVersion']
-        if 'ProductVersion' in info:
-            version_info['product_version'] = info['ProductVersion']
-        if 'ProductName' in info:
-            version_info['product_name'] = info['ProductName']
-        if 'FileDescription' in info:
-            version_info['description'] = info['FileDescription']
+        fixed = win32api.GetFileVersionInfo(str(file_path), '\\')
+        version_info = dict(info or {})
+        ms, ls = fixed.get('FileVersionMS'), fixed.get('FileVersionLS')
+        if ms is not None and ls is not None:
+            version_info['file_version'] = f"{ms >> 16}.{ms & 0xFFFF}.{ls >> 16}.{ls & 0xFFFF}"
+        ms, ls = fixed.get('ProductVersionMS'), fixed.get('ProductVersionLS')
+        if ms is not None and ls is not None:
+            version_info['product_version'] = f"{ms >> 16}.{ms & 0xFFFF}.{ls >> 16}.{ls & 0xFFFF}"
         return version_info if version_info else None
     except Exception as exc:
         print(f"读取版本信息失败(win32api): {exc}")
 
-    # 回退：使用 powershell 获取版本信息（如果系统支持）
-    try:
-        import subprocess, json, shlex
-        cmd = [
-            "powershell",
-            "-NoProfile",
-            "-Command",
-            f"(Get-Item -LiteralPath '{str(file_path).replace("'","''")}').VersionInfo | ConvertTo-Json -Compress"
-        ]
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=6)
-        if proc.returncode == 0 and proc.stdout:
-            try:
-                data = json.loads(proc.stdout)
-                version_info = {}
-                if isinstance(data, dict):
-                    if data.get('FileVersion'):
-                        version_info['file_version'] = data.get('FileVersion')
-                    if data.get('ProductVersion'):
-                        version_info['product_version'] = data.get('ProductVersion')
-                    if data.get('ProductName'):
-                        version_info['product_name'] = data.get('ProductName')
-                    if data.get('FileDescription'):
-                        version_info['description'] = data.get('FileDescription')
-                return version_info if version_info else None
-            except Exception as exc:
-                print(f"解析版本信息失败(powershell): {exc}")
-                return None
-    except Exception as exc:
-        print(f"读取版本信息失败(powershell): {exc}")
-
-    return None
+    return info or None
 
 def limit_log_file_size(log_file, max_lines=1000):
     """限制日志文件大小"""
@@ -0,0 +1,100 @@
+# File: ToolBox/app/utils/icon_cache.py
+
+from collections import OrderedDict
+
+DEFAULT_ICON_CACHE_MB = 64
+
+
+def _image_bytes(photo):
+    """PhotoImage 占用的内存估算：宽 × 高 × 4（Tk 内部按 32 位像素保存）"""
+    try:
+        return max(1, int(photo.width()) * int(photo.height()) * 4)
+    except Exception:
+        return 1
+
+
+class IconCache:
+    """
+    PhotoImage 的 LRU 缓存，按字节预算淘汰。
+
+    - 最近使用的排在末尾，超出预算时从最久未用的开始淘汰
+    - 当前视图正在显示的图标被“钉住”，不会被淘汰（begin_view() 开始新视图时清空钉住集合）；
+      钉住的图标本身超出预算时也全部保留
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget = max(0, int(budget_bytes))
+        self._items = OrderedDict()   # key -> (photo, nbytes)
+        self._pinned = set()
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        """命中时移到最近使用端并钉住"""
+        hit = self._items.get(key)
+        if hit is None:
+            return default
+        self._items.move_to_end(key)
+        self._pinned.add(key)
+        return hit[0]
+
+    def put(self, key, photo, nbytes=None):
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        nbytes = _image_bytes(photo) if nbytes is None else int(nbytes)
+        self._items[key] = (photo, nbytes)
+        self.bytes += nbytes
+        self._pinned.add(key)
+        self._evict()
+        return photo
+
+    def unpin(self, key):
+        """图标不再显示（如虚拟列表中滚出视口的格子）：恢复为可淘汰"""
+        self._pinned.discard(key)
+
+    def discard_where(self, predicate):
+        """移除 key 满足 predicate 的全部条目（含钉住的）"""
+        for key in [k for k in self._items if predicate(k)]:
+            _photo, nbytes = self._items.pop(key)
+            self.bytes -= nbytes
+            self._pinned.discard(key)
+
+    def begin_view(self):
+        """开始绘制新视图：之前钉住的图标恢复为可淘汰（新视图用到的会在 get/put 时重新钉住）"""
+        self._pinned = set()
+        self._evict()
+
+    def _evict(self):
+        if self.bytes <= self.budget:
+            return
+        for key in list(self._items):
+            if self.bytes <= self.budget:
+                break
+            if key in self._pinned:
+                continue
+            _photo, nbytes = self._items.pop(key)
+            self.bytes -= nbytes
+
+
+def get_icon_cache(app):
+    """获取 app 上的 IconCache；预算取自 [General] icon_cache_mb"""
+    cache = getattr(app, "icon_cache", None)
+    if isinstance(cache, IconCache):
+        return cache
+
+    try:
+        mb = float(app.config["General"].get("icon_cache_mb", str(DEFAULT_ICON_CACHE_MB)))
+    except Exception:
+        mb = DEFAULT_ICON_CACHE_MB
+    cache = IconCache(max(1.0, mb) * 1024 * 1024)
+    try:
+        app.icon_cache = cache
+    except Exception:
+        pass
+    return cache
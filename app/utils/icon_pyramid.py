@@ -0,0 +1,188 @@
+# File: ToolBox/app/utils/icon_pyramid.py
+
+import io
+import os
+import threading
+from collections import OrderedDict
+
+# 多分辨率图标：每个图标来源只解码一次，保存原生帧（.ico / exe 图标组中的各尺寸）
+# 以及由最大帧逐级减半得到的 mipmap；任意显示尺寸都从最接近（不小于它）的一级缩放得到，
+# 缩放倍数不超过 2，调整图标大小时无需重新打开/解码来源文件。
+
+MIN_LEVEL = 16
+# 最大一级：图标大小滑块的上限（display_manager 的 ttk.Scale），更大的原生帧缩到这一级后丢弃
+MAX_LEVEL = 96
+# 内存中保留的图标金字塔总字节数（RGBA）；可由 [General] icon_pyramid_mb 调整
+DEFAULT_PYRAMID_MB = 32
+
+
+class IconPyramid:
+    """一个图标来源的各级 RGBA Image（正方形，按边长升序）"""
+
+    def __init__(self, images):
+        by_size = {}
+        for img in images:
+            img = _square_rgba(img)
+            by_size.setdefault(img.width, img)
+        larger = [edge for edge in by_size if edge > MAX_LEVEL]
+        if larger:
+            # 只保留到 MAX_LEVEL：没有该尺寸的原生帧时由最接近的更大帧缩放得到
+            from PIL import Image
+            if MAX_LEVEL not in by_size:
+                by_size[MAX_LEVEL] = by_size[min(larger)].resize((MAX_LEVEL, MAX_LEVEL), Image.LANCZOS)
+            for edge in larger:
+                del by_size[edge]
+        if by_size:
+            # 最大帧逐级减半补齐 mipmap（已有同尺寸原生帧时用原生帧）
+            from PIL import Image
+            top = by_size[max(by_size)]
+            edge = top.width // 2
+            src = top
+            while edge >= MIN_LEVEL:
+                if edge not in by_size:
+                    by_size[edge] = src.resize((edge, edge), Image.LANCZOS)
+                src = by_size[edge]
+                edge //= 2
+        self.levels = [by_size[k] for k in sorted(by_size)]
+        self.nbytes = sum(img.width * img.height * 4 for img in self.levels)
+
+    def __bool__(self):
+        return bool(self.levels)
+
+    def level_for(self, size):
+        """不小于 size 的最小一级；都比 size 小时取最大一级"""
+        size = int(size)
+        for img in self.levels:
+            if img.width >= size:
+                return img
+        return self.levels[-1]
+
+    def derive(self, size):
+        """size×size 的 RGBA Image（新对象，调用方可随意修改）"""
+        from PIL import Image
+
+        size = int(size)
+        img = self.level_for(size)
+        if img.width == size:
+            return img.copy()
+        return img.resize((size, size), Image.LANCZOS)
+
+
+def _square_rgba(img):
+    img = img.convert('RGBA')
+    if img.width != img.height:
+        from PIL import Image
+        edge = max(img.width, img.height)
+        canvas = Image.new('RGBA', (edge, edge), (0, 0, 0, 0))
+        canvas.paste(img, ((edge - img.width) // 2, (edge - img.height) // 2))
+        img = canvas
+    return img
+
+
+def _open_frames(data_or_path):
+    """打开图像；.ico 返回其中全部尺寸的帧，其余格式返回单帧"""
+    from PIL import Image
+
+    img = Image.open(data_or_path)
+    frames = []
+    if img.format == 'ICO':
+        for size in sorted(img.ico.sizes()):
+            try:
+                frames.append(img.ico.getimage(size))
+            except Exception:
+                continue
+    if not frames:
+        img.load()
+        frames.append(img)
+    return frames
+
+
+def build_pyramid(source):
+    """由图标来源（.ico/.png 图标文件或 exe）构建 IconPyramid；没有图标返回 None"""
+    source = str(source)
+    if os.path.splitext(source)[1].lower() == '.exe':
+        from .pe_utils import read_icon_frames
+
+        images = []
+        # 同尺寸帧取色深最高的一帧
+        frames = sorted(read_icon_frames(source), key=lambda fd: (-fd[0]["width"], -fd[0]["bit_count"]))
+        seen = set()
+        for frame, ico in frames:
+            if frame["width"] in seen:
+                continue
+            try:
+                images.extend(_open_frames(io.BytesIO(ico))[-1:])
+                seen.add(frame["width"])
+            except Exception as e:
+                print(f"解码 exe 图标帧失败: {e}")
+    else:
+        images = _open_frames(source)
+
+    pyramid = IconPyramid(images)
+    return pyramid if pyramid else None
+
+
+class _PyramidCache:
+    """进程内的图标金字塔缓存：key 为 (规范化路径, 修改时间, 大小)，按字节预算 LRU 淘汰；线程安全"""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.lock = threading.Lock()
+        self._items = OrderedDict()
+        self.bytes = 0
+
+    def set_budget(self, budget):
+        with self.lock:
+            self.budget = budget
+            self._trim()
+
+    def _trim(self):
+        while self.bytes > self.budget and len(self._items) > 1:
+            _key, old = self._items.popitem(last=False)
+            self.bytes -= old.nbytes
+
+    def get(self, source):
+        st = os.stat(source)
+        key = (os.path.normcase(os.path.abspath(str(source))), st.st_mtime_ns, st.st_size)
+        with self.lock:
+            pyramid = self._items.get(key)
+            if pyramid is not None:
+                self._items.move_to_end(key)
+                return pyramid
+
+        pyramid = build_pyramid(source)
+        if pyramid is None:
+            return None
+        with self.lock:
+            if key not in self._items:
+                self._items[key] = pyramid
+                self.bytes += pyramid.nbytes
+                self._trim()
+        return pyramid
+
+
+_cache = _PyramidCache(DEFAULT_PYRAMID_MB * 1024 * 1024)
+
+
+def configure_pyramid_cache(app):
+    """按 [General] icon_pyramid_mb 设置图标金字塔缓存的内存预算（启动时在 Tk 线程调用）"""
+    try:
+        mb = float(app.config["General"].get("icon_pyramid_mb", str(DEFAULT_PYRAMID_MB)))
+    except Exception:
+        mb = DEFAULT_PYRAMID_MB
+    _cache.set_budget(max(1.0, mb) * 1024 * 1024)
+
+
+def get_pyramid(source):
+    """取图标来源的 IconPyramid（同一来源、未修改时只解码一次）；没有图标或读取失败返回 None"""
+    try:
+        return _cache.get(source)
+    except Exception as e:
+        print(f"加载图标失败: {source} -> {e}")
+        return None
+
+
+def load_icon_at(source, size):
+    """图标来源在 size×size 下的 RGBA Image；失败返回 None"""
+    pyramid = get_pyramid(source)
+    return pyramid.derive(size) if pyramid is not None else None
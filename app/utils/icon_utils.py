@@ -5,6 +5,9 @@ import sys
 import base64
 from pathlib import Path
 
+from .icon_cache import get_icon_cache
+from .image_thumbnail import IMAGE_EXTS
+
 # Windows 图标提取模块
 try:
     import win32ui
@@ -15,93 +18,250 @@ except ImportError:
     win32ui = win32gui = win32con = shell = shellcon = None
 
 
+def _icon_source(tool_path):
+    """图标来源：同名 .ico / .png（自定义图标）优先，其次是 exe / 图片本身；都没有返回 None"""
+    tool_path = Path(tool_path)
+    for custom in (tool_path.with_suffix('.ico'), tool_path.with_suffix('.png')):
+        if custom != tool_path and custom.exists():
+            return custom
+    if tool_path.suffix.lower() == '.exe' or tool_path.suffix.lower() in IMAGE_EXTS:
+        return tool_path
+    return None
+
+
+def load_icon_image(icon_path, size=48):
+    """加载图标文件（png/ico）为 size×size 的 RGBA Image（经多分辨率图标缓存）；失败返回 None"""
+    from .icon_pyramid import load_icon_at
+    return load_icon_at(icon_path, size)
+
+
+def render_tool_icon_image(tool_path, size=48):
+    """
+    解码工具的文件图标（自定义图标 / exe 内置图标），返回 (RGBA Image 或 None, 来源路径或 None)
+    """
+    source = _icon_source(tool_path)
+    if source is None:
+        return None, None
+    if Path(source).suffix.lower() == '.exe':
+        return load_exe_icon_image(source, size=size), source
+    return load_icon_image(source, size=size), source
+
+
+def render_image_thumbnail(self, image_path, size=48):
+    """图片类工具（.png/.jpg/.jpeg）的缩略图：在缩略图进程池中缩小解码，返回 RGBA Image 或 None"""
+    from ..services.thumbnail_pool import get_thumbnail_pool
+    try:
+        width, height, rgba = get_thumbnail_pool(self).render(image_path, size)
+        from PIL import Image
+        return Image.frombytes('RGBA', (int(width), int(height)), rgba)
+    except Exception as e:
+        print(f"生成缩略图失败: {image_path} -> {e}")
+        return None
+
+
+def _photo_from_rgba(width, height, rgba):
+    from PIL import Image, ImageTk
+    return ImageTk.PhotoImage(Image.frombytes('RGBA', (int(width), int(height)), rgba))
+
+
+def _file_icon_key(tool_path, size):
+    return ("file", os.path.normcase(os.path.abspath(str(tool_path))), int(size))
+
+
+def _tool_stamp(tool_path):
+    """工具文件的 (大小, 修改时间)，内存缓存校验用；文件不存在返回 None"""
+    try:
+        st = os.stat(tool_path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime
+
+
+def tool_stamp(tool):
+    """工具 dict 上目录列举时记下的 (大小, 修改时间)（与 _tool_stamp 同值）；没有时返回 None"""
+    size, mtime = tool.get("size"), tool.get("mtime")
+    if isinstance(size, int) and isinstance(mtime, (int, float)):
+        return size, mtime
+    return None
+
+
+def peek_file_icon(self, tool_path, size, stamp=None):
+    """
+    只查内存缓存（不解码），须在 Tk 线程调用。
+    stamp 为工具 dict 的 tool_stamp()：按它校验，不访问文件；不传时 stat 一次工具文件。
+    返回 (是否命中, PhotoImage 或 None)；命中且为 None 表示“已确认没有文件图标”
+    """
+    hit = get_icon_cache(self).get(_file_icon_key(tool_path, size))
+    if hit is None:
+        return False, None
+    if hit[0] == (stamp if stamp is not None else _tool_stamp(tool_path)):
+        return True, hit[1]
+    return False, None
+
+
+def forget_dir_file_icons(self, dir_paths):
+    """
+    这些目录的条目有增删（如放入了同名 .ico/.png）：丢弃其中工具的内存图标，
+    下次显示时重新解析图标来源（须在 Tk 线程调用）
+    """
+    dirs = {os.path.normcase(os.path.abspath(str(d))) for d in dir_paths or ()}
+    if dirs:
+        get_icon_cache(self).discard_where(
+            lambda key: isinstance(key, tuple) and key[0] == "file" and os.path.dirname(key[1]) in dirs
+        )
+
+
+def release_file_icon(self, tool_path, size):
+    """文件图标不再显示：取消钉住，允许被内存缓存淘汰"""
+    get_icon_cache(self).unpin(_file_icon_key(tool_path, size))
+
+
+def decode_file_icon(self, tool_path, size, persist=True, native_first=None):
+    """
+    读取/解码文件图标为 RGBA 字节（可在后台线程调用，不创建任何 Tk 对象）：
+    先查持久化缩略图缓存，未命中时解码并写回（persist=False 时不写回，如拖动图标大小时的中间尺寸）。
+    exe 默认纯 Python 解析 PE 资源；native_first（[General] icon_fast_path，后台线程调用时由
+    Tk 线程读好传入，None 表示在此读取配置）时 Windows 上先用 ctypes 向系统取图标。
+    返回 (工具文件的 (大小, 修改时间), width, height, rgba)；width 为 0 表示没有文件图标
+    """
+    from ..services.thumbnail_store import get_thumbnail_store
+
+    store = get_thumbnail_store(self)
+    stamp = _tool_stamp(tool_path)
+    # 每次都重新解析图标来源（两次 exists），新放入的同名 .ico/.png 使旧缓存失效
+    source = _icon_source(tool_path)
+    if store is not None:
+        hit = store.get(tool_path, size, source)
+        if hit is not None:
+            width, height, rgba, _source = hit
+            return stamp, width, height, rgba
+
+    if native_first is None:
+        native_first = _native_icon_first(self)
+    img = None
+    if native_first and source is not None and Path(source).suffix.lower() == '.exe':
+        img = _native_exe_icon_image(source, size=size)
+    if img is None:
+        if source == Path(tool_path) and Path(tool_path).suffix.lower() in IMAGE_EXTS:
+            img = render_image_thumbnail(self, tool_path, size=size)
+        else:
+            img, source = render_tool_icon_image(tool_path, size=size)
+    if store is not None and persist:
+        try:
+            if img is None:
+                # 负缓存：来源不变时不再探测/解析
+                store.put(tool_path, size, source or tool_path, 0, 0, b"")
+            else:
+                store.put(tool_path, size, source, img.width, img.height, img.tobytes())
+        except Exception as e:
+            print(f"写入图标缓存失败: {e}")
+    if img is None:
+        return stamp, 0, 0, b""
+    return stamp, img.width, img.height, img.tobytes()
+
+
+def remember_file_icon(self, tool_path, size, decoded):
+    """由 decode_file_icon 的结果创建 PhotoImage 并放入内存缓存（须在 Tk 线程调用）"""
+    stamp, width, height, rgba = decoded
+    photo = _photo_from_rgba(width, height, rgba) if width else None
+    nbytes = int(width) * int(height) * 4 if photo is not None else 64
+    get_icon_cache(self).put(_file_icon_key(tool_path, size), (stamp, photo), nbytes)
+    return photo
+
+
+def _cached_file_icon(self, tool_path, size):
+    """
+    取文件图标，两级缓存：
+    1) 内存 LRU（IconCache，按工具文件的大小/修改时间校验）
+    2) 持久化缩略图缓存：命中时直接由 RGBA 字节还原 PhotoImage；未命中时解码并写回
+    返回 PhotoImage，或 None（没有文件图标，调用方用类型图标）
+    """
+    hit, photo = peek_file_icon(self, tool_path, size)
+    if hit:
+        return photo
+    return remember_file_icon(self, tool_path, size, decode_file_icon(self, tool_path, size))
+
+
 def get_tool_icon(self, tool_path, tool_name, size=48):
-    """获取工具图标，支持指定大小（px）。优先自定义图标 -> exe 内置图标 -> 按类型 emoji 图标"""
-    tool_dir = Path(tool_path).parent
-    tool_stem = Path(tool_path).stem
-
-    # 自定义图标：同名 .ico / .png
-    custom_ico = tool_dir / f"{tool_stem}.ico"
-    custom_png = tool_dir / f"{tool_stem}.png"
-    if custom_ico.exists():
-        return create_icon_photo(self, custom_ico, size=size)
-    if custom_png.exists():
-        return create_icon_photo(self, custom_png, size=size)
-
-    # exe：提取原生图标
-    if Path(tool_path).suffix.lower() == '.exe':
-        icon = extract_exe_icon(self, tool_path, size=size)
+    """
+    获取工具图标，支持指定大小（px）。优先自定义图标 -> exe 内置图标 -> 按类型 emoji 图标。
+    文件图标经持久化缩略图缓存（ToolBox.thumbs.db），冷启动不再重新提取/解码。
+    """
+    try:
+        icon = _cached_file_icon(self, tool_path, size)
         if icon:
             return icon
+    except Exception as e:
+        print(f"读取工具图标失败: {e}")
+    return get_fallback_icon(self, tool_path, size=size)
+
+
+def get_fallback_icon(self, tool_path, size=48):
+    """没有文件图标时的图标：Windows 上先向系统取 exe 图标，再按类型 emoji"""
+    # exe 中读不到图标资源：Windows 上再向系统取一次（icon_fast_path 时解码阶段已先取过）
+    if Path(tool_path).suffix.lower() == '.exe' and os.name == 'nt' and not _native_icon_first(self):
+        icon = _extract_exe_icon_native(self, tool_path, size=size)
+        if icon:
+            return icon
+    return get_type_icon(self, tool_path, size=size)
+
 
-    # fallback：按类型 emoji（若 Pillow 可用则渲染成 PhotoImage）
+def get_type_icon(self, tool_path, size=48):
+    """按文件类型的图标（emoji 渲染或图标文件）；也用作异步加载文件图标时的占位"""
     ext = Path(tool_path).suffix.lower()
     from .icons import get_icon_for_filetype
     file_type = get_file_type_category(ext)
     fallback = get_icon_for_filetype(file_type, ext)
 
     if isinstance(fallback, str):
-        try:
-            from PIL import Image, ImageTk, ImageDraw, ImageFont
-            img = Image.new('RGBA', (size, size), (255, 255, 255, 0))
-            draw = ImageDraw.Draw(img)
-            font_size = max(12, int(size * 0.45))
-            try:
-                font = ImageFont.truetype("seguiemj.ttf", font_size)
-            except Exception:
-                font = ImageFont.load_default()
-            try:
-                bbox = draw.textbbox((0, 0), fallback, font=font)
-                w = bbox[2] - bbox[0]
-                h = bbox[3] - bbox[1]
-            except Exception:
-                w, h = draw.textsize(fallback, font=font)
-
-            draw.text(((size - w) / 2, (size - h) / 2), fallback, font=font, fill=(0, 0, 0, 255))
-            photo = ImageTk.PhotoImage(img)
-
-            if not hasattr(self, 'icon_cache'):
-                self.icon_cache = {}
-            key = f"emoji:{file_type}:{size}"
-            self.icon_cache[key] = photo
-            return photo
-        except Exception:
-            # Pillow 不可用或渲染失败，返回 None 由调用端回退到文本或其他显示方式
-            return None
-    else:
-        return create_icon_photo(self, fallback, size=size)
+        # 预渲染的类型图标图集（Pillow 不可用时返回 None，由调用端回退到文本显示）
+        from .emoji_atlas import get_emoji_icon
+        return get_emoji_icon(self, fallback, size=size)
+    return create_icon_photo(self, fallback, size=size)
 
 
 def create_icon_photo(self, icon_path, size=48):
     """加载图标文件（png/ico）并返回 Tk PhotoImage（带缓存）"""
-    if not hasattr(self, 'icon_cache'):
-        self.icon_cache = {}
-
+    cache = get_icon_cache(self)
     key = f"{str(icon_path)}:{size}"
-    if key in self.icon_cache:
-        return self.icon_cache[key]
+    if key in cache:
+        return cache.get(key)
 
+    img = load_icon_image(icon_path, size=size)
+    if img is None:
+        return None
     try:
-        from PIL import Image, ImageTk
-        img = Image.open(icon_path)
-        img = img.convert('RGBA')
-        img = img.resize((int(size), int(size)), Image.LANCZOS)
-        photo = ImageTk.PhotoImage(img)
-        self.icon_cache[key] = photo
-        return photo
+        from PIL import ImageTk
+        return cache.put(key, ImageTk.PhotoImage(img))
     except Exception as e:
         print(f"加载自定义图标失败: {e}")
         return None
 
 
-def extract_exe_icon(self, exe_path, size=48):
-    """从 exe 文件中提取 Windows 原生图标并返回 PhotoImage。
+def _native_icon_first(self) -> bool:
+    """[General] icon_fast_path = 1：Windows 上优先走 ctypes（SHGetFileInfoW + DrawIconEx）"""
+    try:
+        return os.name == 'nt' and self.config["General"].get("icon_fast_path", "0") == "1"
+    except Exception:
+        return False
+
+
+def load_exe_icon_image(exe_path, size=48):
+    """
+    纯 Python 读取 exe 内置图标（RT_GROUP_ICON/RT_ICON）：图标组的全部帧解码一次进多分辨率图标缓存，
+    再从最接近 size 的一级缩放为 size×size 的 RGBA Image；没有图标资源或 Pillow 不可用时返回 None
+    """
+    from .icon_pyramid import load_icon_at
+    return load_icon_at(exe_path, size)
+
+
+def _native_exe_icon_bgra(exe_path, size=48):
+    """ctypes 向系统取 exe 图标并画到 32bpp DIB 上，返回 size×size 的 BGRA 字节（仅 Windows，不创建 Tk 对象）。
 
     修复点：
     - 旧实现用 CreateCompatibleBitmap，位深不保证 32bpp，读取 BGRA 时经常失败
     - 新实现强制使用 CreateDIBSection(32bpp) + DrawIconEx，稳定得到 BGRA
     - 优先用 ctypes + SHGetFileInfoW（不依赖 pywin32）
-    - 若 Pillow 可用：返回带 alpha 的 PhotoImage；否则返回 PPM PhotoImage（无 alpha）
     """
     if os.name != 'nt':
         return None
@@ -109,7 +269,6 @@ def extract_exe_icon(self, exe_path, size=48):
     try:
         import ctypes
         from ctypes import wintypes
-        from tkinter import PhotoImage
 
         shell32 = ctypes.windll.shell32
         user32 = ctypes.windll.user32
@@ -200,7 +359,37 @@ def extract_exe_icon(self, exe_path, size=48):
         gdi32.DeleteDC(hdc_mem)
         user32.ReleaseDC(0, hdc_screen)
         user32.DestroyIcon(hicon)
+        return raw
+
+    except Exception as e:
+        print(f'提取 exe 图标失败(ctypes): {e}')
+        return None
+
+
+def _native_exe_icon_image(exe_path, size=48):
+    """系统 exe 图标的 RGBA Image（可在后台线程调用）；非 Windows / 失败 / Pillow 不可用时返回 None"""
+    raw = _native_exe_icon_bgra(exe_path, size=size)
+    if raw is None:
+        return None
+    try:
+        from PIL import Image
+        return Image.frombuffer('RGBA', (int(size), int(size)), raw, 'raw', 'BGRA', 0, 1)
+    except Exception:
+        return None
+
+
+def _extract_exe_icon_native(self, exe_path, size=48):
+    """系统 exe 图标的 PhotoImage（仅 Windows，须在 Tk 线程调用）。
+    若 Pillow 可用：返回带 alpha 的 PhotoImage；否则返回 PPM PhotoImage（无 alpha）
+    """
+    raw = _native_exe_icon_bgra(exe_path, size=size)
+    if raw is None:
+        return None
+
+    try:
+        from tkinter import PhotoImage
 
+        width = height = int(size)
         # 优先 Pillow 保留 alpha
         try:
             from PIL import Image, ImageTk  # type: ignore
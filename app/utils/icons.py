@@ -1,31 +1,42 @@
 # File: ToolBox/app/utils/icons.py
+
+# 类型 → 图标符号
+ICON_MAP = {
+    '压缩包': '📦',
+    '可执行文件': '⚙️',
+    '脚本文件': '📜',
+    '注册表': '🔧',
+    '快捷方式': '🔗',
+    '文档': '📄',
+    '其他': '📎'
+}
+
+# 扩展名 → 图标符号（优先于类型）
+SPECIAL_ICONS = {
+    '.zip': '🗜️',
+    '.rar': '🗜️',
+    '.7z': '🗜️',
+    '.pdf': '📕',
+    '.doc': '📘',
+    '.xls': '📗',
+    '.ppt': '📙',
+    '.jpg': '🖼️',
+    '.png': '🖼️',
+    '.mp3': '🎵',
+    '.mp4': '🎬'
+}
+
+DEFAULT_ICON = '📎'
+
+
 def get_icon_for_filetype(file_type, extension):
     """根据文件类型获取图标符号"""
-    icon_map = {
-        '压缩包': '📦',
-        '可执行文件': '⚙️',
-        '脚本文件': '📜',
-        '注册表': '🔧',
-        '快捷方式': '🔗',
-        '文档': '📄',
-        '其他': '📎'
-    }
-    
-    special_icons = {
-        '.zip': '🗜️',
-        '.rar': '🗜️',
-        '.7z': '🗜️',
-        '.pdf': '📕',
-        '.doc': '📘',
-        '.xls': '📗',
-        '.ppt': '📙',
-        '.jpg': '🖼️',
-        '.png': '🖼️',
-        '.mp3': '🎵',
-        '.mp4': '🎬'
-    }
-    
-    if extension in special_icons:
-        return special_icons[extension]
-    
-    return icon_map.get(file_type, '📎')
\ No newline at end of file
+    if extension in SPECIAL_ICONS:
+        return SPECIAL_ICONS[extension]
+
+    return ICON_MAP.get(file_type, DEFAULT_ICON)
+
+
+def all_filetype_icons():
+    """get_icon_for_filetype 可能返回的全部图标符号（去重，顺序固定）"""
+    return tuple(dict.fromkeys([*ICON_MAP.values(), *SPECIAL_ICONS.values(), DEFAULT_ICON]))
@@ -0,0 +1,28 @@
+# File: ToolBox/app/utils/image_thumbnail.py
+
+# 图片类工具（.png/.jpg/.jpeg）的缩略图：按目标尺寸缩小解码，不解码整张原图。
+# make_thumbnail 只依赖 Pillow、不创建 Tk 对象，可在子进程中执行。
+
+IMAGE_EXTS = frozenset({".png", ".jpg", ".jpeg"})
+
+
+def make_thumbnail(image_path, size):
+    """
+    生成 size×size 的透明底 RGBA 缩略图（等比缩放后居中）。
+    - JPEG：draft 模式让解码器直接按 1/2、1/4、1/8 缩小解码
+    - 其余格式：thumbnail(reducing_gap) 先用 reduce() 整数倍缩小，再做一次高质量缩放
+    返回 (width, height, rgba 字节)；无法解码时抛出异常
+    """
+    from PIL import Image, ImageOps
+
+    size = int(size)
+    with Image.open(image_path) as img:
+        if img.format == "JPEG":
+            # 保留 2 倍余量给最后的 LANCZOS 缩放
+            img.draft("RGB", (size * 2, size * 2))
+        img.thumbnail((size, size), Image.LANCZOS, reducing_gap=2.0)
+        img = ImageOps.exif_transpose(img).convert("RGBA")
+
+    thumb = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    thumb.paste(img, ((size - img.width) // 2, (size - img.height) // 2))
+    return size, size, thumb.tobytes()
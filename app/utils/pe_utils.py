@@ -0,0 +1,314 @@
+# File: ToolBox/app/utils/pe_utils.py
+
+import mmap
+import struct
+
+# 只读解析 PE 文件（exe/dll）：机器类型 + 资源节中的 VS_VERSIONINFO / 图标。
+# 纯 Python + mmap，不依赖 Windows API，Linux 下同样可用。
+
+RT_ICON = 3
+RT_GROUP_ICON = 14
+RT_VERSION = 16
+_FIXED_SIGNATURE = 0xFEEF04BD
+
+MACHINE_NAMES = {
+    0x014C: "x86",
+    0x8664: "x64",
+    0xAA64: "ARM64",
+    0x01C0: "ARM",
+    0x01C4: "ARM",
+    0x0200: "IA64",
+}
+
+# StringFileInfo 中的键 → 返回 dict 的键（与 get_file_version_info 原有字段一致）
+_STRING_KEYS = {
+    "FileVersion": "file_version",
+    "ProductVersion": "product_version",
+    "ProductName": "product_name",
+    "FileDescription": "description",
+}
+
+
+class PEFormatError(ValueError):
+    """不是合法的 PE 文件，或结构越界"""
+
+
+def _u16(buf, off):
+    return struct.unpack_from("<H", buf, off)[0]
+
+
+def _u32(buf, off):
+    return struct.unpack_from("<I", buf, off)[0]
+
+
+def _align4(n):
+    return (n + 3) & ~3
+
+
+class PEImage:
+    """PE 头与节表；只做版本信息/图标读取所需的最小解析"""
+
+    def __init__(self, buf):
+        self.buf = buf
+        size = len(buf)
+        if size < 0x40 or buf[:2] != b"MZ":
+            raise PEFormatError("缺少 MZ 头")
+        pe = _u32(buf, 0x3C)
+        if pe + 24 > size or buf[pe:pe + 4] != b"PE\0\0":
+            raise PEFormatError("缺少 PE 签名")
+
+        coff = pe + 4
+        self.machine = _u16(buf, coff)
+        n_sections = _u16(buf, coff + 2)
+        opt_size = _u16(buf, coff + 16)
+        opt = coff + 20
+        if opt + opt_size > size:
+            raise PEFormatError("可选头越界")
+
+        magic = _u16(buf, opt) if opt_size >= 2 else 0
+        if magic == 0x10B:        # PE32
+            dirs_count_off, dirs_off = 92, 96
+        elif magic == 0x20B:      # PE32+
+            dirs_count_off, dirs_off = 108, 112
+        else:
+            raise PEFormatError(f"未知的可选头类型: {magic:#x}")
+
+        self.data_dirs = []
+        if opt_size >= dirs_off:
+            count = min(_u32(buf, opt + dirs_count_off), (opt_size - dirs_off) // 8, 16)
+            for i in range(count):
+                self.data_dirs.append(struct.unpack_from("<II", buf, opt + dirs_off + i * 8))
+
+        self.sections = []
+        sec = opt + opt_size
+        for i in range(n_sections):
+            off = sec + i * 40
+            if off + 40 > size:
+                break
+            vsize, vaddr, raw_size, raw_ptr = struct.unpack_from("<IIII", buf, off + 8)
+            self.sections.append((vaddr, max(vsize, raw_size), raw_ptr, raw_size))
+
+    @property
+    def machine_name(self):
+        return MACHINE_NAMES.get(self.machine, f"{self.machine:#06x}")
+
+    def rva_to_offset(self, rva):
+        for vaddr, vsize, raw_ptr, raw_size in self.sections:
+            if vaddr <= rva < vaddr + vsize:
+                delta = rva - vaddr
+                if delta >= raw_size:
+                    break
+                return raw_ptr + delta
+        raise PEFormatError(f"RVA 不在任何节内: {rva:#x}")
+
+    # ==================== 资源 ====================
+
+    def resource_root(self):
+        """资源目录在文件中的偏移；没有资源节返回 None"""
+        if len(self.data_dirs) <= 2:
+            return None
+        rva, size = self.data_dirs[2]
+        if not rva or not size:
+            return None
+        return self.rva_to_offset(rva)
+
+    def _dir_entries(self, root, off):
+        """资源目录的条目：[(id 或 名称, 是否子目录, 相对 root 的偏移)]"""
+        buf = self.buf
+        named, ids = _u16(buf, off + 12), _u16(buf, off + 14)
+        entries = []
+        for i in range(named + ids):
+            e = off + 16 + i * 8
+            if e + 8 > len(buf):
+                break
+            name, target = struct.unpack_from("<II", buf, e)
+            if name & 0x80000000:
+                p = root + (name & 0x7FFFFFFF)
+                n = _u16(buf, p)
+                name = bytes(buf[p + 2:p + 2 + n * 2]).decode("utf-16-le", "replace")
+            entries.append((name, bool(target & 0x80000000), target & 0x7FFFFFFF))
+        return entries
+
+    def iter_resources(self, res_type):
+        """
+        逐个 yield 某类型资源：(名称/ID, 语言, 数据在文件中的偏移, 大小)。
+        名称与语言按资源目录中的顺序（即 ID 升序）。
+        """
+        root = self.resource_root()
+        if root is None:
+            return
+        for type_id, is_dir, off in self._dir_entries(root, root):
+            if type_id != res_type or not is_dir:
+                continue
+            for name, name_is_dir, name_off in self._dir_entries(root, root + off):
+                if not name_is_dir:
+                    continue
+                for lang, lang_is_dir, data_off in self._dir_entries(root, root + name_off):
+                    if lang_is_dir:
+                        continue
+                    rva, size = struct.unpack_from("<II", self.buf, root + data_off)
+                    try:
+                        yield name, lang, self.rva_to_offset(rva), size
+                    except PEFormatError:
+                        continue
+
+    def read_resource(self, res_type, name=None):
+        """读取某类型（可指定名称/ID）的第一个资源数据；没有返回 None"""
+        for res_name, _lang, off, size in self.iter_resources(res_type):
+            if name is not None and res_name != name:
+                continue
+            if off + size > len(self.buf):
+                raise PEFormatError("资源数据越界")
+            return bytes(self.buf[off:off + size])
+        return None
+
+
+# ==================== VS_VERSIONINFO ====================
+
+def _read_wstr(buf, off, end):
+    """读取以 NUL 结尾的 UTF-16LE 字符串，返回 (字符串, NUL 之后的偏移)"""
+    p = off
+    while p + 1 < end:
+        if buf[p] == 0 and buf[p + 1] == 0:
+            return buf[off:p].decode("utf-16-le", "replace"), p + 2
+        p += 2
+    return buf[off:end].decode("utf-16-le", "replace"), end
+
+
+def _iter_blocks(buf, off, end):
+    """
+    逐个 yield 版本资源中的块：(key, value 偏移, value 字节数, 是否文本, 子块开始, 块结束)。
+    所有版本信息结构（VS_VERSIONINFO / StringFileInfo / StringTable / String / Var）格式相同。
+    """
+    while off + 6 <= end:
+        length, value_len, value_type = struct.unpack_from("<HHH", buf, off)
+        if length < 6:
+            return
+        block_end = min(off + length, end)
+        key, p = _read_wstr(buf, off + 6, block_end)
+        value_off = _align4(p)
+        # 文本值的长度按 UTF-16 字符计
+        value_bytes = value_len * 2 if value_type == 1 else value_len
+        value_bytes = max(0, min(value_bytes, block_end - value_off))
+        children = _align4(value_off + value_bytes)
+        yield key, value_off, value_bytes, value_type == 1, children, block_end
+        off = _align4(block_end)
+
+
+def parse_version_resource(data):
+    """
+    解析 RT_VERSION 资源数据，返回 dict：
+    file_version / product_version / product_name / description（字符串，可能缺失）。
+    StringFileInfo 里没有版本字符串时，用 VS_FIXEDFILEINFO 的数字版本补上。
+    """
+    info = {}
+    fixed = {}
+    for key, v_off, v_len, _text, children, end in _iter_blocks(data, 0, len(data)):
+        if key != "VS_VERSION_INFO":
+            break
+        if v_len >= 52 and _u32(data, v_off) == _FIXED_SIGNATURE:
+            fv_ms, fv_ls, pv_ms, pv_ls = struct.unpack_from("<IIII", data, v_off + 8)
+            fixed["file_version"] = f"{fv_ms >> 16}.{fv_ms & 0xFFFF}.{fv_ls >> 16}.{fv_ls & 0xFFFF}"
+            fixed["product_version"] = f"{pv_ms >> 16}.{pv_ms & 0xFFFF}.{pv_ls >> 16}.{pv_ls & 0xFFFF}"
+
+        for c_key, _cv, _cl, _ct, c_children, c_end in _iter_blocks(data, children, end):
+            if c_key != "StringFileInfo":
+                continue
+            # 可能有多个语言的 StringTable：按出现顺序，先出现的优先
+            for _table, _tv, _tl, _tt, t_children, t_end in _iter_blocks(data, c_children, c_end):
+                for s_key, s_off, s_len, _st, _sc, _se in _iter_blocks(data, t_children, t_end):
+                    field = _STRING_KEYS.get(s_key)
+                    if field is None or field in info:
+                        continue
+                    value, _p = _read_wstr(data, s_off, s_off + s_len)
+                    value = value.strip()
+                    if value:
+                        info[field] = value
+        break
+
+    for k, v in fixed.items():
+        info.setdefault(k, v)
+    return info
+
+
+def read_version_info(file_path):
+    """
+    读取 PE 文件的版本信息与机器类型（内存映射，只读所需的几个页）。
+    返回 {'file_version', 'product_version', 'product_name', 'description', 'machine'} 中存在的键；
+    不是 PE 文件（如 .msi）或读取失败时返回 None。
+    """
+    try:
+        with open(file_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                pe = PEImage(buf)
+                info = {}
+                data = pe.read_resource(RT_VERSION)
+                if data:
+                    info = parse_version_resource(data)
+                info["machine"] = pe.machine_name
+                return info
+    except (OSError, ValueError, struct.error):
+        # ValueError 包含 PEFormatError 与空文件无法映射的情况
+        return None
+
+
+# ==================== 图标（RT_GROUP_ICON / RT_ICON） ====================
+
+def parse_group_icon(data):
+    """
+    解析 RT_GROUP_ICON（GRPICONDIR）：返回帧列表
+    [{'width', 'height', 'colors', 'planes', 'bit_count', 'size', 'id'}]（宽高 0 表示 256）
+    """
+    if len(data) < 6:
+        return []
+    _reserved, kind, count = struct.unpack_from("<HHH", data, 0)
+    if kind != 1:
+        return []
+    frames = []
+    for i in range(count):
+        off = 6 + i * 14
+        if off + 14 > len(data):
+            break
+        w, h, colors, _r, planes, bit_count, size, res_id = struct.unpack_from("<BBBBHHIH", data, off)
+        frames.append({
+            "width": w or 256,
+            "height": h or 256,
+            "colors": colors,
+            "planes": planes,
+            "bit_count": bit_count,
+            "size": size,
+            "id": res_id,
+        })
+    return frames
+
+
+def build_ico(frame, data):
+    """把单个 RT_ICON 帧包装成只含一帧的 .ico 文件字节（PNG 帧与 DIB 帧均可，交给 Pillow 解码）"""
+    w, h = frame["width"], frame["height"]
+    header = struct.pack("<HHH", 0, 1, 1)
+    entry = struct.pack(
+        "<BBBBHHII",
+        0 if w >= 256 else w, 0 if h >= 256 else h, frame["colors"], 0,
+        frame["planes"], frame["bit_count"], len(data), 6 + 16,
+    )
+    return header + entry + data
+
+
+def read_icon_frames(file_path):
+    """
+    读取 PE 文件第一个图标组中的全部帧（构建多分辨率图标用）。
+    返回 [(帧信息, 单帧 .ico 字节)]；没有图标资源或读取失败返回 []
+    """
+    try:
+        with open(file_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                pe = PEImage(buf)
+                group = pe.read_resource(RT_GROUP_ICON)
+                frames = []
+                for frame in parse_group_icon(group or b""):
+                    data = pe.read_resource(RT_ICON, frame["id"])
+                    if data:
+                        frames.append((frame, build_ico(frame, data)))
+                return frames
+    except (OSError, ValueError, struct.error):
+        return []
@@ -0,0 +1,69 @@
+# File: ToolBox/app/utils/pinyin_utils.py
+
+from functools import lru_cache
+
+_CHAR_MAP = None
+
+
+def _char_map():
+    """首次使用时解析内置拼音表：{汉字: 拼音}"""
+    global _CHAR_MAP
+    if _CHAR_MAP is None:
+        from .pinyin_table import PINYIN_TABLE
+        m = {}
+        for line in PINYIN_TABLE.splitlines():
+            py, _, chars = line.partition(" ")
+            for ch in chars:
+                m[ch] = py
+        _CHAR_MAP = m
+    return _CHAR_MAP
+
+
+def has_cjk(text) -> bool:
+    return any("〇" <= ch <= "鿿" for ch in text or "")
+
+
+@lru_cache(maxsize=65536)
+def pinyin_keys(name):
+    """
+    名称的拼音键：返回 (全拼, 首字母, 排序键)，均为小写。
+
+    - 汉字替换为拼音（全拼“wenjianguanli”、首字母“wjgl”），其余字符原样小写保留
+    - 排序键按拼音排序（“安”排在“昂”前），同音时再按原名称区分
+    - 不含汉字的名称：全拼/首字母为空，排序键即 name.lower()（与原排序一致）
+    """
+    name = name or ""
+    lower = name.lower()
+    if not has_cjk(name):
+        return "", "", lower
+
+    table = _char_map()
+    full, initials, collate = [], [], []
+    for ch in lower:
+        py = table.get(ch)
+        if py is None:
+            full.append(ch)
+            initials.append(ch)
+            collate.append(ch)
+        else:
+            full.append(py)
+            initials.append(py[0])
+            # \x01 作为音节结束符：“an” < “ang”，且音节间不会粘连
+            collate.append(py + "\x01")
+    return "".join(full), "".join(initials), "".join(collate) + "\x00" + lower
+
+
+def add_pinyin_fields(tool):
+    """为工具 dict 补上 py_full / py_initials / sort_key 字段（已存在则不重复计算）"""
+    if tool.get("sort_key"):
+        return tool
+    full, initials, key = pinyin_keys(tool.get("name", "") or "")
+    tool["py_full"] = full
+    tool["py_initials"] = initials
+    tool["sort_key"] = key
+    return tool
+
+
+def sort_key_of(tool):
+    """工具的排序键（优先用已缓存的 sort_key）"""
+    return tool.get("sort_key") or pinyin_keys(tool.get("name", "") or "")[2]
@@ -0,0 +1,77 @@
+import os
+from collections import namedtuple
+
+# 默认支持的工具后缀（app.supported_extensions 未设置时使用）
+DEFAULT_TOOL_EXTS = frozenset({
+    ".exe", ".msi", ".zip", ".rar", ".7z", ".pdf", ".txt",
+    ".bat", ".cmd", ".reg", ".lnk", ".png", ".jpg", ".jpeg",
+    ".mp4", ".mp3", ".py", ".pyw", ".docx", ".xlsx", ".pptx"
+})
+
+ARCHIVE_EXTS = frozenset({".zip", ".rar", ".7z", ".tar", ".gz", ".bz2", ".xz"})
+
+# 扫描结果中的单个文件；size/mtime/ctime 来自 DirEntry 的 stat 缓存
+# （ctime 在 Windows 上为创建时间，即文件放入 Storage 的时间）
+FileEntry = namedtuple("FileEntry", ["path", "name", "stem", "ext", "size", "mtime", "dir", "ctime"])
+
+
+def _to_file_entry(entry, dir_path):
+    name = entry.name
+    stem, ext = os.path.splitext(name)
+    st = entry.stat()
+    return FileEntry(entry.path, name, stem, ext.lower(), st.st_size, st.st_mtime, dir_path, st.st_ctime)
+
+
+def scan_dir(dir_path, exts=None, skip_names=("__init__.py",)):
+    """
+    用 os.scandir 列举单个目录（不递归）。
+
+    文件类型取自 DirEntry（Windows 上不额外发起请求），大小/修改时间取自 entry.stat()
+    （Windows 上同样来自目录列举时的缓存）。
+    返回 (files, subdirs)：FileEntry 列表、子目录名列表（按名称排序）。
+    """
+    dir_path = str(dir_path)
+    files = []
+    subdirs = []
+    with os.scandir(dir_path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir():
+                    subdirs.append(entry.name)
+                    continue
+                if exts is not None and os.path.splitext(entry.name)[1].lower() not in exts:
+                    continue
+                if entry.name in skip_names or not entry.is_file():
+                    continue
+                files.append(_to_file_entry(entry, dir_path))
+            except OSError:
+                continue
+    subdirs.sort(key=lambda x: x.lower())
+    return files, subdirs
+
+
+def iter_files(dir_path, exts=None, recursive=False, max_depth=None, skip_names=("__init__.py",), errors=None):
+    """
+    生成器：逐个 yield 目录下匹配 exts 的 FileEntry。
+
+    - recursive=False：只列举 dir_path 本层
+    - recursive=True：深度优先遍历子目录；max_depth 限制层数（dir_path 本层为 0）
+    - 无法访问的目录会被跳过；传入 errors 列表时，跳过的目录以 (路径, 异常) 追加到其中
+    """
+    stack = [(str(dir_path), 0)]
+    while stack:
+        current, depth = stack.pop()
+        try:
+            files, subdirs = scan_dir(current, exts=exts, skip_names=skip_names)
+        except OSError as e:
+            print(f"扫描目录 {current} 时出错: {e}")
+            if errors is not None:
+                errors.append((current, e))
+            continue
+
+        for fe in files:
+            yield fe
+
+        if recursive and (max_depth is None or depth < max_depth):
+            for name in reversed(subdirs):
+                stack.append((os.path.join(current, name), depth + 1))
@@ -0,0 +1,172 @@
+# File: ToolBox/app/utils/search_utils.py
+
+import heapq
+import math
+import os
+import re
+import time
+
+from .pinyin_utils import pinyin_keys
+
+DEFAULT_SEARCH_LIMIT = 200
+
+# 匹配质量分层：名称（或其拼音）前缀 > 名称（或其拼音）子串 > 备注/路径子串 > 名称模糊（子序列）
+SCORE_PREFIX = 300
+SCORE_NAME = 200
+SCORE_TEXT = 100
+FUZZY_MAX = 99
+
+_SEPARATORS = set(" _-.()[]+&")
+
+
+def search_text(tool, storage_prefix=""):
+    """
+    参与搜索的整段小写文本：名称 / 备注 / 路径（去掉公共的 Storage 前缀），
+    名称含汉字时再附上拼音首字母与全拼（“wjgl” → 文件管理）。
+    注意与旧的线性过滤（按完整路径匹配）不同：只在 Storage 前缀里出现的查询词（如 “toolbox”、盘符）
+    不再命中每一个工具
+    """
+    name = tool.get("name", "") or ""
+    path = tool.get("path", "") or ""
+    if storage_prefix and os.path.normcase(path).startswith(storage_prefix):
+        path = path[len(storage_prefix):]
+    parts = [name.lower(), (tool.get("note", "") or "").lower(), path.lower()]
+    full, initials = _pinyin_of(tool)
+    if full:
+        parts += [initials, full]
+    return "\n".join(parts)
+
+
+def _pinyin_of(tool):
+    """(全拼, 首字母)：优先用工具上缓存的字段"""
+    if tool.get("sort_key"):
+        return tool.get("py_full", "") or "", tool.get("py_initials", "") or ""
+    full, initials, _key = pinyin_keys(tool.get("name", "") or "")
+    return full, initials
+
+
+def _is_boundary(name, i):
+    """name[i] 是否处于“词首”：开头、分隔符之后、小写→大写、字母↔数字切换处"""
+    if i == 0:
+        return True
+    prev, cur = name[i - 1], name[i]
+    if prev in _SEPARATORS:
+        return True
+    if cur.isupper() and not prev.isupper():
+        return True
+    return cur.isdigit() != prev.isdigit()
+
+
+def fuzzy_pattern(query):
+    """query 的子序列正则（先用它在 C 层快速排除不匹配的名称，再逐个打分）"""
+    return re.compile(".*?".join(re.escape(ch) for ch in query))
+
+
+def fuzzy_score(query, name, name_lower=None):
+    """
+    子序列模糊匹配打分（query 已小写）。不匹配返回 None，匹配返回 1..FUZZY_MAX。
+    每个字符优先落在词首（“hbu” → HiBitUninstaller），连续命中加分，跳过的字符扣分。
+    """
+    if name_lower is None:
+        name_lower = name.lower()
+    n = len(name_lower)
+    score = 0
+    last = -1
+    pos = 0
+    for qi, ch in enumerate(query):
+        first = name_lower.find(ch, pos)
+        if first < 0:
+            return None
+        # 剩余字符仍能匹配的前提下，尽量选后面的词首位置
+        hit = first
+        if first != last + 1 and not _is_boundary(name, first):
+            rest = query[qi + 1:]
+            j = name_lower.find(ch, first + 1)
+            while j >= 0:
+                if _is_boundary(name, j):
+                    if _is_subsequence(rest, name_lower, j + 1):
+                        hit = j
+                    break
+                j = name_lower.find(ch, j + 1)
+
+        if hit == last + 1 and last >= 0:
+            score += 6
+        elif _is_boundary(name, hit):
+            score += 10 if hit == 0 else 8
+        else:
+            score += 1
+        score -= min(hit - last - 1, 5) if last >= 0 else min(hit, 3)
+        last = hit
+        pos = hit + 1
+
+    # 名称越短（未匹配的部分越少）越靠前
+    score = 40 + score - (n - len(query)) // 4
+    return max(1, min(FUZZY_MAX, score))
+
+
+def _is_subsequence(query, text, start=0):
+    pos = start
+    for ch in query:
+        pos = text.find(ch, pos)
+        if pos < 0:
+            return False
+        pos += 1
+    return True
+
+
+def match_score(query, name, text, pinyin=()):
+    """
+    单个工具的匹配质量（query 已小写）：
+    text 为 search_text() 得到的整段小写文本；pinyin 为名称的 (首字母, 全拼)，与名称同级；
+    名称只参与模糊匹配。
+    """
+    name_lower = name.lower()
+    pos = name_lower.find(query)
+    if pos == 0:
+        return SCORE_PREFIX - min(len(name_lower) - len(query), 50)
+    if pos > 0:
+        return SCORE_NAME + (20 if _is_boundary(name, pos) else 0) - min(len(name_lower), 50) // 5
+    for alt in pinyin:
+        if not alt:
+            continue
+        pos = alt.find(query)
+        if pos == 0:
+            return SCORE_PREFIX - min(len(alt) - len(query), 50)
+        if pos > 0:
+            return SCORE_NAME - min(len(alt), 50) // 5
+    if query in text:
+        return SCORE_TEXT
+    return fuzzy_score(query, name, name_lower)
+
+
+def tool_match_score(query, tool, text):
+    """match_score 的工具 dict 版本（自动带上名称拼音）"""
+    full, initials = _pinyin_of(tool)
+    return match_score(query, tool.get("name", "") or "", text, (initials, full))
+
+
+def usage_boost(usage, now=None):
+    """
+    使用频率/最近使用加成：usage 为 (usage_count, last_used 时间戳)。
+    次数取对数（避免常用工具压过一切），最近使用按 14 天半衰期衰减。
+    """
+    if not usage:
+        return 0.0
+    count, last_used = usage
+    boost = 15.0 * math.log1p(max(0, count))
+    if last_used:
+        age_days = max(0.0, ((now or time.time()) - last_used) / 86400.0)
+        boost += 25.0 * 0.5 ** (age_days / 14.0)
+    return boost
+
+
+def top_k(scored, limit):
+    """
+    scored：可迭代的 (score, tiebreak, tool)；返回得分最高的 limit 个工具（按得分降序）。
+    用 heapq 取前 K 个（O(n log K)），不对全部候选排序；同分按 tiebreak 升序。
+    """
+    if limit is None or limit <= 0:
+        ordered = sorted(scored, key=lambda x: (-x[0], x[1]))
+    else:
+        ordered = heapq.nsmallest(limit, scored, key=lambda x: (-x[0], x[1]))
+    return [tool for _score, _tie, tool in ordered]
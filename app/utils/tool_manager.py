@@ -155,6 +155,15 @@ def delete_tool(app, path, name):
     # 同步清理记录
     _cleanup_records_for_path(app, abs_path)
 
+    # 持久化缩略图中该工具各尺寸的图标
+    try:
+        from ..services.thumbnail_store import get_thumbnail_store
+        store = get_thumbnail_store(app)
+        if store is not None:
+            store.remove(abs_path)
+    except Exception as e:
+        print(f"删除图标缓存失败: {e}")
+
     # 删除自定义图标（同名 .ico/.png）
     try:
         tool_dir = Path(abs_path).parent
@@ -178,3 +187,125 @@ def delete_tool(app, path, name):
         messagebox.showinfo("成功", "工具已删除，记录已同步清理。")
     else:
         messagebox.showinfo("提示", "文件删除可能失败，但记录已同步清理。")
+
+
+def _input_text(app, title, default=""):
+    """弹出输入框获取字符串；取消（关闭窗口）返回 None"""
+    input_win = Toplevel(app.root)
+    input_win.title(title)
+    input_win.geometry("380x180")
+    input_win.transient(app.root)
+    input_win.grab_set()
+
+    Label(input_win, text=title, font=("Microsoft YaHei", 11)).pack(pady=20)
+
+    var = StringVar(value=default)
+    entry = Entry(input_win, textvariable=var, width=40, font=("Microsoft YaHei", 11))
+    entry.pack(pady=10)
+    entry.focus()
+    entry.select_range(0, 'end')
+
+    result = [None]
+
+    def ok():
+        result[0] = var.get().strip()
+        input_win.destroy()
+
+    buttons = Frame(input_win)
+    buttons.pack(pady=10)
+    Button(buttons, text="确定", width=10, command=ok).pack(side="left", padx=5)
+    Button(buttons, text="取消", width=10, command=input_win.destroy).pack(side="left", padx=5)
+    input_win.bind("<Return>", lambda e: ok())
+    input_win.bind("<Escape>", lambda e: input_win.destroy())
+    input_win.wait_window()
+    return result[0]
+
+
+def _set_tool_info(app, path, suffix, value):
+    """写入 ToolInfo（绝对路径 key：path_name / path_note）；value 为空时删除该项，恢复默认"""
+    try:
+        if "ToolInfo" not in app.config:
+            app.config.add_section("ToolInfo")
+        info = app.config["ToolInfo"]
+        if value:
+            info[str(path) + suffix] = value
+        else:
+            info.pop(str(path) + suffix, None)
+        app.config_manager.save_config()
+    except Exception as e:
+        messagebox.showerror("保存失败", str(e))
+        return False
+
+    try:
+        app.refresh_tools()
+    except Exception:
+        pass
+    return True
+
+
+def rename_tool(app, path, name):
+    """修改工具标题（保存在 ToolInfo，不改文件名）；留空恢复为文件名"""
+    new_name = _input_text(app, "修改标题（留空恢复为文件名）", name)
+    if new_name is None or new_name == name:
+        return
+    _set_tool_info(app, path, "_name", new_name)
+
+
+def edit_note(app, path):
+    """编辑工具备注（保存在 ToolInfo）；留空删除备注"""
+    note = ""
+    try:
+        note = app.config.get("ToolInfo", str(path) + "_note", fallback="")
+    except Exception:
+        pass
+    new_note = _input_text(app, "编辑备注", note)
+    if new_note is None or new_note == note:
+        return
+    _set_tool_info(app, path, "_note", new_note)
+
+
+def change_tool_icon(app, path, name):
+    """
+    修改工具图标：把选中的 .ico/.png 复制为工具旁的同名图标（自定义图标优先于 exe 内置图标），
+    另一种格式的旧自定义图标一并删除，避免它继续优先生效
+    """
+    icon_file = filedialog.askopenfilename(
+        title=f"选择图标 - {name}",
+        filetypes=[("图标文件", "*.ico *.png"), ("所有文件", "*.*")],
+    )
+    if not icon_file:
+        return
+
+    ext = Path(icon_file).suffix.lower()
+    if ext not in ('.ico', '.png'):
+        messagebox.showerror("错误", "只支持 .ico 或 .png 图标文件")
+        return
+
+    tool_path = Path(path)
+    target = tool_path.with_suffix(ext)
+    if target == tool_path:
+        messagebox.showerror("错误", "不能用工具文件本身作为图标")
+        return
+
+    try:
+        import shutil
+        if os.path.normcase(os.path.abspath(icon_file)) != os.path.normcase(os.path.abspath(str(target))):
+            shutil.copyfile(icon_file, target)
+        other = tool_path.with_suffix('.png' if ext == '.ico' else '.ico')
+        if other != tool_path and other.exists():
+            other.unlink()
+    except Exception as e:
+        messagebox.showerror("修改图标失败", str(e))
+        return
+
+    # 内存中的旧图标作废；持久化缩略图按图标来源的大小/修改时间校验，自动失效
+    try:
+        from .icon_utils import forget_dir_file_icons
+        forget_dir_file_icons(app, [tool_path.parent])
+    except Exception:
+        pass
+
+    try:
+        app.refresh_tools()
+    except Exception:
+        pass
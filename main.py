@@ -2,6 +2,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import multiprocessing
 import sys
 import tkinter.messagebox as messagebox
 import traceback
@@ -26,4 +27,6 @@ def main():
             f.write(traceback.format_exc())
 
 if __name__ == "__main__":
+    # 打包为 exe 后，缩略图进程池的子进程需要它
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,2 @@
+# File: ToolBox/tests/__init__.py
+# Empty __init__.py
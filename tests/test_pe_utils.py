@@ -0,0 +1,154 @@
+# File: ToolBox/tests/test_pe_utils.py
+
+import struct
+
+from app.utils.pe_utils import PEImage, RT_ICON, RT_VERSION, parse_version_resource, read_version_info
+
+# 测试用的最小 PE32+ 文件：DOS 头 + PE 签名 + COFF 头 + 可选头 + 一个 .rsrc 节，
+# 资源节中只有一条资源（类型/ID 1/语言 0x409 三级目录），内容由各用例指定
+
+_PE_OFFSET = 0x40
+_OPT_SIZE = 112 + 16 * 8
+_SECTION_TABLE = _PE_OFFSET + 4 + 20 + _OPT_SIZE
+_RSRC_RVA = 0x1000
+_RSRC_RAW = 0x200
+
+
+def _pad4(data):
+    return data + b"\0" * (-len(data) % 4)
+
+
+def _block(key, value=b"", text=False, children=()):
+    """版本资源中的一个块（VS_VERSIONINFO / StringFileInfo / StringTable / String 格式相同）"""
+    data = _pad4(b"\0" * 6 + key.encode("utf-16-le") + b"\0\0") + value
+    for child in children:
+        data = _pad4(data) + child
+    value_len = len(value) // 2 if text else len(value)
+    return struct.pack("<HHH", len(data), value_len, 1 if text else 0) + data[6:]
+
+
+def _string(key, value):
+    return _block(key, (value + "\0").encode("utf-16-le"), text=True)
+
+
+def _fixed_file_info(file_version, product_version):
+    """VS_FIXEDFILEINFO（52 字节）；版本号为 4 段整数"""
+    def ms_ls(v):
+        return (v[0] << 16) | v[1], (v[2] << 16) | v[3]
+
+    return struct.pack(
+        "<13I", 0xFEEF04BD, 0x10000, *ms_ls(file_version), *ms_ls(product_version), *([0] * 7)
+    )
+
+
+def _version_resource(strings=None, fixed=((1, 2, 3, 4), (5, 6, 7, 8))):
+    tables = [_block("080404b0", children=[_string(k, v) for k, v in (strings or {}).items()])]
+    return _block(
+        "VS_VERSION_INFO",
+        _fixed_file_info(*fixed) if fixed else b"",
+        children=[_block("StringFileInfo", children=tables)],
+    )
+
+
+def _resource_section(res_type, data, data_rva=None):
+    """三级资源目录 + 一个数据项；data_rva 默认指向紧随其后的资源数据"""
+    def directory(entry_id, target):
+        return struct.pack("<IIHHHH", 0, 0, 0, 0, 0, 1) + struct.pack("<II", entry_id, target)
+
+    data_entry = 72
+    data_off = data_entry + 16
+    return (
+        directory(res_type, 0x80000000 | 24)
+        + directory(1, 0x80000000 | 48)
+        + directory(0x409, data_entry)
+        + struct.pack("<IIII", _RSRC_RVA + data_off if data_rva is None else data_rva, len(data), 0, 0)
+        + data
+    )
+
+
+def build_pe(resource=None, machine=0x8664, resource_rva=_RSRC_RVA):
+    """组装 PE 文件字节；resource 为 .rsrc 节内容（None 表示没有资源节数据目录）"""
+    section = _pad4(resource or b"")
+    dos = bytearray(_PE_OFFSET)
+    dos[:2] = b"MZ"
+    struct.pack_into("<I", dos, 0x3C, _PE_OFFSET)
+
+    coff = struct.pack("<HHIIIHH", machine, 1, 0, 0, 0, _OPT_SIZE, 0x22)
+    opt = bytearray(_OPT_SIZE)
+    struct.pack_into("<H", opt, 0, 0x20B)
+    struct.pack_into("<I", opt, 108, 16)
+    if resource is not None:
+        struct.pack_into("<II", opt, 112 + 2 * 8, resource_rva, len(section))
+
+    header = bytes(dos) + b"PE\0\0" + coff + bytes(opt)
+    header += struct.pack("<8sIIIIIIHHI", b".rsrc", len(section), _RSRC_RVA, len(section), _RSRC_RAW, 0, 0, 0, 0, 0)
+    assert len(header) == _SECTION_TABLE + 40
+    return header + b"\0" * (_RSRC_RAW - len(header)) + section
+
+
+def _write(tmp_path, data, name="tool.exe"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+def test_read_version_info_fields(tmp_path):
+    strings = {
+        "ProductName": "ToolBox",
+        "FileDescription": "工具箱",
+        "FileVersion": "1.2.3.4 (release)",
+    }
+    pe = build_pe(_resource_section(RT_VERSION, _version_resource(strings)))
+
+    info = read_version_info(_write(tmp_path, pe))
+
+    assert info == {
+        "product_name": "ToolBox",
+        "description": "工具箱",
+        "file_version": "1.2.3.4 (release)",
+        # StringFileInfo 中没有 ProductVersion：取 VS_FIXEDFILEINFO 的数字版本
+        "product_version": "5.6.7.8",
+        "machine": "x64",
+    }
+
+
+def test_parse_version_resource_fixed_only():
+    info = parse_version_resource(_version_resource(fixed=((10, 0, 19041, 1), (10, 0, 0, 0))))
+    assert info == {"file_version": "10.0.19041.1", "product_version": "10.0.0.0"}
+
+
+def test_machine_name():
+    pe = PEImage(build_pe(machine=0x014C))
+    assert pe.machine_name == "x86"
+
+
+def test_truncated_headers(tmp_path):
+    pe = build_pe(_resource_section(RT_VERSION, _version_resource()))
+    # MZ 头不完整 / PE 签名之后被截断 / 可选头被截断
+    for cut in (0x20, _PE_OFFSET + 4, _PE_OFFSET + 4 + 20 + 40):
+        assert read_version_info(_write(tmp_path, pe[:cut])) is None
+    assert read_version_info(_write(tmp_path, b"")) is None
+    assert read_version_info(_write(tmp_path, b"\0" * 512)) is None
+
+
+def test_missing_rt_version(tmp_path):
+    # 没有资源节
+    pe = build_pe()
+    assert PEImage(pe).read_resource(RT_VERSION) is None
+    assert read_version_info(_write(tmp_path, pe)) == {"machine": "x64"}
+
+    # 资源节里只有别的类型的资源
+    pe = build_pe(_resource_section(RT_ICON, b"\x89PNG"))
+    assert PEImage(pe).read_resource(RT_VERSION) is None
+    assert read_version_info(_write(tmp_path, pe)) == {"machine": "x64"}
+
+
+def test_out_of_range_rvas(tmp_path):
+    # 资源目录的 RVA 不在任何节内
+    pe = build_pe(_resource_section(RT_VERSION, _version_resource()), resource_rva=0x9000)
+    assert read_version_info(_write(tmp_path, pe)) is None
+
+    # 资源数据项的 RVA 越界：跳过该资源
+    pe = build_pe(_resource_section(RT_VERSION, _version_resource(), data_rva=0x9000))
+    assert PEImage(pe).read_resource(RT_VERSION) is None
+    assert read_version_info(_write(tmp_path, pe)) == {"machine": "x64"}
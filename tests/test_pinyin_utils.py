@@ -0,0 +1,41 @@
+# File: ToolBox/tests/test_pinyin_utils.py
+
+from app.utils.pinyin_utils import add_pinyin_fields, pinyin_keys, sort_key_of
+from app.utils.search_utils import SCORE_PREFIX, SCORE_NAME, search_text, tool_match_score
+
+
+def test_pinyin_keys():
+    assert pinyin_keys("文件管理")[:2] == ("wenjianguanli", "wjgl")
+    # 非汉字原样小写保留
+    assert pinyin_keys("QQ音乐")[:2] == ("qqyinle", "qqyl")
+    # 不含汉字：没有拼音，排序键即小写名称
+    assert pinyin_keys("Abc") == ("", "", "abc")
+    assert pinyin_keys("") == ("", "", "")
+
+
+def test_collation_orders_by_pinyin():
+    names = ["昂达", "Zip", "安装包", "abc", "百度网盘", "文件管理"]
+    assert sorted(names, key=lambda n: pinyin_keys(n)[2]) == ["abc", "安装包", "昂达", "百度网盘", "文件管理", "Zip"]
+
+
+def test_add_pinyin_fields_keeps_cached_values():
+    tool = add_pinyin_fields({"name": "文件管理"})
+    assert (tool["py_full"], tool["py_initials"]) == ("wenjianguanli", "wjgl")
+    assert sort_key_of(tool) == tool["sort_key"]
+
+    cached = {"name": "文件管理", "py_full": "x", "py_initials": "y", "sort_key": "z"}
+    assert add_pinyin_fields(dict(cached)) == cached
+
+
+def _score(query, name):
+    tool = add_pinyin_fields({"name": name, "path": f"/s/{name}.exe"})
+    return tool_match_score(query, tool, search_text(tool))
+
+
+def test_pinyin_matches_rank_with_the_name():
+    # 首字母/全拼前缀与名称前缀同级，子串与名称子串同级
+    assert _score("wjgl", "文件管理") >= SCORE_PREFIX - 50
+    assert _score("wenjian", "文件管理") >= SCORE_PREFIX - 50
+    assert SCORE_NAME - 10 <= _score("gl", "文件管理") < SCORE_PREFIX - 50
+    assert _score("wjgl", "文件管理") > _score("wjgl", "我的文件管理")
+    assert _score("zz", "文件管理") is None
@@ -0,0 +1,115 @@
+# File: ToolBox/tests/test_search_index.py
+
+import random
+import time
+
+from app.services.search_index import SearchIndex
+from app.utils.pinyin_utils import add_pinyin_fields, sort_key_of
+from app.utils.search_utils import search_text, tool_match_score, top_k
+
+STORAGE = "/storage"
+_WORDS = ["win", "tool", "pro", "ab", "ex", "ed", "cal", "net", "mon", "zip",
+          "view", "edit", "setup", "clean", "fast", "data", "file", "disk", "key", "log"]
+
+
+def _tool(name, directory, note=""):
+    return add_pinyin_fields({
+        "name": name,
+        "path": f"{directory}/{name}.exe",
+        "ext": ".exe",
+        "type": "程序",
+        "category": directory.rsplit("/", 1)[-1],
+        "note": note,
+    })
+
+
+def _synthetic(count, seed=1):
+    """count 个工具，按目录分组：{目录: [工具 dict]}"""
+    rng = random.Random(seed)
+    by_dir = {}
+    for i in range(count):
+        name = "".join(rng.choice(_WORDS).capitalize() for _ in range(rng.randint(1, 3))) + str(i)
+        directory = f"{STORAGE}/cat{i % 20}/sub{i % 500}"
+        tool = {
+            "name": name, "path": f"{directory}/{name}.exe", "ext": ".exe", "type": "程序",
+            "category": "c", "note": rng.choice(["", "portable", "editor tool"]),
+            # 纯 ASCII 名称：拼音字段直接给出，建索引时不再计算
+            "py_full": "", "py_initials": "", "sort_key": name.lower(),
+        }
+        by_dir.setdefault(directory, []).append(tool)
+    return by_dir
+
+
+def _build(by_dir):
+    index = SearchIndex(STORAGE)
+    for directory, tools in by_dir.items():
+        index.update_dir(directory, tools)
+    return index
+
+
+def _brute_force(tools, query):
+    """线性打分全部工具（索引结果应与之一致）"""
+    q = query.lower()
+    prefix = STORAGE + "/"
+
+    def scored():
+        for t in tools:
+            s = tool_match_score(q, t, search_text(t, prefix))
+            if s is not None:
+                yield s, sort_key_of(t), t
+    return [t["path"] for t in top_k(scored(), None)]
+
+
+def test_matches_linear_scoring_below_candidate_limit():
+    by_dir = {
+        f"{STORAGE}/网络": [_tool("文件管理", f"{STORAGE}/网络"), _tool("WinRAR", f"{STORAGE}/网络", "压缩")],
+        f"{STORAGE}/系统": [
+            _tool("HiBitUninstaller", f"{STORAGE}/系统"), _tool("Everything", f"{STORAGE}/系统", "file search"),
+            _tool("Notepad++", f"{STORAGE}/系统", "editor"), _tool("Process Explorer", f"{STORAGE}/系统"),
+        ],
+    }
+    index = _build(by_dir)
+    tools = [t for ts in by_dir.values() for t in ts]
+    # 3 个字符以上的查询：与线性打分完全一致（1–2 个字符只查名称，见下一个用例）
+    for query in ("hbu", "wjgl", "file", "edit", "rar", "plorer", "系统/", "ver", "win"):
+        got = [t["path"] for t in index.search(query, limit=200)]
+        assert got == _brute_force(tools, query), query
+
+
+def test_short_queries_use_name_postings():
+    index = _build({f"{STORAGE}/a": [_tool("Everything", f"{STORAGE}/a"), _tool("7-Zip", f"{STORAGE}/a", "e")]})
+    # 1–2 个字符只匹配名称/拼音：前缀命中排在前面
+    assert [t["name"] for t in index.search("e", limit=10)] == ["Everything"]
+    assert [t["name"] for t in index.search("zi", limit=10)] == ["7-Zip"]
+
+
+def test_scope_accept_and_removal():
+    a, b = f"{STORAGE}/a", f"{STORAGE}/b"
+    index = _build({a: [_tool("Toolkit", a)], b: [_tool("Toolbox", b)]})
+    assert [t["name"] for t in index.search("tool", scope_dirs={index._doc_dirs[0]})] == ["Toolkit"]
+    assert [t["name"] for t in index.search("tool", accept=lambda t: t["name"] == "Toolbox")] == ["Toolbox"]
+    index.remove_dir(b)
+    assert [t["name"] for t in index.search("tool")] == ["Toolkit"]
+
+
+def test_prefix_hits_survive_candidate_limit():
+    by_dir = _synthetic(20000)
+    index = _build(by_dir)
+    result = index.search("tool", limit=20)
+    best = min(len(t["name"]) for ts in by_dir.values() for t in ts if t["name"].lower().startswith("tool"))
+    # 前缀命中按名称由短到长收集：最短的前缀命中不会因候选截断而丢失
+    assert len(result[0]["name"]) == best
+
+
+def test_search_under_20ms_with_100k_tools():
+    index = _build(_synthetic(100000))
+    assert len(index) == 100000
+    for query in ("e", "ab", "win", "pro", "tool", "wtl", "editsetup", "setup", "zzz"):
+        best = min(_timed(index, query) for _ in range(5))
+        assert best < 0.020, f"{query!r}: {best * 1000:.1f} ms"
+
+
+def _timed(index, query):
+    start = time.perf_counter()
+    index.search(query, limit=200)
+    return time.perf_counter() - start
@@ -0,0 +1,73 @@
+# File: ToolBox/tests/test_search_utils.py
+
+import pytest
+
+from app.utils.search_utils import (
+    FUZZY_MAX, SCORE_NAME, SCORE_PREFIX, SCORE_TEXT,
+    fuzzy_score, match_score, search_text, tool_match_score, top_k, usage_boost,
+)
+
+DAY = 86400.0
+
+
+def _rank(query, names, usage=None, now=None):
+    """按 tool_match_score + usage_boost 排序后的名称（与搜索索引的打分一致）；names 的元素可为 (名称, 备注)"""
+    usage = usage or {}
+    tools = [{"name": n, "note": note, "path": f"/s/{n}.exe"}
+             for n, note in (e if isinstance(e, tuple) else (e, "") for e in names)]
+
+    def scored():
+        for t in tools:
+            s = tool_match_score(query, t, search_text(t))
+            if s is not None:
+                yield s + usage_boost(usage.get(t["name"]), now=now), t["name"].lower(), t
+
+    return [t["name"] for t in top_k(scored(), None)]
+
+
+def test_fuzzy_prefers_word_starts():
+    # “hbu”：每个字符都落在词首（Hi Bit Uninstaller）
+    assert fuzzy_score("hbu", "HiBitUninstaller") > fuzzy_score("hbu", "hashbucket")
+    assert fuzzy_score("pe", "Process Explorer") > fuzzy_score("pe", "Shapeless")
+    assert fuzzy_score("xyz", "HiBitUninstaller") is None
+    assert 1 <= fuzzy_score("a", "a" * 500) <= FUZZY_MAX
+
+
+def test_fuzzy_prefers_shorter_names():
+    assert fuzzy_score("pe", "Process Explorer") > fuzzy_score("pe", "Process Explorer Portable Edition")
+
+
+def test_match_tiers():
+    assert match_score("note", "Notepad++", "notepad++") > SCORE_NAME
+    assert SCORE_TEXT < match_score("pad", "Notepad++", "notepad++") <= SCORE_NAME + 20 < SCORE_PREFIX - 50
+    assert match_score("editor", "Notepad++", "notepad++\neditor") == SCORE_TEXT
+    assert match_score("ntpd", "Notepad++", "notepad++") < SCORE_TEXT
+    # 名称前缀 > 名称子串 > 备注/路径 > 模糊
+    assert _rank("ex", [("7-Zip", "extract"), "Explorer", "NotExplorer", "HxD Editor"]) == [
+        "Explorer", "NotExplorer", "7-Zip", "HxD Editor",
+    ]
+
+
+def test_usage_boost_is_logarithmic_and_decays():
+    now = 1_000_000_000.0
+    assert usage_boost(None) == 0.0
+    assert usage_boost((10, 0)) < 2 * usage_boost((3, 0))
+    # 最近使用的加成按 14 天半衰期衰减
+    base = usage_boost((1, 0))
+    assert usage_boost((1, now), now=now) - base == pytest.approx(25.0)
+    assert usage_boost((1, now - 14 * DAY), now=now) - base == pytest.approx(12.5)
+
+
+def test_usage_reorders_within_a_tier_but_not_across():
+    now = 1_000_000_000.0
+    usage = {"Explorer++": (50, now)}
+    # 同为名称前缀：常用的排前面
+    assert _rank("explorer", ["Explorer", "Explorer++"], usage, now) == ["Explorer++", "Explorer"]
+    # 模糊命中即使很常用也不会压过名称子串
+    assert _rank("exp", ["ExtraPad", "RegExplorer"], {"ExtraPad": (1000, now)}, now) == ["RegExplorer", "ExtraPad"]
+
+
+def test_top_k_keeps_best_with_stable_ties():
+    scored = [(5, "b", "B"), (9, "z", "Z"), (5, "a", "A"), (1, "c", "C")]
+    assert top_k(iter(scored), 3) == ["Z", "A", "B"]
+    assert top_k(iter(scored), 0) == ["Z", "A", "B", "C"]
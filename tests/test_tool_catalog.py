@@ -0,0 +1,151 @@
+# File: ToolBox/tests/test_tool_catalog.py
+
+import configparser
+import os
+import sqlite3
+
+import pytest
+
+from app.services import scan_engine
+from app.services.category_service import _snapshot_tool_info
+from app.services.scan_engine import ScanEngine
+from app.services.search_index import SearchIndex
+from app.services.tool_catalog import _MIGRATIONS, ToolCatalog
+
+_LATEST = _MIGRATIONS[-1][0]
+
+
+def _columns(conn, table):
+    return [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def test_fresh_catalog_is_at_latest_version(tmp_path):
+    cat = ToolCatalog(tmp_path / "t.db")
+    assert cat.conn.execute("PRAGMA user_version").fetchone()[0] == _LATEST
+    assert _columns(cat.conn, "dirs") == ["dir", "mtime_ns", "subdirs", "scanned_at"]
+    cat.close()
+
+
+def test_migrates_v1_catalog(tmp_path):
+    db = tmp_path / "t.db"
+    tool = tmp_path / "文件管理.exe"
+    tool.write_bytes(b"MZ")
+    conn = sqlite3.connect(db)
+    for sql in _MIGRATIONS[0][1]:
+        conn.execute(sql)
+    conn.executemany("INSERT INTO tools (path, dir, category, name, ext, type, size, mtime) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [
+        (str(tool), str(tmp_path), "c", "文件管理", ".exe", "可执行文件", 2, 1.0),
+        (str(tmp_path / "gone.exe"), str(tmp_path), "c", "Gone", ".exe", "可执行文件", 0, 123.0),
+    ])
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+
+    cat = ToolCatalog(db)
+    assert cat.conn.execute("PRAGMA user_version").fetchone()[0] == _LATEST
+    rows = {r["name"]: r for r in cat.all_tools()}
+    # v3：拼音键回填；v4：添加时间取文件 ctime，文件不在时取 mtime
+    assert (rows["文件管理"]["py_initials"], rows["Gone"]["sort_key"]) == ("wjgl", "gone")
+    assert rows["文件管理"]["added"] == pytest.approx(os.stat(tool).st_ctime)
+    assert rows["Gone"]["added"] == 123.0
+    assert _columns(cat.conn, "dirs") == ["dir", "mtime_ns", "subdirs", "scanned_at"]
+    assert cat.get_file_meta("x") is None
+    cat.close()
+
+    # 再次打开不重复执行迁移
+    ToolCatalog(db).close()
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    class App:
+        pass
+
+    app = App()
+    app.storage_path = str(tmp_path / "Storage")
+    app.config = configparser.ConfigParser()
+    for section in ("General", "ToolInfo"):
+        app.config.add_section(section)
+    app.config["General"]["scan_workers"] = "1"
+
+    # 记录真正列举过的目录
+    listed = []
+    real_scan_dir = scan_engine.scan_dir
+
+    def counting_scan_dir(dir_path, **kwargs):
+        listed.append(str(dir_path))
+        return real_scan_dir(dir_path, **kwargs)
+
+    monkeypatch.setattr(scan_engine, "scan_dir", counting_scan_dir)
+
+    cat = ToolCatalog(tmp_path / "t.db")
+    eng = ScanEngine(app, cat, SearchIndex(app.storage_path))
+    eng.listed = listed
+    yield eng
+    cat.close()
+
+
+def _age(path, seconds=60):
+    """把目录 mtime 调到过去：避开 RACY_WINDOW，指纹才可信"""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - int(seconds * 1e9)))
+
+
+def _names(tools):
+    return sorted(t["name"] for t in tools)
+
+
+def test_incremental_rescans(engine):
+    d = os.path.join(engine.app.storage_path, "1")
+    os.makedirs(os.path.join(d, "sub"))
+    for name in ("a.exe", "b.exe"):
+        open(os.path.join(d, name), "wb").close()
+    _age(d)
+
+    tools, subdirs = engine.sync_dir(d, "1")
+    assert (_names(tools), subdirs, len(engine.listed)) == (["a", "b"], ["sub"], 1)
+
+    # 指纹未变：不列举，结果取自 catalog
+    tools, subdirs = engine.sync_dir(d, "1")
+    assert (_names(tools), subdirs, len(engine.listed)) == (["a", "b"], ["sub"], 1)
+
+    # ToolInfo 改标题不推动目录 mtime：不列举也能反映到行与搜索索引
+    path_a = os.path.join(d, "a.exe")
+    engine.app.config["ToolInfo"][path_a + "_name"] = "Alpha"
+    _snapshot_tool_info(engine.app)
+    assert _names(engine.sync_dir(d, "1")[0]) == ["Alpha", "b"]
+    assert len(engine.listed) == 1
+    assert [t["name"] for t in engine.index.search("alpha")] == ["Alpha"]
+
+    # 增删文件推动目录 mtime：重新列举，消失的路径交给记录清理
+    os.remove(path_a)
+    open(os.path.join(d, "c.exe"), "wb").close()
+    _age(d)
+    assert _names(engine.sync_dir(d, "1")[0]) == ["b", "c"]
+    assert len(engine.listed) == 2
+    assert engine.take_removed_paths() == [path_a]
+    assert engine.take_changed_dirs() == [d]
+
+    # force：忽略指纹强制列举
+    engine.sync_dir(d, "1", force=True)
+    assert len(engine.listed) == 3
+
+
+def test_rescan_drops_removed_subdirs(engine):
+    d = os.path.join(engine.app.storage_path, "1")
+    sub = os.path.join(d, "sub")
+    os.makedirs(sub)
+    open(os.path.join(sub, "x.exe"), "wb").close()
+    _age(sub)
+    _age(d)
+    engine.sync_dir(d, "1")
+    engine.sync_dir(sub, "1/sub")
+    assert _names(engine.catalog.tools_in_dir(sub)) == ["x"]
+
+    os.remove(os.path.join(sub, "x.exe"))
+    os.rmdir(sub)
+    _age(d)
+    assert engine.sync_dir(d, "1") == ([], [])
+    assert engine.catalog.tools_in_dir(sub) == []
+    assert engine.catalog.get_dir_state(sub) is None
+    assert engine.take_removed_paths() == [os.path.join(sub, "x.exe")]
@@ -0,0 +1,107 @@
+# File: ToolBox/tests/test_tool_query.py
+
+import os
+from datetime import datetime
+
+import pytest
+
+from app.services.tool_catalog import ToolCatalog, row_to_tool
+from app.services.tool_query import parse_query
+
+MB = 1024 * 1024
+
+
+def _ts(*args):
+    return datetime(*args).timestamp()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return str(tmp_path / "Storage")
+
+
+@pytest.fixture
+def catalog(tmp_path, storage):
+    """catalog 中的测试工具：{目录: [(名称, 扩展名, 大小, 添加时间, 备注)]}"""
+    layout = {
+        ("1", "11"): [
+            ("Everything", ".exe", 2 * MB, _ts(2026, 9, 15, 12), "portable"),
+            ("notes", ".txt", 1024, _ts(2026, 8, 31, 23), "100% free"),
+        ],
+        ("1", "110"): [("Sibling", ".exe", MB, _ts(2026, 10, 1), "1000 free")],
+        ("1", "11", "deep"): [("Deep", ".exe", MB + 1, _ts(2025, 1, 1), "a_b")],
+        ("2",): [
+            ("Setup", ".msi", 5 * MB, _ts(2026, 9, 1), "axb"),
+            ("Tool", ".exe", 0, _ts(2026, 9, 30, 23, 59), "c:\\tools 绿色 版"),
+        ],
+    }
+    cat = ToolCatalog(tmp_path / "catalog.db")
+    for parts, entries in layout.items():
+        d = os.path.join(storage, *parts)
+        cat.replace_dir(d, [
+            {"path": os.path.join(d, name + ext), "name": name, "ext": ext, "type": ext, "category": parts[-1],
+             "size": size, "mtime": added, "added": added, "note": note}
+            for name, ext, size, added, note in entries
+        ])
+    yield cat
+    cat.close()
+
+
+def _select(catalog, raw, storage):
+    """SQL 与 matches() 两条路径的结果（名称集合）；二者必须一致"""
+    query = parse_query(raw, storage)
+    assert query.has_filters, raw
+    by_sql = {r["name"] for r in catalog.select_tools(query.where, query.params)}
+    by_python = {t["name"] for t in map(row_to_tool, catalog.all_tools()) if query.matches(t)}
+    assert by_sql == by_python, raw
+    return by_sql
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("size>1M", {"Everything", "Deep", "Setup"}),
+    ("size>=1M", {"Everything", "Sibling", "Deep", "Setup"}),
+    ("size<1M", {"notes", "Tool"}),
+    ("size<=1M", {"notes", "Tool", "Sibling"}),
+    ("size:1M", {"Sibling"}),
+    ("size>1.5mb", {"Everything", "Setup"}),
+    ("added:2026-09", {"Everything", "Setup", "Tool"}),
+    ("added>2026-09", {"Sibling"}),
+    ("added>=2026-09-15", {"Everything", "Sibling", "Tool"}),
+    ("added<2026-09-01", {"notes", "Deep"}),
+    ("added<=2026-09-01", {"notes", "Deep", "Setup"}),
+    ("added:2026", {"Everything", "notes", "Sibling", "Setup", "Tool"}),
+])
+def test_ranges(catalog, storage, raw, expected):
+    assert _select(catalog, raw, storage) == expected
+
+
+def test_negation(catalog, storage):
+    assert _select(catalog, "-ext:.exe", storage) == {"notes", "Setup"}
+    assert _select(catalog, "-ext:exe -size>1M", storage) == {"notes"}
+    assert _select(catalog, "-note:free ext:.exe", storage) == {"Everything", "Deep", "Tool"}
+
+
+def test_like_escaping(catalog, storage):
+    # % 和 _ 按字面匹配，不是 LIKE 通配符
+    assert _select(catalog, "note:100%", storage) == {"notes"}
+    assert _select(catalog, "note:a_b", storage) == {"Deep"}
+    # 反斜杠原样保留；引号内的空格属于值
+    assert _select(catalog, "note:c:\\tools", storage) == {"Tool"}
+    assert _select(catalog, 'note:"绿色 版"', storage) == {"Tool"}
+
+
+def test_category_range_excludes_prefix_siblings(catalog, storage):
+    # cat:1>11 含下级目录，但不含名称以 11 开头的兄弟目录 110
+    assert _select(catalog, "cat:1>11", storage) == {"Everything", "notes", "Deep"}
+    assert _select(catalog, "-cat:1", storage) == {"Setup", "Tool"}
+
+
+def test_unrecognized_tokens_stay_search_text():
+    query = parse_query("wjgl added>2026-0 size>lots foo:bar")
+    assert not query.has_filters
+    assert query.text == "wjgl added>2026-0 size>lots foo:bar"
+
+    query = parse_query("edit type:文档 note:x")
+    assert query.text == "edit"
+    assert query.where == "type = ? AND note LIKE ? ESCAPE '\\'"
+    assert query.params == ["文档", "%x%"]